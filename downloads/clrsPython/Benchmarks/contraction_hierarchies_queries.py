@@ -0,0 +1,48 @@
+# Compares contraction-hierarchy queries with dijkstra, stopping at the target and
+# settling the whole graph, on a random road-like grid graph.
+#
+# Usage: python contraction_hierarchies_queries.py [side] [queries]
+#        (defaults 70 x 70 grid and 200 queries)
+
+import sys
+import time
+import numpy as np
+from contraction_hierarchies import ContractionHierarchy
+from dijkstra import dijkstra
+from generate_random_graph import generate_grid_graph
+
+
+if __name__ == "__main__":
+
+	side = int(sys.argv[1]) if len(sys.argv) > 1 else 70
+	num_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+	G = generate_grid_graph(side, side, 0.95, True, True, True, 1, 100, seed=0)
+	card_V = G.get_card_V()
+	print(card_V, "vertices,", G.get_card_E(), "edges")
+
+	start = time.perf_counter()
+	hierarchy = ContractionHierarchy(G)
+	print("Preprocessing: %.2f seconds, %d shortcuts" % (time.perf_counter() - start, hierarchy.get_num_shortcuts()))
+
+	rng = np.random.default_rng(1)
+	queries = rng.integers(0, card_V, size=(num_queries, 2)).tolist()
+
+	start = time.perf_counter()
+	ch_distances = [hierarchy.distance(s, t) for s, t in queries]
+	ch_time = time.perf_counter() - start
+	settled = sum(hierarchy.search(s, t)[4] for s, t in queries)
+
+	start = time.perf_counter()
+	target_distances = [dijkstra(G, s, t)[0][t] for s, t in queries]
+	target_time = time.perf_counter() - start
+
+	start = time.perf_counter()
+	full_distances = [dijkstra(G, s)[0][t] for s, t in queries]
+	full_time = time.perf_counter() - start
+
+	print("Contraction hierarchy: %.2f ms per query, %.1f vertices settled per query"
+		  % (1000 * ch_time / num_queries, settled / num_queries))
+	print("dijkstra with target:  %.2f ms per query" % (1000 * target_time / num_queries))
+	print("dijkstra, whole graph: %.2f ms per query" % (1000 * full_time / num_queries))
+	print("Distances " + ("agree" if ch_distances == target_distances == full_distances else "DIFFER"))
@@ -0,0 +1,40 @@
+# Measures how delta_stepping scales from 1 to N processes on one machine, against
+# dijkstra, on a random G(n, m) graph with integer weights.
+#
+# Usage: python delta_stepping_scaling.py [card_V] [card_E] [max_processes]
+#        (defaults 200000 vertices, 2000000 edges, and the number of CPUs)
+
+import os
+import sys
+import time
+import numpy as np
+from csr_graph import CSRGraph
+from delta_stepping import delta_stepping
+from dijkstra import dijkstra
+
+
+if __name__ == "__main__":
+
+	card_V = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+	card_E = int(sys.argv[2]) if len(sys.argv) > 2 else 2000000
+	max_processes = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+
+	rng = np.random.default_rng(0)
+	keys = np.unique(rng.integers(0, card_V * card_V, size=card_E))
+	weights = rng.integers(1, 1000000, size=len(keys))
+	G = CSRGraph.from_edge_arrays(card_V, keys // card_V, keys % card_V, weights)
+	print(card_V, "vertices,", G.get_card_E(), "edges,", os.cpu_count(), "CPUs")
+
+	start = time.perf_counter()
+	expected = dijkstra(G, 0)
+	serial = time.perf_counter() - start
+	print("dijkstra: %.2f seconds" % serial)
+
+	processes = 1
+	while processes <= max(max_processes, 1):
+		start = time.perf_counter()
+		result = delta_stepping(G, 0, None, processes)
+		elapsed = time.perf_counter() - start
+		print("delta_stepping, %2d processes: %.2f seconds, speedup %.2f%s"
+			  % (processes, elapsed, serial / elapsed, "" if result == expected else ", RESULTS DIFFER"))
+		processes *= 2
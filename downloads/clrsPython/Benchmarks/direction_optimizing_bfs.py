@@ -0,0 +1,34 @@
+# Compares bfs with direction_optimizing_bfs on a random G(n, m) graph, which has low
+# diameter, and with direction_optimizing_bfs restricted to top-down steps, to separate
+# the gain from array frontiers from the gain from bottom-up steps.
+#
+# Usage: python direction_optimizing_bfs.py [card_V] [card_E]
+#        (defaults 200000 vertices and 3000000 edges)
+
+import sys
+import time
+import numpy as np
+from bfs import bfs, direction_optimizing_bfs
+from csr_graph import CSRGraph
+
+
+if __name__ == "__main__":
+
+	card_V = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+	card_E = int(sys.argv[2]) if len(sys.argv) > 2 else 3000000
+
+	rng = np.random.default_rng(0)
+	keys = np.unique(rng.integers(0, card_V * card_V, size=card_E))
+	G = CSRGraph.from_edge_arrays(card_V, keys // card_V, keys % card_V)
+	print(card_V, "vertices,", G.get_card_E(), "edges")
+
+	for name, search in [("bfs", bfs),
+						 ("top-down steps only", lambda G, s: direction_optimizing_bfs(G, s, alpha=0)),
+						 ("direction-optimizing", direction_optimizing_bfs)]:
+		start = time.perf_counter()
+		dist, pi = search(G, 0)
+		elapsed = time.perf_counter() - start
+		if name == "bfs":
+			expected = dist
+		print("%-22s %.2f seconds, %d levels, same distances: %s"
+			  % (name, elapsed, max(d for d in dist if d < float('inf')), dist == expected))
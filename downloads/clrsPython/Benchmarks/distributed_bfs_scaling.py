@@ -0,0 +1,43 @@
+# Measures how distributed_bfs scales from 1 to N worker processes on one machine,
+# against the single-process bfs, on a random G(n, m) graph.
+#
+# Usage: python distributed_bfs_scaling.py [card_V] [card_E] [max_workers]
+#        (defaults 200000 vertices, 2000000 edges, and the number of CPUs)
+
+import os
+import sys
+import time
+import numpy as np
+from bfs import bfs
+from distributed_bfs import distributed_bfs
+from csr_graph import CSRGraph
+from partitioned_graph import PartitionedGraph
+
+
+if __name__ == "__main__":
+
+	card_V = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+	card_E = int(sys.argv[2]) if len(sys.argv) > 2 else 2000000
+	max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+
+	rng = np.random.default_rng(0)
+	keys = np.unique(rng.integers(0, card_V * card_V, size=card_E))
+	G = CSRGraph.from_edge_arrays(card_V, keys // card_V, keys % card_V)
+	print(card_V, "vertices,", G.get_card_E(), "edges,", os.cpu_count(), "CPUs")
+
+	start = time.perf_counter()
+	expected = bfs(G, 0)
+	serial = time.perf_counter() - start
+	print("bfs: %.2f seconds" % serial)
+
+	num_workers = 1
+	while num_workers <= max(max_workers, 1):
+		for method in ["range", "hash"]:
+			parts = PartitionedGraph(G, num_workers, method)
+			start = time.perf_counter()
+			result = distributed_bfs(parts, 0)
+			elapsed = time.perf_counter() - start
+			print("distributed_bfs, %2d workers, %-5s partition: %.2f seconds, speedup %.2f%s"
+				  % (num_workers, method, elapsed, serial / elapsed,
+					 "" if result == expected else ", RESULTS DIFFER"))
+		num_workers *= 2
@@ -0,0 +1,79 @@
+# Measures the bytes per edge of an AdjacencyListGraph, comparing the slotted Edge and
+# LinkedListNode classes against equivalent classes that keep an instance dictionary,
+# as the classes did before they used slots.
+#
+# Usage: python edge_memory.py [card_E]      (default 1000000 edges)
+
+import sys
+import tracemalloc
+import numpy as np
+import adjacency_list_graph
+import dll_sentinel
+from adjacency_list_graph import AdjacencyListGraph
+
+
+class DictEdge:
+
+	def __init__(self, v, weight=None, graph=None):
+		"""Edge with an instance dictionary and optional weight and graph attributes."""
+		self.v = v
+		if weight is not None:
+			self.weight = weight
+		if graph is not None:
+			self.graph = graph
+
+	def get_v(self):
+		return self.v
+
+
+class DictLinkedListNode:
+
+	def __init__(self, data):
+		"""Linked-list node with an instance dictionary."""
+		self.prev = None
+		self.next = None
+		self.data = data
+
+	def get_data(self):
+		return self.data
+
+
+def measure_graph(card_V, u, v, weights):
+	"""Return the number of bytes allocated to build an AdjacencyListGraph from edge arrays."""
+	tracemalloc.start()
+	start = tracemalloc.get_traced_memory()[0]
+	G = AdjacencyListGraph.from_edge_arrays(card_V, u, v, weights)
+	used = tracemalloc.get_traced_memory()[0] - start
+	tracemalloc.stop()
+	del G
+	return used
+
+
+def measure(card_V, u, v, weights):
+	"""Return the bytes allocated with dictionary-based classes and with slotted classes."""
+	slotted = (adjacency_list_graph.Edge, dll_sentinel.LinkedListNode)
+	try:
+		adjacency_list_graph.Edge = DictEdge
+		dll_sentinel.LinkedListNode = DictLinkedListNode
+		before = measure_graph(card_V, u, v, weights)
+	finally:
+		adjacency_list_graph.Edge, dll_sentinel.LinkedListNode = slotted
+	after = measure_graph(card_V, u, v, weights)
+	return before, after
+
+
+if __name__ == "__main__":
+
+	card_E = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+	card_V = max(card_E // 10, 1)
+	rng = np.random.default_rng(0)
+	keys = np.unique(rng.integers(0, card_V * card_V, size=card_E))
+	u, v = keys // card_V, keys % card_V
+
+	for weighted in [False, True]:
+		weights = rng.integers(0, 100, size=len(u)) if weighted else None
+		before, after = measure(card_V, u, v, weights)
+		print(("Weighted" if weighted else "Unweighted") + " graph, " + str(len(u)) + " edges:")
+		print("  with instance dictionaries: %.1f bytes per edge" % (before / len(u)))
+		print("  with slots:                 %.1f bytes per edge" % (after / len(u)))
+		print("  saving: %.0f%%" % (100 * (1 - after / before)))
@@ -0,0 +1,39 @@
+# Compares one bfs per source with multi_source_bfs, which searches from a batch of
+# sources at once with one bit per source in each vertex's masks, on a random G(n, m)
+# graph.
+#
+# Usage: python multi_source_bfs.py [card_V] [card_E] [card_sources] [batch_size]
+#        (defaults 50000 vertices, 250000 edges, 256 sources, and batches of 64)
+
+import sys
+import time
+import numpy as np
+from bfs import bfs, multi_source_bfs
+from csr_graph import CSRGraph
+
+
+if __name__ == "__main__":
+
+	card_V = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+	card_E = int(sys.argv[2]) if len(sys.argv) > 2 else 250000
+	card_sources = int(sys.argv[3]) if len(sys.argv) > 3 else 256
+	batch_size = int(sys.argv[4]) if len(sys.argv) > 4 else 64
+
+	rng = np.random.default_rng(0)
+	keys = np.unique(rng.integers(0, card_V * card_V, size=card_E))
+	G = CSRGraph.from_edge_arrays(card_V, keys // card_V, keys % card_V)
+	sources = rng.choice(card_V, size=card_sources, replace=False)
+	print(card_V, "vertices,", G.get_card_E(), "edges,", card_sources, "sources")
+
+	# Time bfs on a sample of the sources and scale up.
+	sample = sources[:16]
+	start = time.perf_counter()
+	expected = np.array([bfs(G, s)[0] for s in sample.tolist()])
+	one_at_a_time = (time.perf_counter() - start) * card_sources / len(sample)
+	print("bfs per source:    %.2f seconds (estimated from %d sources)" % (one_at_a_time, len(sample)))
+
+	start = time.perf_counter()
+	dist = multi_source_bfs(G, sources, batch_size)
+	batched = time.perf_counter() - start
+	print("multi_source_bfs:  %.2f seconds, batches of %d, speedup %.1f" % (batched, batch_size, one_at_a_time / batched))
+	print("same distances:", np.array_equal(dist[:len(sample)], expected))
@@ -31,6 +31,7 @@
 #########################################################################
 
 class LinkedListNode:
+	__slots__ = ("prev", "next", "data")
 
 	def __init__(self, data):
 		"""Initialize a node of a circular doubly linked list with a sentinel with the given data."""
@@ -49,13 +50,15 @@ class LinkedListNode:
 
 class DLLSentinel:
 
-	def __init__(self, get_key_func=None):
+	def __init__(self, get_key_func=None, indexed=False):
 		"""Initialize the sentinel of a circular doubly linked list with a sentinel.
 
 		Arguments:
 		get_key_func -- an optional function that returns the key for the
 		objects stored. May be a static function in the object class. If 
 		omitted, then identity function is used.
+		indexed -- if True, also keep a dictionary from keys to nodes, so that search
+		takes expected O(1) time.  The keys of the objects stored must then be distinct.
 		"""
 		self.sentinel = LinkedListNode(None)  # holds None as data
 		self.sentinel.next = self.sentinel  # the sentinel points to itself in an empty list
@@ -66,12 +69,18 @@ class DLLSentinel:
 		else:
 			self.get_key = get_key_func  # return key defined by user
 
+		# The index maps each key to the node holding it, or is None if not indexed.
+		self.index = {} if indexed else None
+
 	def search(self, k):
 		"""Search a circular doubly linked list with a sentinel for a node with key k.
 
 		Returns:
 		x -- node with key k or None if not found
 		"""
+		if self.index is not None:
+			return self.index.get(k)
+
 		x = self.sentinel.next
 		# Go down the list until key k is found.
 		# Need to test for the sentinel to avoid calling get_key(None) when x is the sentinel.
@@ -90,6 +99,8 @@ class DLLSentinel:
 		x.prev = y                 # x's predecessor is y
 		y.next.prev = x            # x comes before y's successor
 		y.next = x                 # x is now y's successor
+		if self.index is not None:
+			self.index[self.get_key(data)] = x
 		return x
 
 	def prepend(self, data):
@@ -112,11 +123,15 @@ class DLLSentinel:
 			raise RuntimeError("Cannot delete sentinel.")
 		x.prev.next = x.next  # point prev to next
 		x.next.prev = x.prev  # point next to prev
+		if self.index is not None and self.index.get(self.get_key(x.data)) is x:
+			del self.index[self.get_key(x.data)]
 
 	def delete_all(self):
 		"""Delete all nodes in a circular doubly linked list with a sentinel."""
 		self.sentinel.next = self.sentinel
 		self.sentinel.prev = self.sentinel
+		if self.index is not None:
+			self.index.clear()
 
 	def iterator(self):
 		"""Iterator from the head of a circular doubly linked list with a sentinel."""
@@ -127,7 +142,7 @@ class DLLSentinel:
 
 	def copy(self):
 		"""Return a copy of this circular doubly linked list with a sentinel."""
-		c = DLLSentinel(self.get_key)      # c is the copy
+		c = DLLSentinel(self.get_key, self.index is not None)  # c is the copy
 		x = self.sentinel.next
 		while x != self.sentinel:
 			c.append(x.data)   # append a node with x's data to c
@@ -194,3 +209,14 @@ if __name__ == "__main__":
 	linked_list3.insert(KeyObject("VT", 17), node5)  # insert VT after CO
 	linked_list3.delete(node5)                       # delete CO
 	print(linked_list3)
+
+	# Indexed search.
+	linked_list4 = DLLSentinel(KeyObject.get_key, indexed=True)
+	for i in range(len(list1)):
+		linked_list4.append(KeyObject(list1[i], i))
+	print(linked_list4.search(5))  # CO has key 5
+	linked_list4.delete(linked_list4.search(5))
+	print(linked_list4.search(5))  # unsuccessful search
+	linked_list5 = linked_list4.copy()
+	linked_list4.delete_all()
+	print(linked_list4.search(3), linked_list5.search(3))  # None, then AR
@@ -31,6 +31,7 @@
 #########################################################################
 
 class ForestNode:
+	__slots__ = ("data", "parent", "rank")
 
 	def __init__(self, data):
 		"""Initialize forest node with itself as a parent adn rank 0."""
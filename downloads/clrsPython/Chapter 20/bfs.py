@@ -30,8 +30,11 @@
 #                                                                       #
 #########################################################################
 
+import numpy as np
 from fifo_queue import Queue
 from adjacency_list_graph import AdjacencyListGraph
+from csr_graph import CSRGraph
+from adjacency_matrix_graph import unpack_bits
 from print_path import print_path
 
 WHITE = 0  # undiscovered
@@ -69,6 +72,158 @@ def bfs(G, source):
 	return dist, pi
 
 
+def edge_positions(offsets, vertices):
+	"""Return the positions in a CSR targets array of all the edges leaving the given
+	vertices, together with the vertex that each edge leaves."""
+	starts = offsets[vertices]
+	degrees = offsets[vertices + 1] - starts
+	sources = np.repeat(vertices, degrees)
+	# Position of each edge within its vertex's adjacency list, plus the list's start.
+	first = np.cumsum(degrees) - degrees
+	positions = np.arange(len(sources)) - np.repeat(first - starts, degrees)
+	return positions, sources
+
+
+def direction_optimizing_bfs(G, source, alpha=14, beta=24):
+	"""Perform breadth-first search one level at a time, keeping each frontier as an array
+	of vertices, and return the same distances as bfs, with predecessors that also form
+	a breadth-first tree.  A top-down step examines every edge leaving the frontier.  A
+	bottom-up step has each undiscovered vertex look through its entering edges for a
+	parent on the frontier, stopping at the first one, which costs less once the frontier
+	is large.  The search switches between the steps by Beamer's heuristic.
+
+	Arguments:
+	G -- the graph, implemented with adjacency lists or as a CSRGraph
+	source -- index of the source vertex
+	alpha -- switch to bottom-up once the frontier has more than 1/alpha of the edges
+	entering undiscovered vertices; 0 for top-down steps only
+	beta -- switch back to top-down once the frontier has fewer than 1/beta of the vertices
+	"""
+	if not isinstance(G, CSRGraph):
+		G = CSRGraph.from_graph(G)
+	card_V = G.get_card_V()
+	offsets, targets = G.get_offsets(), G.get_targets()
+	G_transpose = G.transpose() if G.is_directed() else G
+	in_offsets, in_targets = G_transpose.get_offsets(), G_transpose.get_targets()
+	out_degree = np.diff(offsets)
+	in_degree = np.diff(in_offsets)
+
+	dist = np.full(card_V, -1, dtype=np.int64)  # -1 for undiscovered
+	pi = np.full(card_V, -1, dtype=np.int64)
+	dist[source] = 0
+	frontier = np.array([source], dtype=np.int64)
+	unexplored_edges = in_degree.sum() - in_degree[source]  # edges entering undiscovered vertices
+	top_down = True
+	level = 0
+	while len(frontier) > 0:
+		if top_down and alpha * out_degree[frontier].sum() > unexplored_edges:
+			top_down = False
+		elif not top_down and beta * len(frontier) < card_V:
+			top_down = True
+
+		if top_down:
+			positions, sources = edge_positions(offsets, frontier)
+			v = targets[positions]
+			new = dist[v] < 0
+			# The first edge found into each newly discovered vertex gives its parent.
+			discovered, first = np.unique(v[new], return_index=True)
+			pi[discovered] = sources[new][first]
+		else:
+			on_frontier = np.zeros(card_V, dtype=bool)
+			on_frontier[frontier] = True
+			# In round k, each vertex still looking checks its kth entering edge.
+			looking = np.flatnonzero(dist < 0)
+			found = []
+			k = 0
+			while len(looking) > 0:
+				looking = looking[in_degree[looking] > k]
+				u = in_targets[in_offsets[looking] + k]
+				is_parent = on_frontier[u]
+				pi[looking[is_parent]] = u[is_parent]
+				found.append(looking[is_parent])
+				looking = looking[~is_parent]
+				k += 1
+			discovered = np.sort(np.concatenate(found)) if len(found) > 0 else frontier[:0]
+
+		level += 1
+		dist[discovered] = level
+		unexplored_edges -= in_degree[discovered].sum()
+		frontier = discovered
+
+	return ([d if d >= 0 else float('inf') for d in dist.tolist()],
+			[u if u >= 0 else None for u in pi.tolist()])
+
+
+def multi_source_bfs_batches(G, sources, batch_size=64):
+	"""Perform breadth-first searches from many sources together, batch_size sources at a
+	time, and yield the distances for each batch as it is finished.  Each vertex has a
+	frontier mask and a seen mask with one bit per source in the batch, so that each
+	level scans the edges leaving the frontier once for the whole batch, ORing the
+	frontier mask of u into the mask of v for each edge (u, v), instead of once per
+	source.  Memory is proportional to batch_size times the number of vertices, however
+	many sources there are.
+
+	Arguments:
+	G -- the graph, implemented with adjacency lists or as a CSRGraph
+	sources -- sequence of indices of source vertices
+	batch_size -- number of sources searched together, rounded up to a multiple of 64 bits
+	in each mask
+	Yields:
+	For each batch, in order, the sources in the batch and a matrix whose [i, v] entry
+	is the distance from the ith source in the batch to vertex v, infinity if v is
+	unreachable
+	"""
+	if not isinstance(G, CSRGraph):
+		G = CSRGraph.from_graph(G)
+	card_V = G.get_card_V()
+	offsets, targets = G.get_offsets(), G.get_targets()
+	sources = np.asarray(sources, dtype=np.int64)
+	card_words = (batch_size + 63) // 64
+
+	for first in range(0, len(sources), batch_size):
+		batch = sources[first:first + batch_size]
+		dist = np.full((len(batch), card_V), np.inf)
+		dist[np.arange(len(batch)), batch] = 0
+		# Bit i % 64 of word i // 64 in a vertex's mask stands for the ith source of the batch.
+		bits = np.arange(len(batch))
+		frontier = np.zeros((card_V, card_words), dtype=np.uint64)
+		np.bitwise_or.at(frontier, (batch, bits >> 6), np.left_shift(np.uint64(1), (bits & 63).astype(np.uint64)))
+		seen = frontier.copy()
+		level = 0
+		while True:
+			active = np.flatnonzero(frontier.any(axis=1))
+			if len(active) == 0:
+				break
+			positions, edge_sources = edge_positions(offsets, active)
+			next_frontier = np.zeros_like(frontier)
+			np.bitwise_or.at(next_frontier, targets[positions], frontier[edge_sources])
+			next_frontier &= ~seen  # keep only the sources reaching each vertex for the first time
+			seen |= next_frontier
+			level += 1
+			reached = np.flatnonzero(next_frontier.any(axis=1))
+			vertices, searches = np.nonzero(unpack_bits(next_frontier[reached], len(batch)))
+			dist[searches, reached[vertices]] = level
+			frontier = next_frontier
+		yield batch, dist
+
+
+def multi_source_bfs(G, sources, batch_size=64):
+	"""Return the matrix of distances from each of the sources to each vertex, computed by
+	multi_source_bfs_batches.  Row i gives the distances from sources[i], with infinity
+	for unreachable vertices.  To keep less than the whole matrix in memory at once, use
+	multi_source_bfs_batches instead.
+
+	Arguments:
+	G -- the graph, implemented with adjacency lists or as a CSRGraph
+	sources -- sequence of indices of source vertices
+	batch_size -- number of sources searched together
+	"""
+	batches = [dist for batch, dist in multi_source_bfs_batches(G, sources, batch_size)]
+	if len(batches) == 0:
+		return np.zeros((0, G.get_card_V()))
+	return np.concatenate(batches)
+
+
 # Testing
 if __name__ == "__main__":
 
@@ -101,3 +256,22 @@ if __name__ == "__main__":
 	for i in range(card_V):
 		print(vertices[i] + ": dist = " + str(dist[i]) + ", path = " + \
 				str(print_path(predecessor, s, i, lambda i: vertices[i])))
+	print(direction_optimizing_bfs(graph2, s) == (dist, predecessor))
+
+	# Random graphs, some dense enough for bottom-up steps.
+	from generate_random_graph import generate_gnp_graph
+	for directed in [True, False]:
+		for p in [0.002, 0.05]:
+			graph3 = generate_gnp_graph(1000, p, True, directed, seed=3)
+			dist, pi = bfs(graph3, 0)
+			do_dist, do_pi = direction_optimizing_bfs(graph3, 0)
+			print("directed" if directed else "undirected", p, do_dist == dist,
+				  all(graph3.has_edge(do_pi[v], v) and dist[do_pi[v]] == dist[v] - 1
+					  for v in range(1000) if do_pi[v] is not None))
+
+	# Many sources at once, in one and in two words per mask.
+	graph4 = generate_gnp_graph(500, 0.006, True, True, seed=4)
+	sources = list(range(0, 500, 3))
+	expected = np.array([bfs(graph4, s)[0] for s in sources])
+	print(all(np.array_equal(multi_source_bfs(graph4, sources, batch_size), expected)
+			  for batch_size in [64, 100]))
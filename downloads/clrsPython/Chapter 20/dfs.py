@@ -37,6 +37,73 @@ GRAY = 1   # discovered
 BLACK = 2  # visited
 
 
+class DepthFirstSearch:
+
+	def __init__(self, G, discover_func=None, finish_func=None):
+		"""Initialize the state of one depth-first search: the timestamp and the color,
+		pi, discovery-time, and finish-time lists.  Each search has its own state, so
+		that searches may run in several threads at once.
+
+		Arguments:
+		G -- a graph, represented by adjacency lists.
+		discover_func -- function called upon discovering a vertex from traversing
+		an edge in a graph, taking the vertex as an argument.  Defaults to do nothing.
+		finish_func -- function called upon finishing a vertex in a graph, taking the
+		vertex as an argument.  Defaults to do nothing.
+		"""
+		self.G = G
+		self.discover_func = discover_func
+		self.finish_func = finish_func
+		self.time = 0  # timestamp
+		card_V = G.get_card_V()
+		self.color = [WHITE] * card_V  # vertices are numbered, color[0] corresponds with color of vertex 0.
+		self.pi = [None] * card_V
+		self.d = [None] * card_V 	# discovery times
+		self.f = [None] * card_V 	# finish times
+
+	def is_discovered(self, u):
+		"""Return True if vertex u has been discovered."""
+		return self.color[u] != WHITE
+
+	def visit(self, u):
+		"""Perform depth-first search from a given white vertex, building one depth-first
+		tree.  The recursion of DFS-Visit is replaced by an explicit stack holding, for
+		each gray vertex, an iterator over its remaining edges, so that the depth of the
+		tree is not limited by Python's recursion limit.
+
+		Argument:
+		u -- root of the depth-first tree
+		"""
+		G = self.G
+		color, pi, d, f = self.color, self.pi, self.d, self.f
+		discover_func, finish_func = self.discover_func, self.finish_func
+		self.time += 1  # white vertex u has just been discovered
+		d[u] = self.time
+		color[u] = GRAY
+		stack = [(u, iter(G.get_adj_list(u)))]
+
+		while len(stack) > 0:
+			u, edges = stack[-1]
+			for edge in edges:  # explore the next edge (u, v)
+				v = edge.get_v()
+				if color[v] == WHITE:
+					if discover_func is not None:
+						discover_func(v)  # do something with vertex v upon discovering it
+					pi[v] = u
+					self.time += 1  # white vertex v has just been discovered
+					d[v] = self.time
+					color[v] = GRAY
+					stack.append((v, iter(G.get_adj_list(v))))  # continue the search from v
+					break
+			else:  # every edge leaving u has been explored
+				stack.pop()
+				self.time += 1
+				f[u] = self.time
+				color[u] = BLACK  # black u; it is finished
+				if finish_func is not None:
+					finish_func(u)  # do something with vertex u upon finishing it
+
+
 def dfs(G, start_dfs_tree=None, discover_func=None, finish_func=None, order=None):
 	"""Perform depth-first search on a graph represented by adjacency lists.
 
@@ -56,61 +123,21 @@ def dfs(G, start_dfs_tree=None, discover_func=None, finish_func=None, order=None
 	f -- list of vertex finish times
 	pi -- list of depth-first vertex predecessors
 	"""
-	# Initialize color, pi, distance, and finish time lists.
-	global time, color, pi, d, f
-	time = 0  # global timestamp
-	card_V = G.get_card_V()
-	color = [WHITE] * card_V  # vertices are numbered, color[0] corresponds with color of vertex 0.
-	pi = [None] * card_V
-	d = [None] * card_V 	# discovery times
-	f = [None] * card_V 	# finish times
+	search = DepthFirstSearch(G, discover_func, finish_func)
 
 	# Default order for starting searches goes from vertex 0 to vertex (card_V - 1).
 	if order is None:
-		order = range(card_V)
+		order = range(G.get_card_V())
 
 	# Visit each unvisited vertex.
 	for u in order:
-		if color[u] == WHITE:
+		if not search.is_discovered(u):
 			if start_dfs_tree is not None:
 				start_dfs_tree()
 			if discover_func is not None:
 				discover_func(u)  # discover first vertex in this depth-first tree
-			dfs_visit(G, u, discover_func, finish_func)  # DFS from vertex u
-	return d, f, pi
-
-
-def dfs_visit(G, u, discover_func, finish_func):
-	"""Perform depth-first search on a graph represented by adjacency lists, starting
-	from a given vertex.
-
-	Arguments:
-	G -- a graph, represented by adjacency lists.
-	u -- root of the depth-first tree
-	discover_func -- function called upon discovering a vertex from traversing
-	an edge in a graph, taking the vertex as an argument.  Defaults to do nothing.
-	finish_func -- function called upon finishing a vertex in a graph, taking the
-	vertex as an argument.  Defaults to do nothing.
-
-	Updates the global timestamp time and the global lists color, pi, d, and f.
-	"""
-	global time, color, pi, d, f
-	time += 1  # white vertex u has just been discovered
-	d[u] = time
-	color[u] = GRAY
-
-	for edge in G.get_adj_list(u):  # explore each edge (u, v)
-		v = edge.get_v()
-		if color[v] == WHITE:
-			if discover_func is not None:
-				discover_func(v)  # do something with vertex v upon discovering it
-			pi[v] = u
-			dfs_visit(G, v, discover_func, finish_func)
-	time += 1
-	f[u] = time
-	color[u] = BLACK  # black u; it is finished
-	if finish_func is not None:
-		finish_func(u)  # do something with vertex v upon finishing it
+			search.visit(u)  # DFS from vertex u
+	return search.d, search.f, search.pi
 
 
 # Testing
@@ -133,3 +160,18 @@ if __name__ == "__main__":
 			print(pi[v])
 		else:
 			print(vertices[pi[v]])
+
+	# A path too long for recursive DFS-Visit.
+	from csr_graph import CSRGraph
+	n = 200000
+	path = CSRGraph.from_edge_arrays(n, np.arange(n - 1), np.arange(1, n))
+	d, f, pi = dfs(path)
+	print(d[n - 1], f[0], pi[n - 1])
+
+	# Searches in several threads at once give the same results as one at a time.
+	from concurrent.futures import ThreadPoolExecutor
+	from generate_random_graph import generate_gnp_graph
+	graphs = [generate_gnp_graph(2000, 0.002, True, True, seed=i) for i in range(4)]
+	with ThreadPoolExecutor(4) as executor:
+		results = list(executor.map(dfs, graphs))
+	print(all(result == dfs(graph) for result, graph in zip(results, graphs)))
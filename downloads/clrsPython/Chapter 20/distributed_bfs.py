@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# distributed_bfs.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+import multiprocessing as mp
+import numpy as np
+from partitioned_graph import PartitionedGraph
+
+
+def bfs_worker(p, part, owners, local_index, key_base, source, inboxes, coordinator):
+	"""Run the breadth-first search for the vertices in one part of a partitioned graph.
+
+	In each level, the worker scans the adjacency lists of the frontier vertices it owns
+	and sends each other worker a batch of the edges (u, v) leading to vertices v that
+	worker owns.  An edge gets the key rank(u) * key_base + i, where rank(u) is the
+	position of u in the frontier, in the order that bfs would dequeue it, and the edge
+	is the ith entry in the adjacency list of u.  A vertex discovered in this level gets
+	as its predecessor the u of the incoming edge with the smallest key, which is the
+	first vertex that bfs would see it from.  The coordinator turns the keys of the newly
+	discovered vertices into ranks for the next level.
+
+	Arguments:
+	p -- number of this worker's part
+	part -- tuple (vertices, offsets, targets) from PartitionedGraph.get_part
+	owners -- array giving the part that owns each vertex
+	local_index -- array giving the position of each vertex within its part
+	key_base -- one more than the largest out-degree
+	source -- index of the source vertex
+	inboxes -- list of queues, inboxes[q] receiving the edge batches for worker q
+	coordinator -- connection to the coordinating process
+	"""
+	vertices, offsets, targets = part
+	num_parts = len(inboxes)
+	dist = np.full(len(vertices), -1, dtype=np.int64)  # -1 for undiscovered
+	pi = np.full(len(vertices), -1, dtype=np.int64)    # -1 for no predecessor
+	frontier = np.empty(0, dtype=np.int64)
+	ranks = np.empty(0, dtype=np.int64)
+	if owners[source] == p:
+		dist[local_index[source]] = 0
+		frontier = np.array([source], dtype=np.int64)
+		ranks = np.zeros(1, dtype=np.int64)
+
+	level = 0
+	while True:
+		# Expand the frontier: one entry per edge leaving a frontier vertex.
+		local = local_index[frontier]
+		lengths = offsets[local + 1] - offsets[local]
+		positions = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+		v = targets[np.repeat(offsets[local], lengths) + positions]
+		keys = np.repeat(ranks, lengths) * key_base + positions
+		parents = np.repeat(frontier, lengths)
+
+		# Exchange the edges with the workers owning their endpoints.
+		destinations = owners[v]
+		batches = []
+		for q in range(num_parts):
+			mask = destinations == q
+			if q == p:
+				batches.append((v[mask], keys[mask], parents[mask]))
+			else:
+				inboxes[q].put((v[mask], keys[mask], parents[mask]))
+		for i in range(num_parts - 1):
+			batches.append(inboxes[p].get())
+		v = np.concatenate([batch[0] for batch in batches])
+		keys = np.concatenate([batch[1] for batch in batches])
+		parents = np.concatenate([batch[2] for batch in batches])
+
+		# Discover each undiscovered vertex from the edge with the smallest key.
+		undiscovered = dist[local_index[v]] < 0
+		v, keys, parents = v[undiscovered], keys[undiscovered], parents[undiscovered]
+		order = np.argsort(keys)
+		v, keys, parents = v[order], keys[order], parents[order]
+		first = np.unique(v, return_index=True)[1]
+		first.sort()  # keep the new vertices in key order
+		frontier, keys = v[first], keys[first]
+		dist[local_index[frontier]] = level + 1
+		pi[local_index[frontier]] = parents[first]
+
+		# Let the coordinator rank the new frontier against those of the other workers.
+		coordinator.send(keys)
+		ranks = coordinator.recv()
+		if ranks is None:
+			break
+		level += 1
+
+	coordinator.send((dist, pi))
+	coordinator.close()
+
+
+def distributed_bfs(G, source, num_workers=2, method="range"):
+	"""Perform a level-synchronous breadth-first search with the vertices partitioned
+	among worker processes, returning the same distances and predecessors as bfs.
+
+	Arguments:
+	G -- the graph, or a PartitionedGraph
+	source -- index of the source vertex
+	num_workers -- number of worker processes, if G is not already partitioned
+	method -- partitioning method, "range" or "hash", if G is not already partitioned
+	"""
+	parts = G if isinstance(G, PartitionedGraph) else PartitionedGraph(G, num_workers, method)
+	num_parts = parts.get_num_parts()
+	owners = parts.get_owners()
+	local_index = parts.get_local_index()
+	key_base = parts.get_max_degree() + 1
+
+	inboxes = [mp.Queue() for p in range(num_parts)]
+	connections = []
+	workers = []
+	for p in range(num_parts):
+		here, there = mp.Pipe()
+		worker = mp.Process(target=bfs_worker, args=(p, parts.get_part(p), owners, local_index,
+													 key_base, source, inboxes, there))
+		worker.start()
+		there.close()
+		connections.append(here)
+		workers.append(worker)
+
+	# Barrier between levels: gather the keys of the newly discovered vertices and send
+	# back their ranks among all of them, or None once no vertices were discovered.
+	while True:
+		keys = [connection.recv() for connection in connections]
+		all_keys = np.sort(np.concatenate(keys))
+		for p in range(num_parts):
+			connections[p].send(np.searchsorted(all_keys, keys[p]) if len(all_keys) > 0 else None)
+		if len(all_keys) == 0:
+			break
+
+	dist = [float('inf')] * parts.get_card_V()
+	pi = [None] * parts.get_card_V()
+	for p in range(num_parts):
+		part_dist, part_pi = connections[p].recv()
+		for v, d, u in zip(parts.get_part(p)[0].tolist(), part_dist.tolist(), part_pi.tolist()):
+			if d >= 0:
+				dist[v] = d
+				pi[v] = u if u >= 0 else None
+	for worker in workers:
+		worker.join()
+	return dist, pi
+
+
+# Testing
+if __name__ == "__main__":
+
+	from bfs import bfs
+	from generate_random_graph import generate_gnp_graph
+
+	for directed in [True, False]:
+		graph1 = generate_gnp_graph(300, 0.01, True, directed, seed=5)
+		for method in ["range", "hash"]:
+			for num_workers in [1, 3]:
+				same = all(distributed_bfs(graph1, s, num_workers, method) == bfs(graph1, s) for s in [0, 17, 299])
+				print("directed" if directed else "undirected", method, num_workers, "workers:", same)
+
+	parts = PartitionedGraph(graph1, 2, "hash")
+	dist, pi = distributed_bfs(parts, 4)
+	print(dist[:10], pi[:10])
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# reachability_index.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+import numpy as np
+from csr_graph import CSRGraph
+from strongly_connected_components import strongly_connected_components
+
+
+class ReachabilityIndex:
+
+	def __init__(self, G):
+		"""Initialize an index answering whether a path exists from one vertex of a directed
+		graph to another without computing the transitive closure.  Each strongly connected
+		component becomes one vertex of the component graph, a dag.  Every component gets
+		2-hop labels, sets of components through which it reaches or is reached, built by
+		pruned breadth-first searches, so that u reaches v if and only if the out-label of
+		u's component meets the in-label of v's component.  Intervals from one depth-first
+		search of the dag answer many queries before the labels are consulted.  The index
+		does not follow later changes to G.
+
+		Argument:
+		G -- a directed graph offering get_adj_list, such as an AdjacencyListGraph or CSRGraph
+		"""
+		if not G.is_directed():
+			raise RuntimeError("Graph must be directed.")
+		card_V = G.get_card_V()
+		self.component = np.empty(card_V, dtype=np.int64)
+		components = strongly_connected_components(G)
+		for c, members in enumerate(components):
+			self.component[members] = c
+		self.card_C = len(components)
+
+		# The component graph, with each edge between components kept once.
+		if not isinstance(G, CSRGraph):
+			G = CSRGraph.from_graph(G)
+		u, v, weights = G.get_edge_arrays()
+		keys = np.unique(self.component[u] * self.card_C + self.component[v])
+		keys = keys[keys // self.card_C != keys % self.card_C]
+		self.dag = CSRGraph.from_edge_arrays(self.card_C, keys // self.card_C, keys % self.card_C)
+		self.dag_transpose = self.dag.transpose()
+
+		self.compute_intervals()
+		self.compute_labels()
+
+	def compute_intervals(self):
+		"""Number the components in a depth-first search of the dag.  Component c is a
+		descendant of component a in the depth-first forest if and only if pre[a] <= pre[c]
+		and post[c] <= post[a].  low[c] is the smallest post over all components that c
+		reaches, so that if a reaches c then low[a] <= low[c] and post[c] <= post[a]."""
+		card_C = self.card_C
+		offsets = self.dag.get_offsets().tolist()
+		targets = self.dag.get_targets().tolist()
+		self.pre = [0] * card_C
+		self.post = [0] * card_C
+		self.low = [0] * card_C
+		visited = [False] * card_C
+		pre_time = 0
+		post_time = 0
+		for root in range(card_C):
+			if visited[root]:
+				continue
+			visited[root] = True
+			self.pre[root] = pre_time
+			pre_time += 1
+			stack = [(root, offsets[root])]  # each component with its next edge to explore
+			while len(stack) > 0:
+				a, i = stack[-1]
+				if i < offsets[a + 1]:
+					stack[-1] = (a, i + 1)
+					c = targets[i]
+					if not visited[c]:
+						visited[c] = True
+						self.pre[c] = pre_time
+						pre_time += 1
+						stack.append((c, offsets[c]))
+				else:
+					stack.pop()
+					self.post[a] = post_time
+					# In a dag, every component a reaches has finished by now.
+					self.low[a] = min([post_time] + [self.low[c] for c in targets[offsets[a]:offsets[a + 1]]])
+					post_time += 1
+
+	def compute_labels(self):
+		"""Compute the 2-hop labels by pruned breadth-first searches from the components in
+		decreasing order of (in-degree + 1) * (out-degree + 1), so that the best-connected
+		components are hubs first.  A search from hub h stops at each component whose
+		reachability from h the labels already show."""
+		card_C = self.card_C
+		forward = (self.dag.get_offsets().tolist(), self.dag.get_targets().tolist())
+		backward = (self.dag_transpose.get_offsets().tolist(), self.dag_transpose.get_targets().tolist())
+		in_degree = np.diff(self.dag_transpose.get_offsets())
+		out_degree = np.diff(self.dag.get_offsets())
+		order = np.argsort(-(in_degree + 1) * (out_degree + 1), kind="stable").tolist()
+		self.label_in = [set() for c in range(card_C)]   # hubs reaching c
+		self.label_out = [set() for c in range(card_C)]  # hubs that c reaches
+		visited = [-1] * card_C  # visited[c] is the last search that visited c
+		search = 0
+		for rank, h in enumerate(order):
+			for (offsets, targets), labels, covered in \
+					[(forward, self.label_in, lambda c: self.labels_meet(h, c)),
+					 (backward, self.label_out, lambda c: c != h and self.labels_meet(c, h))]:
+				visited[h] = search
+				queue = [h]
+				for a in queue:
+					if covered(a):
+						continue  # an earlier hub already connects h and a
+					labels[a].add(rank)
+					for c in targets[offsets[a]:offsets[a + 1]]:
+						if visited[c] != search:
+							visited[c] = search
+							queue.append(c)
+				search += 1
+
+	def labels_meet(self, a, c):
+		"""Return True if the labels show that component a reaches component c."""
+		return not self.label_out[a].isdisjoint(self.label_in[c])
+
+	def get_component(self, v):
+		"""Return the index of the strongly connected component containing vertex v."""
+		return self.component[v].item()
+
+	def get_num_components(self):
+		"""Return the number of strongly connected components."""
+		return self.card_C
+
+	def get_label_size(self):
+		"""Return the total number of entries in all the labels."""
+		return sum(len(label) for label in self.label_in) + sum(len(label) for label in self.label_out)
+
+	def reachable(self, u, v):
+		"""Return True if there is a path from vertex u to vertex v, False otherwise."""
+		a = self.component[u].item()
+		c = self.component[v].item()
+		if a == c:
+			return True
+		if self.post[c] > self.post[a] or self.low[c] < self.low[a]:
+			return False  # c's interval is not inside a's interval
+		if self.pre[a] <= self.pre[c]:
+			return True  # c is a descendant of a in the depth-first forest
+		return self.labels_meet(a, c)
+
+
+# Testing
+if __name__ == "__main__":
+
+	from vertex_labels import LabeledGraph
+	from generate_random_graph import generate_gnp_graph
+	from floyd_warshall import transitive_closure
+
+	# Textbook example for strongly connected components.
+	edges = [('a', 'b'), ('b', 'c'), ('b', 'e'), ('b', 'f'), ('c', 'd'), ('c', 'g'),
+			 ('d', 'c'), ('d', 'h'), ('e', 'f'), ('e', 'a'), ('f', 'g'), ('g', 'f'),
+			 ('g', 'h'), ('h', 'h')]
+	graph1 = LabeledGraph.from_labeled_edges([e[0] for e in edges], [e[1] for e in edges],
+											 labels=['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h'])
+	labels = graph1.get_labels()
+	index1 = ReachabilityIndex(graph1.get_graph())
+	print(index1.get_num_components())
+	for u in labels.get_labels():
+		print(u + " reaches " + "".join(v for v in labels.get_labels()
+										if index1.reachable(labels.get_id(u), labels.get_id(v))))
+
+	# Larger examples, checked against the transitive closure.
+	for n, p in [(300, 0.004), (300, 0.01), (600, 0.002)]:
+		graph2 = generate_gnp_graph(n, p, True, True, seed=n)
+		index2 = ReachabilityIndex(graph2)
+		closure = transitive_closure(graph2, n)
+		print(n, index2.get_num_components(), index2.get_label_size(),
+			  all(index2.reachable(u, v) == closure[u, v] for u in range(n) for v in range(n)))
@@ -32,6 +32,7 @@
 
 from dfs import dfs
 from counting_sort import counting_sort
+from graph_views import TransposeView
 
 
 def strongly_connected_components(G):
@@ -46,7 +47,7 @@ def strongly_connected_components(G):
 		raise RuntimeError("Graph must be directed.")
 	# Compute finishing times. 
 	d, f, pi = dfs(G)
-	G_transpose = G.transpose()
+	G_transpose = TransposeView(G)  # index incoming edges once, without building a new graph
 
 	# Create a list of the vertices in order of decreasing finish times.
 	card_V = G.get_card_V()
@@ -94,3 +95,13 @@ if __name__ == "__main__":
 	components = strongly_connected_components(graph2)
 	for component in components:
 		print([vertices[i] for i in component])
+
+	# A long cycle and a long path, from a thread pool.
+	from concurrent.futures import ThreadPoolExecutor
+	from csr_graph import CSRGraph
+	n = 100000
+	cycle = CSRGraph.from_edge_arrays(n, np.arange(n), (np.arange(n) + 1) % n)
+	path = CSRGraph.from_edge_arrays(n, np.arange(n - 1), np.arange(1, n))
+	with ThreadPoolExecutor(2) as executor:
+		cycle_components, path_components = executor.map(strongly_connected_components, [cycle, path])
+	print(len(cycle_components), len(path_components))
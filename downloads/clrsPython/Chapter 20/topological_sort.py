@@ -34,12 +34,6 @@ from dll_sentinel import DLLSentinel
 from dfs import dfs
 
 
-def finish(u):
-	"""Prepend onto the linked list as each vertex is finished."""
-	global ordered_list
-	ordered_list.prepend(u)
-
-
 def topological_sort(G):
 	"""Topologically sort a directed acyclic graph.
 
@@ -49,11 +43,11 @@ def topological_sort(G):
 	Returns:
 	A linked list giving the topologically sorted order of the vertices.
 	"""
-	global ordered_list
 	if not G.is_directed():
 		raise RuntimeError("Graph must be directed.")
 	ordered_list = DLLSentinel()
-	dfs(G, None, None, finish)  # no start_dfs_tree or discovery_func
+	# Prepend onto the linked list as each vertex is finished.
+	dfs(G, None, None, ordered_list.prepend)  # no start_dfs_tree or discovery_func
 	return ordered_list
 
 
@@ -94,3 +88,14 @@ if __name__ == "__main__":
 		topological_sort(graph3)
 	except RuntimeError as e:
 		print(e)
+
+	# A long path, sorted from a thread pool.
+	from concurrent.futures import ThreadPoolExecutor
+	from csr_graph import CSRGraph
+	n = 200000
+	order = np.random.default_rng(0).permutation(n)
+	graph4 = CSRGraph.from_edge_arrays(n, order[:-1], order[1:])
+	with ThreadPoolExecutor(2) as executor:
+		results = list(executor.map(topological_sort, [graph4, graph2]))
+	print(list(results[0].iterator()) == order.tolist(),
+		  [clothing[data] for data in results[1].iterator()] == [clothing[data] for data in clothing_order.iterator()])
@@ -31,19 +31,19 @@
 #########################################################################
 
 from merge_sort import merge_sort
-from adjacency_list_graph import AdjacencyListGraph
+from adjacency_list_graph import AdjacencyListGraph, UNWEIGHTED
 from disjoint_set_forest import make_set, find_set, union
 from min_heap_priority_queue import MinHeapPriorityQueue
 
 
 class KruskalEdge:
+    __slots__ = ("u", "v", "weight")
 
     def __init__(self, u, v, weight=None):
         """Initialize edge class that contains both endpoints and weight."""
         self.u = u
         self.v = v
-        if weight is not None:
-            self.weight = weight
+        self.weight = UNWEIGHTED if weight is None else weight
 
     def get_u(self):
         """Return endpoint of vertex that edge starts."""
@@ -100,35 +100,46 @@ def kruskal(G):
     return mst
 
 
-def prim(G, r):
+def prim(G, r, priority_queue=MinHeapPriorityQueue):
     """ Return the minimum spanning tree of a weighted, undirected graph G using Prim's algorithm.
+    Vertices enter the priority queue once they are adjacent to the tree.  If G is not
+    connected, a tree is grown from r and then from each vertex not yet in a tree.
 
     Arguments:
     G -- an undirected graph, represented by adjacency lists
     r -- root vertex to start from
+    priority_queue -- function making a min-priority queue from a key function, such as
+    MinHeapPriorityQueue, or for nonnegative integer weights, lambda key:
+    DialPriorityQueue(key, largest weight)
     """
     # Initialize keys and predecessors.
     card_V = G.get_card_V()
     pi = [None] * card_V
     visited = [False] * card_V  # visited vertices are in the MST
     key = [float('inf')] * card_V  # vertices not yet in MST
-    key[r] = 0  # root r has key 0
 
-    # Initialize the min-priority queue of vertices.
-    queue = MinHeapPriorityQueue(lambda u: key[u])
-    for u in range(card_V):
-        queue.insert(u)
-
-    while queue.get_size() > 0:
-        u = queue.extract_min()  # add u to the tree
-        visited[u] = True
-        for edge in G.get_adj_list(u):  # update the keys of u's non-tree neighbors
-            v = edge.get_v()
-            weight = edge.get_weight()
-            if not visited[v] and weight < key[v]:  # update v's key?
-                pi[v] = u
-                key[v] = weight
-                queue.decrease_key(v, weight) 	# update v in the min-priority queue
+    for root in [r] + list(range(card_V)):
+        if visited[root]:
+            continue
+        key[root] = 0  # root has key 0
+        # Initialize the min-priority queue of vertices.
+        queue = priority_queue(lambda u: key[u])
+        queue.insert(root)
+
+        while queue.get_size() > 0:
+            u = queue.extract_min()  # add u to the tree
+            visited[u] = True
+            for edge in G.get_adj_list(u):  # update the keys of u's non-tree neighbors
+                v = edge.get_v()
+                weight = edge.get_weight()
+                if not visited[v] and weight < key[v]:  # update v's key?
+                    pi[v] = u
+                    if key[v] == float('inf'):  # v is now adjacent to the tree
+                        key[v] = weight
+                        queue.insert(v)
+                    else:
+                        key[v] = weight
+                        queue.decrease_key(v, weight) 	# update v in the min-priority queue
 
     # Make the MST as an undirected, weighted graph.
     mst = AdjacencyListGraph(card_V, False, True)
@@ -204,3 +215,12 @@ if __name__ == "__main__":
     prim_weight2 = get_total_weight(prim2)
     print("Prim weight =", prim_weight2)
     print(prim_weight2 == kruskal_weight2)
+
+    # Prim's algorithm with a bucket queue, and on a graph that is not connected.
+    from dial_priority_queue import DialPriorityQueue
+    prim3 = prim(graph2, 0, lambda key: DialPriorityQueue(key, 15))
+    print(get_total_weight(prim3) == kruskal_weight2)
+    graph4 = AdjacencyListGraph(6, False, True)
+    for u, v, w in [(0, 1, 3), (1, 2, 1), (0, 2, 2), (3, 4, 5), (4, 5, 0), (3, 5, 4)]:
+        graph4.insert_edge(u, v, w)
+    print(get_total_weight(prim(graph4, 4)) == get_total_weight(kruskal(graph4)) == 7)
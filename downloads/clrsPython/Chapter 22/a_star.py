@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# a_star.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+import numpy as np
+from single_source_shortest_paths import initialize_single_source, relax
+from min_heap_priority_queue import MinHeapPriorityQueue
+from dijkstra import dijkstra
+from graph_views import TransposeView
+
+
+def a_star(G, s, t, heuristic=None):
+	"""Find a shortest path from s to t with A* search: Dijkstra's algorithm with each
+	vertex v keyed by d[v] + heuristic(v), where heuristic(v) is a lower bound on the
+	distance from v to t.  The search stops once t is extracted from the priority queue.
+
+	Arguments:
+	G -- a directed or undirected, weighted graph
+	s -- index of source vertex
+	t -- index of target vertex
+	heuristic -- function giving a lower bound on the distance from a vertex to t;
+	if None, the bound is 0 and the search is that of dijkstra with a target
+	Assumptions:
+	All weights are nonnegative.  The heuristic is consistent: heuristic(t) = 0 and
+	heuristic(u) <= w(u, v) + heuristic(v) for each edge (u, v).  An infinite bound means
+	that t is unreachable from the vertex, which is then never searched.
+
+	Returns:
+	distance -- shortest-path distance from s to t, infinity if t is unreachable
+	path -- list of the vertices on a shortest path from s to t, None if t is unreachable
+	settled -- number of vertices extracted from the priority queue
+	"""
+	if heuristic is None:
+		heuristic = lambda v: 0
+	d, pi = initialize_single_source(G, s)
+	h = {}  # h[v] caches heuristic(v)
+
+	def key(v):
+		if v not in h:
+			h[v] = heuristic(v)
+		return d[v] + h[v]
+
+	queue = MinHeapPriorityQueue(key)
+	queue.insert(s)
+	settled = 0
+	while queue.get_size() > 0:
+		u = queue.extract_min()
+		settled += 1
+		if u == t:
+			break  # d[t] can no longer decrease
+		for edge in G.get_adj_list(u):
+			v = edge.get_v()
+			key(v)  # fills in h[v]
+			if h[v] == float('inf'):
+				continue  # t is unreachable from v
+			reached = d[v] < float('inf')
+			relax(u, v, edge.get_weight(), d, pi,
+				  lambda v: queue.decrease_key(v, key(v)) if reached else queue.insert(v))
+
+	if d[t] == float('inf'):
+		return d[t], None, settled
+	path = []
+	v = t
+	while v is not None:
+		path.append(v)
+		v = pi[v]
+	path.reverse()
+	return d[t], path, settled
+
+
+def landmark_bound(to_v, to_t, from_v, from_t):
+	"""Return the largest of the triangle-inequality lower bounds on the distance from v
+	to t given by the landmarks, and 0.  to_v[i] and to_t[i] are the distances from v and
+	t to landmark i, and from_v[i] and from_t[i] are the distances from landmark i to v
+	and t.  A difference of two infinite distances gives no bound."""
+	inf = float('inf')
+	bound = 0
+	for i in range(len(to_v)):
+		if to_v[i] < inf or to_t[i] < inf:
+			bound = max(bound, to_v[i] - to_t[i])
+		if from_v[i] < inf or from_t[i] < inf:
+			bound = max(bound, from_t[i] - from_v[i])
+	return bound
+
+
+class Landmarks:
+
+	def __init__(self, G, k, first=0):
+		"""Preprocess graph G for A* search with the ALT (A*, landmarks, and triangle
+		inequality) heuristic.  Chooses k landmarks, each the vertex farthest from the
+		landmarks already chosen, and runs dijkstra from each landmark in G and in the
+		transpose of G to find the distances from and to every landmark.
+
+		Arguments:
+		G -- a directed or undirected, weighted graph with nonnegative weights
+		k -- number of landmarks
+		first -- index of the vertex to start from when choosing landmarks
+		"""
+		card_V = G.get_card_V()
+		G_transpose = TransposeView(G) if G.is_directed() else G
+		self.landmarks = []
+		from_rows = []  # from_rows[i][v] is the distance from landmark i to v
+		to_rows = []    # to_rows[i][v] is the distance from v to landmark i
+		nearest = np.full(card_V, np.inf)  # distance to the nearest landmark, either way
+		L = first
+		for i in range(min(k, card_V)):
+			self.landmarks.append(L)
+			from_rows.append(dijkstra(G, L)[0])
+			to_rows.append(dijkstra(G_transpose, L)[0] if G.is_directed() else from_rows[-1])
+			nearest = np.minimum(nearest, np.minimum(from_rows[-1], to_rows[-1]))
+			# The next landmark is the reachable vertex farthest from all the landmarks.
+			reachable = np.where(np.isinf(nearest), -1.0, nearest)
+			L = int(np.argmax(reachable))
+		self.from_dist = np.array(from_rows, dtype=np.float64).reshape(len(from_rows), card_V)
+		self.to_dist = np.array(to_rows, dtype=np.float64).reshape(len(to_rows), card_V)
+
+	def get_landmarks(self):
+		"""Return the list of landmark vertices."""
+		return self.landmarks
+
+	def get_from_dist(self):
+		"""Return the array whose entry [i, v] is the distance from landmark i to v."""
+		return self.from_dist
+
+	def get_to_dist(self):
+		"""Return the array whose entry [i, v] is the distance from v to landmark i."""
+		return self.to_dist
+
+	def lower_bound(self, v, t):
+		"""Return a lower bound on the distance from v to t.  By the triangle inequality,
+		for each landmark L, dist(v, t) >= dist(v, L) - dist(t, L) and
+		dist(v, t) >= dist(L, t) - dist(L, v)."""
+		return landmark_bound(self.to_dist[:, v].tolist(), self.to_dist[:, t].tolist(),
+							  self.from_dist[:, v].tolist(), self.from_dist[:, t].tolist())
+
+	def heuristic(self, t):
+		"""Return a consistent heuristic function for A* search toward target t."""
+		to_v = self.to_dist.T.tolist()      # to_v[v][i] is the distance from v to landmark i
+		from_v = self.from_dist.T.tolist()  # from_v[v][i] is the distance from landmark i to v
+		return lambda v: landmark_bound(to_v[v], to_v[t], from_v[v], from_v[t])
+
+	def save(self, filename):
+		"""Write the landmark tables to a file that load can read, so that other
+		processes can reuse them without preprocessing."""
+		with open(filename, "wb") as file:
+			np.savez(file, landmarks=np.array(self.landmarks, dtype=np.int64),
+					 from_dist=self.from_dist, to_dist=self.to_dist)
+
+	@staticmethod
+	def load(filename):
+		"""Return the Landmarks object written to a file by save."""
+		landmarks = Landmarks.__new__(Landmarks)
+		with np.load(filename) as tables:  # each lookup reads a fresh array from the file
+			landmarks.landmarks = tables["landmarks"].tolist()
+			landmarks.from_dist = tables["from_dist"]
+			landmarks.to_dist = tables["to_dist"]
+		return landmarks
+
+
+# Testing
+if __name__ == "__main__":
+
+	import os
+	import tempfile
+	from generate_random_graph import generate_grid_graph, generate_gnp_graph
+
+	# Road-like grid, queries from random sources to random targets.
+	graph1 = generate_grid_graph(60, 60, 0.95, True, True, True, 1, 20, seed=8)
+	card_V = graph1.get_card_V()
+	landmarks = Landmarks(graph1, 8)
+	print("Landmarks:", landmarks.get_landmarks())
+	rng = np.random.default_rng(12)
+	all_equal = True
+	dijkstra_settled = 0
+	alt_settled = 0
+	for s, t in rng.integers(0, card_V, size=(20, 2)).tolist():
+		d, pi = dijkstra(graph1, s)
+		distance1, path1, settled1 = a_star(graph1, s, t)
+		distance2, path2, settled2 = a_star(graph1, s, t, landmarks.heuristic(t))
+		if not (d[t] == distance1 == distance2):
+			print("Distance mismatch for", s, t)
+			all_equal = False
+		if path2 is not None and \
+				sum(graph1.find_edge(path2[i], path2[i + 1]).get_weight() for i in range(len(path2) - 1)) != d[t]:
+			print("Path weight mismatch for", s, t)
+			all_equal = False
+		dijkstra_settled += settled1
+		alt_settled += settled2
+	print("All distances are " + ("not " if not all_equal else "") + "equal")
+	print("Vertices settled: dijkstra", dijkstra_settled, "ALT", alt_settled)
+
+	# Landmark tables saved by one process can be loaded by another.
+	filename = os.path.join(tempfile.mkdtemp(), "landmarks.npz")
+	landmarks.save(filename)
+	loaded = Landmarks.load(filename)
+	print(loaded.get_landmarks() == landmarks.get_landmarks(),
+		  a_star(graph1, 5, 3000, loaded.heuristic(3000)) == a_star(graph1, 5, 3000, landmarks.heuristic(3000)))
+	print(loaded.lower_bound(5, 3000) == landmarks.heuristic(3000)(5))
+	os.remove(filename)
+
+	# Graph with unreachable vertices.
+	graph2 = generate_gnp_graph(200, 0.01, True, True, True, 0, 10, seed=9)
+	landmarks2 = Landmarks(graph2, 4)
+	all_equal = True
+	for s in range(0, 200, 20):
+		d, pi = dijkstra(graph2, s)
+		for t in range(0, 200, 7):
+			if a_star(graph2, s, t, landmarks2.heuristic(t))[0] != d[t]:
+				all_equal = False
+	print("All distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Vertices from which t is unreachable are never searched.
+	from adjacency_list_graph import AdjacencyListGraph
+	graph3 = AdjacencyListGraph(52, True, True)
+	for v in range(1, 51):
+		graph3.insert_edge(0, v, 1)
+	print(a_star(graph3, 0, 51, lambda v: 0 if v == 51 else float('inf')))  # (inf, None, 1)
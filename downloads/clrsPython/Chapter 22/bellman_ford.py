@@ -30,7 +30,10 @@
 #                                                                       #
 #########################################################################
 
+import numpy as np
 from single_source_shortest_paths import initialize_single_source, relax
+from fifo_queue import Queue
+from csr_graph import CSRGraph
 
 
 def bellman_ford(G, s):
@@ -65,6 +68,139 @@ def bellman_ford(G, s):
 	return d, pi, True
 
 
+def predecessor_cycle(pi):
+	"""Return a list of the vertices on a cycle of the predecessor subgraph, in the order
+	of the edges of the cycle, or None if the predecessor subgraph has no cycle.  Any such
+	cycle has negative weight.
+
+	Argument:
+	pi -- list of predecessors, None for no predecessor
+	"""
+	card_V = len(pi)
+	walk = [None] * card_V  # walk[v] is the vertex from which the walk that visited v started
+	for start in range(card_V):
+		v = start
+		while v is not None and walk[v] is None:
+			walk[v] = start
+			v = pi[v]
+		if v is not None and walk[v] == start:  # the walk from start came back to v
+			cycle = [v]
+			u = pi[v]
+			while u != v:
+				cycle.append(u)
+				u = pi[u]
+			cycle.reverse()  # predecessors lead backward along the edges
+			return cycle
+	return None
+
+
+def spfa(G, s):
+	"""Solve the single-source shortest-paths problem with negative edge weights allowed,
+	relaxing only the edges leaving vertices whose distances have decreased.  A FIFO
+	queue holds those vertices, each at most once.  If the shortest-path weights are
+	well defined, the distances converge after at most V - 1 rounds, and usually much
+	sooner.
+
+	To detect a negative-weight cycle, the algorithm counts the edges on the path that
+	gave each vertex its distance.  A count of V or more means that the path repeats a
+	vertex, so that a negative-weight cycle is reachable from s.  The predecessor
+	subgraph is then searched for a cycle, which must have negative weight.  If it has
+	none yet, the search is repeated each time the largest count doubles.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of the source vertex
+	Returns:
+	d -- distances from source s
+	pi -- predecessors
+	cycle -- list of the vertices on a negative-weight cycle reachable from s, in order,
+	or None if there is no such cycle
+	"""
+	card_V = G.get_card_V()
+	d, pi = initialize_single_source(G, s)
+	count = [0] * card_V  # count[v] is the number of edges on the path giving d[v]
+	in_queue = [False] * card_V
+	check_at = card_V  # count at which to search the predecessor subgraph for a cycle
+
+	queue = Queue(card_V + 1)
+	queue.enqueue(s)
+	in_queue[s] = True
+	while not queue.is_empty():
+		u = queue.dequeue()
+		in_queue[u] = False
+		for edge in G.get_adj_list(u):
+			v = edge.get_v()
+			if d[v] > d[u] + edge.get_weight():
+				d[v] = d[u] + edge.get_weight()
+				pi[v] = u
+				count[v] = count[u] + 1
+				if count[v] >= check_at:  # the path to v repeats a vertex
+					cycle = predecessor_cycle(pi)
+					if cycle is not None:
+						return d, pi, cycle
+					check_at *= 2
+				if not in_queue[v]:
+					queue.enqueue(v)
+					in_queue[v] = True
+	return d, pi, None
+
+
+def bellman_ford_queue(G, s):
+	"""Run spfa, but return the same values as bellman_ford: d, pi, and True if there is
+	no negative-weight cycle reachable from s, False if there is one."""
+	d, pi, cycle = spfa(G, s)
+	return d, pi, cycle is None
+
+
+def bellman_ford_arrays(G, s):
+	"""Solve the single-source shortest-paths problem like bellman_ford, but relaxing all
+	the edges at once in each pass, with arrays of edge endpoints and weights.  Each
+	pass computes new distances from those of the previous pass, and the passes stop as
+	soon as one improves no distance.
+
+	Arguments:
+	G -- a directed, weighted graph, or a CSRGraph
+	s -- index of the source vertex
+	Returns:
+	As for bellman_ford
+	"""
+	card_V = G.get_card_V()
+	csr = G if isinstance(G, CSRGraph) else CSRGraph.from_graph(G)
+	u, v, w = csr.get_edge_arrays()
+	# Sort the edges by v so that each vertex's incoming edges are contiguous.
+	order = np.argsort(v, kind="stable")
+	u, v, w = u[order], v[order], w[order]
+	heads, starts = np.unique(v, return_index=True)
+
+	d = np.full(card_V, np.inf)
+	d[s] = 0
+	pi = np.full(card_V, -1, dtype=np.int64)
+	no_neg_cycle = True
+	for i in range(card_V):  # pass card_V checks for a negative-weight cycle
+		through = d[u] + w  # through[e] is the distance to v[e] through edge e
+		if len(through) == 0:
+			break
+		best = np.minimum.reduceat(through, starts)  # minimum for each vertex in heads
+		improved = best < d[heads]
+		if not improved.any():
+			break
+		if i == card_V - 1:
+			no_neg_cycle = False
+			break
+		# The predecessor of an improved vertex is the tail of its first best edge.
+		is_best = (through == np.repeat(best, np.diff(np.append(starts, len(v))))) & \
+			np.repeat(improved, np.diff(np.append(starts, len(v))))
+		best_v, first = np.unique(v[is_best], return_index=True)
+		pi[best_v] = u[is_best][first]
+		d[heads[improved]] = best[improved]
+
+	if w.dtype.kind in "iu":  # integer weights give integer distances
+		d = [int(x) if x < np.inf else float('inf') for x in d.tolist()]
+	else:
+		d = d.tolist()
+	return d, [None if x < 0 else x for x in pi.tolist()], no_neg_cycle
+
+
 # Testing
 if __name__ == "__main__":
 
@@ -93,3 +229,30 @@ if __name__ == "__main__":
 	print("No negative-weight cycle:", cycle)
 	for i in range(len(vertices)):
 		print(vertices[i] + ": d = " + str(d[i]) + ", pi = " + ("None" if pi[i] is None else vertices[pi[i]]))
+
+	# Queue-based and edge-array variants.
+	from generate_random_graph import generate_gnp_graph
+	from vertex_labels import VertexLabels
+	labels = VertexLabels(vertices)
+	d, pi, cycle = spfa(graph1, labels.get_id('s'))
+	print(d, cycle)
+	d, pi, cycle = spfa(graph2, labels.get_id('s'))
+	print([labels(v) for v in cycle], sum(graph2.find_edge(cycle[i], cycle[(i + 1) % len(cycle)]).get_weight()
+										  for i in range(len(cycle))))
+	print(bellman_ford_arrays(graph1, labels.get_id('s')))
+	print(bellman_ford_arrays(graph2, labels.get_id('s'))[2])
+	all_equal = True
+	for seed in range(10):
+		graph3 = generate_gnp_graph(60, 0.05, True, True, True, -2, 10, seed=seed)
+		for s in range(0, 60, 15):
+			bf_d, bf_pi, bf_ok = bellman_ford(graph3, s)
+			queue_d, queue_pi, cycle = spfa(graph3, s)
+			arrays_d, arrays_pi, arrays_ok = bellman_ford_arrays(graph3, s)
+			if bf_ok != (cycle is None) or bf_ok != arrays_ok or (bf_ok and not bf_d == queue_d == arrays_d):
+				print("Mismatch for seed", seed, "source", s)
+				all_equal = False
+			if cycle is not None and sum(graph3.find_edge(cycle[i], cycle[(i + 1) % len(cycle)]).get_weight()
+										 for i in range(len(cycle))) >= 0:
+				print("Cycle not negative for seed", seed, "source", s)
+				all_equal = False
+	print("All results are " + ("not " if not all_equal else "") + "equal")
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# contraction_hierarchies.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+import numpy as np
+from single_source_shortest_paths import initialize_single_source, relax
+from min_heap_priority_queue import MinHeapPriorityQueue
+from csr_graph import CSRGraph
+
+
+class ContractionHierarchy:
+
+	def __init__(self, G, max_settled=200):
+		"""Preprocess a static weighted graph G for fast shortest-path queries by contracting
+		its vertices one at a time.  Contracting vertex v removes it from the remaining
+		graph, adding a shortcut (u, w) with weight w(u, v) + w(v, w) whenever (u, v, w) is
+		the only shortest path from u to w among the remaining vertices.  A local search
+		from u, the witness search, looks for another path.  Vertices are contracted in
+		increasing order of their edge difference, the number of shortcuts added less the
+		number of edges removed, plus the number of neighbors already contracted.
+
+		Arguments:
+		G -- a directed or undirected, weighted graph
+		max_settled -- most vertices a witness search settles before giving up, which
+		can only add shortcuts that are not needed
+		Assumption:
+		All weights are nonnegative
+		"""
+		card_V = G.get_card_V()
+		self.card_V = card_V
+		self.max_settled = max_settled
+		# The remaining graph: out_edges[u][w] and in_edges[w][u] are the weight of (u, w).
+		self.out_edges = [{} for u in range(card_V)]
+		self.in_edges = [{} for u in range(card_V)]
+		# All edges and shortcuts: edges[(u, w)] is a pair (weight, middle vertex or -1).
+		self.edges = {}
+		for u in range(card_V):
+			for edge in G.get_adj_list(u):
+				w, weight = edge.get_v(), edge.get_weight()
+				if u != w and weight < self.out_edges[u].get(w, float('inf')):
+					self.out_edges[u][w] = weight
+					self.in_edges[w][u] = weight
+					self.edges[(u, w)] = (weight, -1)
+
+		contracted_neighbors = [0] * card_V
+		priority = [self.edge_difference(v) for v in range(card_V)]
+		queue = MinHeapPriorityQueue(lambda v: priority[v])
+		for v in range(card_V):
+			queue.insert(v)
+		self.rank = [None] * card_V  # rank[v] is the position of v in the contraction order
+		next_rank = 0
+		while queue.get_size() > 0:
+			v = queue.extract_min()
+			# Priorities of vertices change as their neighbors are contracted, so check that
+			# v still has the smallest priority before contracting it.
+			priority[v] = self.edge_difference(v) + contracted_neighbors[v]
+			if queue.get_size() > 0 and priority[v] > priority[queue.minimum()]:
+				queue.insert(v)
+				continue
+			for u in self.in_edges[v]:
+				contracted_neighbors[u] += 1
+			for w in self.out_edges[v]:
+				contracted_neighbors[w] += 1
+			self.contract(v)
+			self.rank[v] = next_rank
+			next_rank += 1
+		del self.out_edges, self.in_edges
+		self.build_search_graphs()
+
+	def witness_search(self, u, v, limit):
+		"""Return a dictionary of the distances from u found by a Dijkstra search in the
+		remaining graph that avoids v, settles at most max_settled vertices, and stops
+		once distances exceed limit."""
+		d = {u: 0}
+		queue = MinHeapPriorityQueue(lambda x: d[x])
+		queue.insert(u)
+		settled = 0
+		while queue.get_size() > 0 and settled < self.max_settled:
+			x = queue.extract_min()
+			if d[x] > limit:
+				break
+			settled += 1
+			for y, weight in self.out_edges[x].items():
+				if y == v:
+					continue
+				if y not in d:
+					d[y] = d[x] + weight
+					queue.insert(y)
+				elif d[y] > d[x] + weight:
+					d[y] = d[x] + weight
+					queue.decrease_key(y, d[y])
+		return d
+
+	def shortcuts(self, v):
+		"""Return a list of the shortcuts (u, w, weight) needed if v were contracted now."""
+		result = []
+		for u, in_weight in self.in_edges[v].items():
+			through_v = {w: in_weight + out_weight for w, out_weight in self.out_edges[v].items() if w != u}
+			if len(through_v) == 0:
+				continue
+			d = self.witness_search(u, v, max(through_v.values()))
+			for w, weight in through_v.items():
+				if d.get(w, float('inf')) > weight:  # no path as short as (u, v, w) avoids v
+					result.append((u, w, weight))
+		return result
+
+	def edge_difference(self, v):
+		"""Return the number of shortcuts that contracting v would add, less the number of
+		edges it would remove."""
+		return len(self.shortcuts(v)) - len(self.in_edges[v]) - len(self.out_edges[v])
+
+	def contract(self, v):
+		"""Add the shortcuts needed to bypass v, and remove v from the remaining graph."""
+		for u, w, weight in self.shortcuts(v):
+			self.out_edges[u][w] = weight
+			self.in_edges[w][u] = weight
+			self.edges[(u, w)] = (weight, v)
+		for u in self.in_edges[v]:
+			del self.out_edges[u][v]
+		for w in self.out_edges[v]:
+			del self.in_edges[w][v]
+		self.in_edges[v] = {}
+		self.out_edges[v] = {}
+
+	def build_search_graphs(self):
+		"""Split the edges and shortcuts into the upward graph, holding the edges (u, w)
+		with rank[u] < rank[w], and the downward graph, holding each other edge (u, w)
+		reversed, as (w, u), so that both searches of a query go up in rank."""
+		u, w, weight, middle = self.get_edge_arrays()
+		rank = np.array(self.rank, dtype=np.int64)
+		up = rank[u] < rank[w]
+		self.up = CSRGraph.from_edge_arrays(self.card_V, u[up], w[up], weight[up])
+		self.down = CSRGraph.from_edge_arrays(self.card_V, w[~up], u[~up], weight[~up])
+
+	def get_edge_arrays(self):
+		"""Return arrays u, w, weights, and middles of the edges and shortcuts: the ith is
+		(u[i], w[i]) with weight weights[i], and middles[i] is the vertex it bypasses, or
+		-1 if it is an edge of the original graph."""
+		pairs = list(self.edges.keys())
+		values = list(self.edges.values())
+		u = np.array([pair[0] for pair in pairs], dtype=np.int64)
+		w = np.array([pair[1] for pair in pairs], dtype=np.int64)
+		weights = np.array([value[0] for value in values])
+		middles = np.array([value[1] for value in values], dtype=np.int64)
+		return u, w, weights, middles
+
+	def get_rank(self):
+		"""Return the list giving the position of each vertex in the contraction order."""
+		return self.rank
+
+	def get_num_shortcuts(self):
+		"""Return the number of shortcuts added."""
+		return sum(1 for weight, middle in self.edges.values() if middle >= 0)
+
+	def search(self, s, t):
+		"""Search upward from s in the upward graph and from t in the downward graph,
+		alternating between the two searches.  A search stops once its smallest key is at
+		least the weight of the shortest s-t path found so far.  Return the weight of that
+		path, a vertex on it where the searches meet (None if t is unreachable), the
+		predecessors of both searches, and the number of vertices settled."""
+		d_f, pi_f = {s: 0}, {s: None}
+		d_b, pi_b = {t: 0}, {t: None}
+		d = [d_f, d_b]
+		pi = [pi_f, pi_b]
+		graphs = [self.up, self.down]
+		queues = [MinHeapPriorityQueue(lambda x: d_f[x]), MinHeapPriorityQueue(lambda x: d_b[x])]
+		queues[0].insert(s)
+		queues[1].insert(t)
+		mu = 0 if s == t else float('inf')
+		meet = s if s == t else None
+		settled = 0
+		i = 0
+		while True:
+			# Discard a search whose next vertex can no longer lead to a shorter path.
+			for j in range(2):
+				if queues[j].get_size() > 0 and d[j][queues[j].minimum()] >= mu:
+					queues[j] = MinHeapPriorityQueue(queues[j].get_key)
+			if queues[0].get_size() == 0 and queues[1].get_size() == 0:
+				break
+			if queues[i].get_size() == 0:
+				i = 1 - i
+			dist, other, queue = d[i], d[1 - i], queues[i]
+			u = queue.extract_min()
+			settled += 1
+			for edge in graphs[i].get_adj_list(u):
+				v = edge.get_v()
+				if v not in dist:
+					dist[v] = float('inf')
+				reached = dist[v] < float('inf')
+				relax(u, v, edge.get_weight(), dist, pi[i],
+					  lambda v: queue.decrease_key(v, dist[v]) if reached else queue.insert(v))
+				if v in other and dist[v] + other[v] < mu:  # the searches meet at v
+					mu = dist[v] + other[v]
+					meet = v
+			i = 1 - i
+		return mu, meet, pi_f, pi_b, settled
+
+	def unpack(self, u, w):
+		"""Return the list of original edges (x, y, weight) that the edge or shortcut (u, w)
+		stands for, in path order."""
+		result = []
+		stack = [(u, w)]
+		while len(stack) > 0:
+			x, y = stack.pop()
+			weight, middle = self.edges[(x, y)]
+			if middle < 0:
+				result.append((x, y, weight))
+			else:
+				stack.append((middle, y))  # pushed first, so unpacked second
+				stack.append((x, middle))
+		return result
+
+	def path_edges(self, s, t):
+		"""Return the list of original edges (x, y, weight) on a shortest path from s to t,
+		None if t is unreachable from s, and the number of vertices settled."""
+		mu, meet, pi_f, pi_b, settled = self.search(s, t)
+		if meet is None:
+			return None, settled
+		hierarchy_path = []
+		v = meet
+		while pi_f[v] is not None:  # from meet back to s
+			hierarchy_path.append((pi_f[v], v))
+			v = pi_f[v]
+		hierarchy_path.reverse()
+		v = meet
+		while pi_b[v] is not None:  # from meet on to t
+			hierarchy_path.append((v, pi_b[v]))
+			v = pi_b[v]
+		edges = []
+		for u, w in hierarchy_path:
+			edges.extend(self.unpack(u, w))
+		return edges, settled
+
+	def query(self, s, t):
+		"""Return lists d and pi for a shortest path from s to t, as dijkstra would give
+		for the vertices on that path: d[v] is the shortest-path distance from s to v and
+		pi[v] is its predecessor on the path.  Other vertices have d[v] = infinity and
+		pi[v] = None."""
+		d, pi = initialize_single_source(self, s)
+		edges, settled = self.path_edges(s, t)
+		for x, y, weight in edges or []:
+			d[y] = d[x] + weight
+			pi[y] = x
+		return d, pi
+
+	def distance(self, s, t):
+		"""Return the shortest-path distance from s to t, infinity if t is unreachable."""
+		return self.search(s, t)[0]
+
+	def get_card_V(self):
+		"""Return the number of vertices."""
+		return self.card_V
+
+	def save(self, filename):
+		"""Write the hierarchy to a file that load can read, so that the preprocessing
+		need not be repeated."""
+		u, w, weights, middles = self.get_edge_arrays()
+		with open(filename, "wb") as file:
+			np.savez(file, rank=np.array(self.rank, dtype=np.int64), u=u, w=w, weights=weights,
+					 middles=middles, max_settled=np.array(self.max_settled))
+
+	@staticmethod
+	def load(filename):
+		"""Return the ContractionHierarchy written to a file by save."""
+		hierarchy = ContractionHierarchy.__new__(ContractionHierarchy)
+		with np.load(filename) as tables:
+			hierarchy.rank = tables["rank"].tolist()
+			hierarchy.max_settled = int(tables["max_settled"])
+			hierarchy.edges = {(u, w): (weight, middle) for u, w, weight, middle in
+							   zip(tables["u"].tolist(), tables["w"].tolist(), tables["weights"].tolist(),
+								   tables["middles"].tolist())}
+		hierarchy.card_V = len(hierarchy.rank)
+		hierarchy.build_search_graphs()
+		return hierarchy
+
+
+# Testing
+if __name__ == "__main__":
+
+	import os
+	import tempfile
+	from dijkstra import dijkstra
+	from print_path import print_path
+	from generate_random_graph import generate_grid_graph, generate_gnp_graph
+
+	for graph1 in [generate_grid_graph(20, 20, 0.9, True, True, True, 1, 20, seed=1),
+				   generate_grid_graph(20, 20, 0.9, True, False, True, 1, 20, seed=2),
+				   generate_gnp_graph(300, 0.01, True, True, True, 0, 10, seed=3)]:
+		card_V = graph1.get_card_V()
+		hierarchy = ContractionHierarchy(graph1)
+		print(card_V, "vertices,", graph1.get_card_E(), "edges,", hierarchy.get_num_shortcuts(), "shortcuts")
+		all_equal = True
+		for s in range(0, card_V, 37):
+			d_dijkstra, pi_dijkstra = dijkstra(graph1, s)
+			for t in range(0, card_V, 11):
+				d, pi = hierarchy.query(s, t)
+				path = print_path(pi, s, t, lambda v: v)
+				if d[t] != d_dijkstra[t] or hierarchy.distance(s, t) != d_dijkstra[t]:
+					all_equal = False
+				elif path is not None and \
+						sum(graph1.find_edge(path[i], path[i + 1]).get_weight() for i in range(len(path) - 1)) != d[t]:
+					all_equal = False
+		print("All distances are " + ("not " if not all_equal else "") + "equal")
+
+	filename = os.path.join(tempfile.mkdtemp(), "hierarchy.npz")
+	hierarchy.save(filename)
+	loaded = ContractionHierarchy.load(filename)
+	print(all(loaded.query(s, t) == hierarchy.query(s, t) for s in range(0, 300, 29) for t in range(0, 300, 13)))
+	os.remove(filename)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# delta_stepping.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from csr_graph import CSRGraph
+
+
+def split_edges(csr, delta):
+	"""Split the edges of a weighted CSRGraph into light edges, with weight at most delta,
+	and heavy edges, with weight greater than delta.  Return a pair of tuples (offsets,
+	targets, weights), one for the light edges and one for the heavy edges, each in
+	compressed sparse row form with adjacency lists in their original order."""
+	offsets, targets, weights = csr.get_offsets(), csr.get_targets(), csr.get_weights()
+	u = np.repeat(np.arange(csr.get_card_V(), dtype=np.int64), np.diff(offsets))
+	result = []
+	for mask in [weights <= delta, weights > delta]:
+		kind_offsets = np.zeros(csr.get_card_V() + 1, dtype=np.int64)
+		np.cumsum(np.bincount(u[mask], minlength=csr.get_card_V()), out=kind_offsets[1:])
+		result.append((kind_offsets, targets[mask], weights[mask].astype(np.float64)))
+	return result[0], result[1]
+
+
+def relaxation_requests(edges, d, vertices):
+	"""Return arrays v, x, and u giving, for each edge (u, v) leaving the given vertices,
+	the distance x = d[u] + w(u, v), keeping only those less than d[v].
+
+	Arguments:
+	edges -- tuple (offsets, targets, weights) of light or heavy edges
+	d -- array of distances
+	vertices -- array of vertices whose edges are relaxed
+	"""
+	offsets, targets, weights = edges
+	lengths = offsets[vertices + 1] - offsets[vertices]
+	index = np.arange(lengths.sum()) + np.repeat(offsets[vertices] - (np.cumsum(lengths) - lengths), lengths)
+	u = np.repeat(vertices, lengths)
+	v = targets[index]
+	x = d[u] + weights[index]
+	better = x < d[v]
+	return v[better], x[better], u[better]
+
+
+# Arrays in shared memory, attached by each process of the pool.
+shared = {}
+
+
+def share_array(array):
+	"""Return a shared memory block holding a copy of array, and an array backed by it."""
+	block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+	view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+	view[:] = array
+	return block, view
+
+
+def attach_arrays(layout):
+	"""Pool initializer: attach to the shared arrays described by layout, a dictionary
+	mapping each name to a tuple (shared memory name, shape, dtype)."""
+	for name, (block_name, shape, dtype) in layout.items():
+		block = shared_memory.SharedMemory(name=block_name)
+		shared[name] = (block, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+
+
+def shared_requests(kind, vertices):
+	"""Compute the relaxation requests for light (kind "light") or heavy (kind "heavy")
+	edges leaving the given vertices in a pool process, from the shared arrays."""
+	edges = tuple(shared[kind + "_" + part][1] for part in ["offsets", "targets", "weights"])
+	return relaxation_requests(edges, shared["d"][1], vertices)
+
+
+def delta_stepping(G, s, delta=None, processes=1, parallel_threshold=20000):
+	"""Solve the single-source shortest-paths problem with no negative-weight edges by
+	delta-stepping.  Vertices are kept in buckets of width delta by tentative distance.
+	The lowest nonempty bucket is emptied by relaxing the light edges, those with weight
+	at most delta, leaving its vertices, repeatedly until no vertex re-enters it, and then
+	the heavy edges leaving all the vertices it held are relaxed once.  Each round of
+	relaxations is split among a pool of processes that read the graph and the distances
+	from shared memory and return relaxation requests, which this process applies.
+
+	Arguments:
+	G -- a directed or undirected, weighted graph, or a CSRGraph
+	s -- index of source vertex
+	delta -- bucket width; if None, the largest weight divided by the average out-degree
+	processes -- number of processes relaxing edges; 1 relaxes them in this process
+	parallel_threshold -- rounds with fewer vertices than this are not split among processes
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	d -- distances from source vertex s, as dijkstra returns them
+	pi -- predecessors, forming a shortest-paths tree; the same as those from dijkstra
+	if shortest paths are unique
+	"""
+	card_V = G.get_card_V()
+	csr = G if isinstance(G, CSRGraph) else CSRGraph.from_graph(G)
+	weights = csr.get_weights()
+	if delta is None:
+		average_degree = max(len(weights) / max(card_V, 1), 1)
+		delta = max(float(weights.max()) / average_degree, 1e-9) if len(weights) > 0 else 1.0
+	light, heavy = split_edges(csr, delta)
+
+	d = np.full(card_V, np.inf)
+	pi = np.full(card_V, -1, dtype=np.int64)
+	blocks = []
+	pool = None
+	try:
+		if processes > 1:
+			# Put the edge arrays and distances in shared memory for the pool.
+			layout = {}
+			for kind, edges in [("light", light), ("heavy", heavy)]:
+				for part, array in zip(["offsets", "targets", "weights"], edges):
+					block, view = share_array(array)
+					blocks.append(block)
+					layout[kind + "_" + part] = (block.name, array.shape, array.dtype)
+			block, d = share_array(d)
+			blocks.append(block)
+			layout["d"] = (block.name, d.shape, d.dtype)
+			pool = mp.Pool(processes, initializer=attach_arrays, initargs=(layout,))
+
+		def requests(kind, vertices):
+			"""Relaxation requests for the edges of one kind leaving vertices."""
+			if pool is None or len(vertices) < parallel_threshold:
+				return relaxation_requests(light if kind == "light" else heavy, d, vertices)
+			results = pool.starmap(shared_requests, [(kind, chunk) for chunk in np.array_split(vertices, processes)])
+			return tuple(np.concatenate([result[i] for result in results]) for i in range(3))
+
+		buckets = {}  # buckets[i] is the set of vertices with d[v] in [i * delta, (i + 1) * delta)
+		bucket_of = {}  # bucket_of[v] is the index of the bucket holding v
+
+		def apply(v, x, u):
+			"""Apply relaxation requests: for each v, take the smallest x below d[v]."""
+			order = np.lexsort((u, x, v))  # by v, then x, then u
+			v, x, u = v[order], x[order], u[order]
+			first = np.unique(v, return_index=True)[1]
+			v, x, u = v[first], x[first], u[first]
+			better = x < d[v]
+			v, x, u = v[better], x[better], u[better]
+			d[v] = x
+			pi[v] = u
+			for vertex, i in zip(v.tolist(), (x // delta).astype(np.int64).tolist()):
+				old = bucket_of.get(vertex)
+				if old is not None:
+					buckets[old].discard(vertex)
+				buckets.setdefault(i, set()).add(vertex)
+				bucket_of[vertex] = i
+
+		d[s] = 0
+		buckets[0] = {s}
+		bucket_of[s] = 0
+		while len(buckets) > 0:
+			i = min(buckets)
+			settled = []
+			while len(buckets.get(i, ())) > 0:
+				frontier = np.fromiter(buckets.pop(i), dtype=np.int64)
+				for v in frontier.tolist():
+					del bucket_of[v]
+				settled.append(frontier)
+				apply(*requests("light", frontier))
+			buckets.pop(i, None)
+			apply(*requests("heavy", np.unique(np.concatenate(settled))))
+			for j in [j for j in buckets if len(buckets[j]) == 0]:
+				del buckets[j]
+		d = d.copy()  # detach from shared memory
+	finally:
+		if pool is not None:
+			pool.close()
+			pool.join()
+		for block in blocks:
+			block.close()
+			block.unlink()
+
+	if weights.dtype.kind in "iu":  # integer weights give integer distances, as in dijkstra
+		d = [int(x) if x < np.inf else float('inf') for x in d.tolist()]
+	else:
+		d = d.tolist()
+	return d, [None if u < 0 else u for u in pi.tolist()]
+
+
+# Testing
+if __name__ == "__main__":
+
+	from dijkstra import dijkstra
+	from generate_random_graph import generate_gnp_graph, generate_grid_graph
+
+	# Unique shortest paths are likely with weights from a large range, so that pi agrees too.
+	graph1 = generate_gnp_graph(500, 0.01, True, True, True, 1, 1000000, seed=3)
+	all_equal = True
+	for s in range(0, 500, 50):
+		for delta, processes in [(None, 1), (1000, 1), (50000, 3), (10 ** 7, 1)]:
+			if delta_stepping(graph1, s, delta, processes, parallel_threshold=5) != dijkstra(graph1, s):
+				print("Mismatch for source", s, "delta", delta)
+				all_equal = False
+	print("All d and pi are " + ("not " if not all_equal else "") + "equal")
+
+	# With small weights, shortest paths tie, so check d and that pi gives shortest paths.
+	graph2 = generate_grid_graph(30, 30, 0.9, True, False, True, 0, 5, seed=4)
+	all_equal = True
+	for s in range(0, 900, 97):
+		d, pi = delta_stepping(graph2, s, 2, 2, parallel_threshold=10)
+		if d != dijkstra(graph2, s)[0] or \
+				any(pi[v] is not None and d[pi[v]] + graph2.find_edge(pi[v], v).get_weight() != d[v] for v in range(900)):
+			print("Mismatch for source", s)
+			all_equal = False
+	print("All d are " + ("not " if not all_equal else "") + "equal")
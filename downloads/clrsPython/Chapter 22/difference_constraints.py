@@ -31,15 +31,17 @@
 #########################################################################
 
 from adjacency_list_graph import *
-from bellman_ford import bellman_ford
+from bellman_ford import bellman_ford, bellman_ford_queue, bellman_ford_arrays
 
 
-def difference_constraints(constraints):
+def difference_constraints(constraints, shortest_paths_func=bellman_ford):
     """Solve a system of difference constraints.
 
     Input:
     constraints -- a list (or tuple) of lists (or tuples) of three values: i, j, w,
     indicating the constraint xi - xj <= w, where i, j >= 1.
+    shortest_paths_func -- function returning values like bellman_ford, such as
+    bellman_ford_queue or bellman_ford_arrays
 
     Returns:
     feasible -- boolean indicating whether the system has a feasible solution
@@ -61,7 +63,7 @@ def difference_constraints(constraints):
         constraint_graph.insert_edge(0, i, 0)
 
     # If no negative-weight cycle, then shortest-path weights from v0 are a solution.
-    d, pi, feasible = bellman_ford(constraint_graph, 0)
+    d, pi, feasible = shortest_paths_func(constraint_graph, 0)
     return feasible, d[1:]
 
 
@@ -76,3 +78,8 @@ if __name__ == "__main__":
     constraints2 = [(1, 2, 0), (1, 5, -1), (2, 5, 1), (3, 1, 4),
                     (4, 1, 4), (4, 3, -1), (5, 3, -3), (5, 4, -3)]
     print(difference_constraints(constraints2))
+
+    # Same results with the queue-based and edge-array variants.
+    for shortest_paths_func in [bellman_ford_queue, bellman_ford_arrays]:
+        print(difference_constraints(constraints1, shortest_paths_func),
+              difference_constraints(constraints2, shortest_paths_func)[0])
@@ -32,59 +32,137 @@
 
 from single_source_shortest_paths import initialize_single_source, relax
 from min_heap_priority_queue import MinHeapPriorityQueue
+from graph_views import TransposeView
 
 
-def dijkstra(G, s):
+def dijkstra(G, s, target=None, priority_queue=MinHeapPriorityQueue):
 	"""Solve single-source shortest-paths problem with no negative-weight edges.
+	Vertices enter the priority queue only once they are reached, and if a target
+	vertex is given, the search stops as soon as the target's distance is final.
 
 	Arguments:
 	G -- a directed, weighted graph
 	s -- index of source vertex
+	target -- optional index of a target vertex
+	priority_queue -- function making a min-priority queue from a key function, such as
+	MinHeapPriorityQueue, or for small integer weights, lambda key: DialPriorityQueue(key,
+	largest weight) or RadixHeapPriorityQueue
 	Assumption:
 	All weights are nonnegative
 
 	Returns:
-	d -- distances from source vertex s
+	d -- distances from source vertex s.  If target is given, then d[target] is its
+	shortest-path distance, but distances to vertices not yet settled are upper bounds.
 	pi -- predecessors
 	"""
 
-	card_V = G.get_card_V()
-
 	d, pi = initialize_single_source(G, s)
 
 	# Key function for the priority queue is distance.
-	queue = MinHeapPriorityQueue(lambda u: d[u])
-	for u in range(card_V):
-		queue.insert(u)
+	queue = priority_queue(lambda u: d[u])
+	queue.insert(s)
 
 	while queue.get_size() > 0:  # while the priority queue is not empty
 		u = queue.extract_min()  # extract a vertex with the minimum distance
+		if u == target:
+			break  # d[target] can no longer decrease
 
 		# Relax each edge and update d and pi.
 		for edge in G.get_adj_list(u):
 			v = edge.get_v()
-			# Upon each relaxation, decrease the key in the priority queue.
+			# Upon each relaxation, insert v into the priority queue if it was
+			# unreached, or else decrease its key.
+			reached = d[v] < float('inf')
 			relax(u, v, edge.get_weight(), d, pi,
-					lambda v: queue.decrease_key(v, d[u] + edge.get_weight()))
+					lambda v: queue.decrease_key(v, d[v]) if reached else queue.insert(v))
 
 	return d, pi
 
 
+def bidirectional_dijkstra(G, s, t, G_transpose=None):
+	"""Find a shortest path from s to t by searching forward from s in G and backward
+	from t in the transpose of G, alternating between the two searches.  Stops once
+	the sum of the smallest keys in the two priority queues is at least the weight of
+	the shortest s-t path found so far, usually after settling far fewer vertices than
+	a search from s alone.
+
+	Arguments:
+	G -- a directed or undirected, weighted graph
+	s -- index of source vertex
+	t -- index of target vertex
+	G_transpose -- optional transpose of G, to reuse across queries; if None, a
+	TransposeView of G is made
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	distance -- shortest-path distance from s to t, infinity if t is unreachable
+	path -- list of the vertices on a shortest path from s to t, None if t is unreachable
+	settled -- number of vertices extracted from the two priority queues
+	"""
+	if G_transpose is None:
+		G_transpose = TransposeView(G) if G.is_directed() else G
+	graphs = [G, G_transpose]
+	d_f, pi_f = initialize_single_source(G, s)  # forward search from s
+	d_b, pi_b = initialize_single_source(G, t)  # backward search from t
+	d = [d_f, d_b]
+	pi = [pi_f, pi_b]
+	queues = [MinHeapPriorityQueue(lambda u: d_f[u]), MinHeapPriorityQueue(lambda u: d_b[u])]
+	queues[0].insert(s)
+	queues[1].insert(t)
+
+	mu = d_f[t]  # weight of the shortest s-t path found so far
+	meet = s if s == t else None  # a vertex on that path
+	settled = 0
+	while queues[0].get_size() > 0 and queues[1].get_size() > 0:
+		if d_f[queues[0].minimum()] + d_b[queues[1].minimum()] >= mu:
+			break  # no path through unsettled vertices can be shorter
+		# Advance the search whose next vertex is closer.
+		i = 0 if d_f[queues[0].minimum()] <= d_b[queues[1].minimum()] else 1
+		dist, other, queue = d[i], d[1 - i], queues[i]
+		u = queue.extract_min()
+		settled += 1
+		for edge in graphs[i].get_adj_list(u):
+			v = edge.get_v()
+			reached = dist[v] < float('inf')
+			relax(u, v, edge.get_weight(), dist, pi[i],
+				  lambda v: queue.decrease_key(v, dist[v]) if reached else queue.insert(v))
+			if dist[v] + other[v] < mu:  # the searches meet at v
+				mu = dist[v] + other[v]
+				meet = v
+
+	if meet is None:
+		return float('inf'), None, settled
+	path = []
+	v = meet
+	while v is not None:  # from meet back to s
+		path.append(v)
+		v = pi_f[v]
+	path.reverse()
+	v = pi_b[meet]
+	while v is not None:  # from meet on to t
+		path.append(v)
+		v = pi_b[v]
+	return mu, path, settled
+
+
 # Testing
 if __name__ == "__main__":
 
 	from adjacency_list_graph import AdjacencyListGraph
+	from vertex_labels import VertexLabels
 	from bellman_ford import bellman_ford
 	from generate_random_graph import generate_random_graph
 
 	# Textbook example. 
 	vertices = ['s', 't', 'x', 'y', 'z']
+	labels = VertexLabels(vertices)
 	edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
 			('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
 	graph1 = AdjacencyListGraph(len(vertices), True, True)
 	for edge in edges:
-		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
-	d, pi = dijkstra(graph1, vertices.index('s'))
+		graph1.insert_edge(labels.get_id(edge[0]), labels.get_id(edge[1]), edge[2])
+	d, pi = dijkstra(graph1, labels.get_id('s'))
 	for i in range(len(vertices)):
 		print(vertices[i] + ": d = " + str(d[i]) + ", pi = " + ("None" if pi[i] is None else vertices[pi[i]]))
 	print()
@@ -93,13 +171,39 @@ if __name__ == "__main__":
 	card_V = 100
 	graph2 = generate_random_graph(card_V, 0.08, True, True, True, 0, 15)
 
-	# Shortest-path distances should all be equal.
+	# Shortest-path distances should all be equal, with each kind of priority queue.
+	from dial_priority_queue import DialPriorityQueue
+	from radix_heap_priority_queue import RadixHeapPriorityQueue
 	all_equal = True
 	for s in range(card_V):
 		dijkstra_d, dijkstra_pi = dijkstra(graph2, s)
 		bf_d, bf_pi, cycle = bellman_ford(graph2, s)
-		if bf_d != dijkstra_d:
+		dial_d, dial_pi = dijkstra(graph2, s, None, lambda key: DialPriorityQueue(key, 15))
+		radix_d, radix_pi = dijkstra(graph2, s, None, RadixHeapPriorityQueue)
+		if not bf_d == dijkstra_d == dial_d == radix_d:
 			print("Shortest-path distances mismatch for source vertex", s)
 			all_equal = False
 		# Don't check whether pi values are equal because shortest paths might not be unique.
-	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
\ No newline at end of file
+	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Point-to-point queries on a road-like grid.
+	from generate_random_graph import generate_grid_graph
+	graph3 = generate_grid_graph(60, 60, 1.0, True, True, True, 1, 20, seed=8)
+	transpose3 = TransposeView(graph3)
+	all_equal = True
+	settled_counts = []
+	for s, t in [(0, 3599), (1830, 1890), (100, 2200), (3000, 3050), (77, 77)]:
+		full_d, full_pi = dijkstra(graph3, s)
+		target_d, target_pi = dijkstra(graph3, s, t)
+		distance, path, settled = bidirectional_dijkstra(graph3, s, t, transpose3)
+		settled_counts.append(settled)
+		weight = sum(graph3.find_edge(path[i], path[i + 1]).get_weight() for i in range(len(path) - 1))
+		if not (full_d[t] == target_d[t] == distance == weight and path[0] == s and path[-1] == t):
+			print("Point-to-point mismatch for", s, t)
+			all_equal = False
+	print("All point-to-point distances are " + ("not " if not all_equal else "") + "equal")
+	print("Vertices settled by bidirectional search:", settled_counts, "out of", graph3.get_card_V())
+
+	graph4 = AdjacencyListGraph(3, True, True)
+	graph4.insert_edge(0, 1, 4)
+	print(bidirectional_dijkstra(graph4, 0, 2), bidirectional_dijkstra(graph4, 0, 1))
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# dynamic_shortest_paths.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+from min_heap_priority_queue import MinHeapPriorityQueue
+from dijkstra import dijkstra
+
+
+class DynamicShortestPaths:
+
+	def __init__(self, G, s):
+		"""Initialize shortest paths from s in graph G that are kept up to date as edges
+		are inserted, deleted, and reweighted through this object.  Besides d and pi, the
+		shortest-paths tree is kept as the set of children of each vertex, and the edges
+		entering each vertex are indexed, so that an update repairs only the vertices whose
+		distances it changes.
+
+		Arguments:
+		G -- a directed or undirected, weighted graph, represented by adjacency lists.
+		Change it only through this object.
+		s -- index of source vertex
+		Assumption:
+		All weights are nonnegative
+		"""
+		self.G = G
+		self.s = s
+		card_V = G.get_card_V()
+		self.d, self.pi = dijkstra(G, s)
+		self.children = [set() for v in range(card_V)]
+		for v in range(card_V):
+			if self.pi[v] is not None:
+				self.children[self.pi[v]].add(v)
+		self.in_edges = [{} for v in range(card_V)]  # in_edges[v][u] is the Edge object for (u, v)
+		for u in range(card_V):
+			for edge in G.get_adj_list(u):
+				self.in_edges[edge.get_v()][u] = edge
+
+	def get_d(self):
+		"""Return the list of shortest-path distances from the source."""
+		return self.d
+
+	def get_pi(self):
+		"""Return the list of predecessors."""
+		return self.pi
+
+	def set_parent(self, v, u):
+		"""Make u the predecessor of v in the shortest-paths tree."""
+		if self.pi[v] is not None:
+			self.children[self.pi[v]].discard(v)
+		self.pi[v] = u
+		if u is not None:
+			self.children[u].add(v)
+
+	def directions(self, u, v):
+		"""Return the list of directed edges (u, v) stands for: also (v, u) if undirected."""
+		return [(u, v)] if self.G.is_directed() else [(u, v), (v, u)]
+
+	def propagate_decrease(self, u, v):
+		"""After the weight of (u, v) decreases, or (u, v) is inserted, lower the distances
+		that the edge improves, searching onward from v as in Dijkstra's algorithm.  Return
+		the number of vertices whose distances decreased."""
+		d = self.d
+		weight = self.in_edges[v][u].get_weight()
+		if not d[u] + weight < d[v]:
+			return 0
+		d[v] = d[u] + weight
+		self.set_parent(v, u)
+		touched = 0
+		queue = MinHeapPriorityQueue(lambda x: d[x])
+		queue.insert(v)
+		queued = {v}
+		while queue.get_size() > 0:
+			x = queue.extract_min()
+			queued.discard(x)
+			touched += 1
+			for edge in self.G.get_adj_list(x):
+				y = edge.get_v()
+				if d[x] + edge.get_weight() < d[y]:
+					d[y] = d[x] + edge.get_weight()
+					self.set_parent(y, x)
+					if y in queued:
+						queue.decrease_key(y, d[y])
+					else:
+						queue.insert(y)
+						queued.add(y)
+		return touched
+
+	def repair_subtree(self, v):
+		"""After the weight of the tree edge entering v increases, or the edge is deleted,
+		recompute the distances of the vertices in the subtree rooted at v, which are the
+		only ones that can change.  Return the number of vertices in the subtree."""
+		d, pi = self.d, self.pi
+		subtree = [v]
+		for x in subtree:  # subtree grows as it is scanned
+			subtree.extend(self.children[x])
+		affected = set(subtree)
+		for x in subtree:
+			d[x] = float('inf')
+			self.set_parent(x, None)
+
+		# Each affected vertex first takes its best distance through an unaffected vertex,
+		# and then Dijkstra's algorithm runs among the affected vertices.
+		queue = MinHeapPriorityQueue(lambda x: d[x])
+		for x in subtree:
+			for u, edge in self.in_edges[x].items():
+				if u not in affected and d[u] + edge.get_weight() < d[x]:
+					d[x] = d[u] + edge.get_weight()
+					self.set_parent(x, u)
+			if d[x] < float('inf'):
+				queue.insert(x)
+		while queue.get_size() > 0:
+			x = queue.extract_min()
+			affected.discard(x)
+			for edge in self.G.get_adj_list(x):
+				y = edge.get_v()
+				if y in affected and d[x] + edge.get_weight() < d[y]:
+					reached = d[y] < float('inf')
+					d[y] = d[x] + edge.get_weight()
+					self.set_parent(y, x)
+					if reached:
+						queue.decrease_key(y, d[y])
+					else:
+						queue.insert(y)
+		return len(subtree)
+
+	def decrease_weight(self, u, v, weight):
+		"""Decrease the weight of edge (u, v) and update the shortest paths.  Return the
+		number of vertices whose distances changed."""
+		touched = 0
+		for x, y in self.directions(u, v):
+			edge = self.in_edges[y][x]
+			if weight > edge.get_weight():
+				raise RuntimeError("New weight " + str(weight) + " is greater than current weight "
+								   + str(edge.get_weight()) + ".")
+		self.G.set_weight(u, v, weight)
+		for x, y in self.directions(u, v):
+			touched += self.propagate_decrease(x, y)
+		return touched
+
+	def increase_weight(self, u, v, weight):
+		"""Increase the weight of edge (u, v) and update the shortest paths.  Return the
+		number of vertices whose distances were recomputed."""
+		for x, y in self.directions(u, v):
+			edge = self.in_edges[y][x]
+			if weight < edge.get_weight():
+				raise RuntimeError("New weight " + str(weight) + " is less than current weight "
+								   + str(edge.get_weight()) + ".")
+		self.G.set_weight(u, v, weight)
+		return self.repair_tree_edges(u, v)
+
+	def repair_tree_edges(self, u, v):
+		"""Repair the subtree below (u, v), or below (v, u) if undirected, if either is a
+		tree edge.  Return the number of vertices whose distances were recomputed."""
+		touched = 0
+		for x, y in self.directions(u, v):
+			if self.pi[y] == x:
+				touched += self.repair_subtree(y)
+		return touched
+
+	def insert_edge(self, u, v, weight):
+		"""Insert edge (u, v) with the given weight and update the shortest paths.  Return
+		the number of vertices whose distances changed."""
+		self.G.insert_edge(u, v, weight)
+		for x, y in self.directions(u, v):
+			self.in_edges[y][x] = self.G.find_edge(x, y)
+		touched = 0
+		for x, y in self.directions(u, v):
+			touched += self.propagate_decrease(x, y)
+		return touched
+
+	def delete_edge(self, u, v):
+		"""Delete edge (u, v) and update the shortest paths.  Return the number of vertices
+		whose distances were recomputed."""
+		self.G.delete_edge(u, v)
+		for x, y in self.directions(u, v):
+			self.in_edges[y].pop(x, None)
+		return self.repair_tree_edges(u, v)
+
+
+# Testing
+if __name__ == "__main__":
+
+	import numpy as np
+	from generate_random_graph import generate_gnp_graph, generate_grid_graph
+
+	for graph1 in [generate_gnp_graph(300, 0.02, True, True, True, 1, 50, seed=5),
+				   generate_grid_graph(20, 20, 0.9, True, False, True, 0, 20, seed=6)]:
+		card_V = graph1.get_card_V()
+		dynamic = DynamicShortestPaths(graph1, 0)
+		rng = np.random.default_rng(7)
+		all_equal = True
+		touched = 0
+		for update in range(1000):
+			edges = graph1.get_edge_list()
+			u, v = edges[rng.integers(len(edges))]
+			weight = graph1.find_edge(u, v).get_weight()
+			kind = rng.integers(4)
+			if kind == 0:
+				touched += dynamic.decrease_weight(u, v, int(rng.integers(0, weight + 1)))
+			elif kind == 1:
+				touched += dynamic.increase_weight(u, v, weight + int(rng.integers(0, 30)))
+			elif kind == 2:
+				touched += dynamic.delete_edge(u, v)
+			else:
+				x, y = rng.integers(card_V, size=2).tolist()
+				if x != y and not graph1.has_edge(x, y):
+					touched += dynamic.insert_edge(x, y, int(rng.integers(0, 50)))
+			d, pi = dijkstra(graph1, 0)
+			if d != dynamic.get_d() or any(dynamic.get_pi()[v] is not None and
+										   d[dynamic.get_pi()[v]] + graph1.find_edge(dynamic.get_pi()[v], v).get_weight() != d[v]
+										   for v in range(card_V)):
+				print("Mismatch after update", update)
+				all_equal = False
+				break
+		print("All distances are " + ("not " if not all_equal else "") + "equal")
+		print("Average vertices touched per update: %.1f of %d" % (touched / 1000, card_V))
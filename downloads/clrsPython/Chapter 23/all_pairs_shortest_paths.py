@@ -33,6 +33,60 @@
 import numpy as np
 
 
+# Largest number of entries in the temporary array of sums used by min_plus_product.
+MIN_PLUS_BUFFER_ENTRIES = 1 << 22
+
+
+def min_plus_product(A, B, out=None, accumulate=False, block_rows=None, block_cols=None):
+	"""Compute the min-plus product C of A and B, with C[i, j] = min over k of
+	A[i, k] + B[k, j], a block of rows of A at a time.  For each block, the sums
+	A[i, k] + B[k, j] are formed by broadcasting into a preallocated array and then
+	reduced by taking the minimum over k.  If even one row of sums, q x r entries,
+	would exceed MIN_PLUS_BUFFER_ENTRIES, the columns of B are blocked as well, so
+	that the array of sums never holds more than max(q, MIN_PLUS_BUFFER_ENTRIES)
+	entries.
+
+	Arguments:
+	A -- p x q numpy array
+	B -- q x r numpy array
+	out -- optional p x r numpy array to hold C, which must not share memory with A or B
+	accumulate -- if True, set out to the entrywise minimum of out and C
+	block_rows -- number of rows of A per block; if None, as many as keep the array of
+	sums within MIN_PLUS_BUFFER_ENTRIES entries
+	block_cols -- number of columns of B per block; if None, all of them when one row of
+	sums fits within MIN_PLUS_BUFFER_ENTRIES entries, and otherwise as many as fit
+
+	Returns:
+	The array holding C
+	"""
+	p, q = A.shape
+	r = B.shape[1]
+	if B.shape[0] != q:
+		raise RuntimeError("Matrix shapes do not match for min-plus product.")
+	dtype = np.result_type(A, B)
+	if out is None:
+		out = np.empty((p, r), dtype=dtype)
+		accumulate = False
+	if block_cols is None:
+		block_cols = max(1, MIN_PLUS_BUFFER_ENTRIES // max(q, 1))
+	block_cols = max(1, min(block_cols, r))
+	if block_rows is None:
+		block_rows = max(1, MIN_PLUS_BUFFER_ENTRIES // max(q * block_cols, 1))
+	block_rows = max(1, min(block_rows, p))
+	sums = np.empty((block_rows, q, block_cols), dtype=dtype)
+	for start in range(0, p, block_rows):
+		rows = slice(start, min(start + block_rows, p))
+		for col_start in range(0, r, block_cols):
+			cols = slice(col_start, min(col_start + block_cols, r))
+			block = sums[:rows.stop - rows.start, :, :cols.stop - cols.start]
+			np.add(A[rows, :, None], B[None, :, cols], out=block)
+			if accumulate:
+				np.minimum(out[rows, cols], block.min(axis=1), out=out[rows, cols])
+			else:
+				np.min(block, axis=1, out=out[rows, cols])
+	return out
+
+
 def extend_shortest_paths(L_r_minus_1, W, L_r, n):
 	"""Extend the shortest paths given in one matrix by the edge
 	weights given in another matrix.
@@ -44,10 +98,7 @@ def extend_shortest_paths(L_r_minus_1, W, L_r, n):
 	at conclusion, holds shortest-path weights with at most r edges
 	n -- each matrix is n x n
 	"""
-	for i in range(n):
-		for j in range(n):
-			for k in range(n):
-				L_r[i, j] = min(L_r[i, j], L_r_minus_1[i, k] + W[k, j])
+	min_plus_product(L_r_minus_1, W, L_r, accumulate=True)
 
 
 def slow_apsp(W, L_0, n):
@@ -61,34 +112,37 @@ def slow_apsp(W, L_0, n):
 	L -- matrix of shortest-path weights, where L[i,j] is the weight of a
 	shortest path from vertex i to vertex j
 	"""
-	L = np.copy(L_0)
+	L = np.array(L_0, dtype=np.float64)
 	m = np.ndarray((n, n))
 
 	for r in range(1, n):
 		m.fill(float('inf'))  # initialize m
 		extend_shortest_paths(L, W, m, n)
-		L = m.copy()
+		L, m = m, L  # swap the buffers rather than copying
 	return L
 
 
-def faster_apsp(W, n):
+def faster_apsp(W, n, dtype=np.float64):
 	"""Compute all-pairs shortest paths for a weighted directed graph.
 
 	Arguments:
 	W -- the weighted adjacency matrix for the graph, but with 0 on the diagonal
 	n -- each matrix is n x n
+	dtype -- type of the matrix entries; np.float32 halves the memory used, and is exact
+	for integer path weights up to 2^24
 	Returns:
 	L -- matrix of shortest-path weights, where L[i,j] is the weight of a
 	shortest path from vertex i to vertex j
 	"""
-	L = W.copy()
-	M = np.ndarray((n,n))
+	L = np.array(W, dtype=dtype)
+	M = np.ndarray((n, n), dtype=dtype)
 	r = 1
 	while r < n-1:
-		M.fill(float('inf'))  # initialize M
-		extend_shortest_paths(L, L, M, n)  # compute M = L^2
+		min_plus_product(L, L, M)  # compute M = L^2
 		r *= 2
-		L = M.copy()
+		if np.array_equal(M, L):
+			break  # squaring again would change nothing
+		L, M = M, L  # swap the buffers rather than copying
 	return L
 
 
@@ -145,3 +199,27 @@ if __name__ == "__main__":
 	faster_L = faster_apsp(W, n)
 	print(faster_L)
 	print(np.array_equal(slow_L, faster_L))
+
+	# Early exit and float32 on a larger graph.
+	import time
+	from floyd_warshall import floyd_warshall
+	from generate_random_graph import generate_gnp_graph
+	n = 400
+	graph3 = generate_gnp_graph(n, 0.02, False, True, True, 1, 30, seed=7)
+	W = create_W(graph3, n)
+	start = time.perf_counter()
+	faster_L = faster_apsp(W, n)
+	print("n = 400: %.2f seconds" % (time.perf_counter() - start))
+	faster_L32 = faster_apsp(W, n, np.float32)
+	fw_L = floyd_warshall(W, n)
+	print(np.array_equal(faster_L, fw_L), np.array_equal(faster_L32, fw_L), faster_L32.dtype)
+	print(np.array_equal(min_plus_product(W, W, block_rows=7), min_plus_product(W, W)))
+	# With a small buffer, the columns are blocked too: no block of sums holds more than
+	# max(n, MIN_PLUS_BUFFER_ENTRIES) entries.
+	saved = MIN_PLUS_BUFFER_ENTRIES
+	MIN_PLUS_BUFFER_ENTRIES = 1000
+	print(np.array_equal(min_plus_product(W, W), min_plus_product(W, W, block_rows=7)))
+	C = np.full((n, n), float('inf'))
+	min_plus_product(W, W, C, accumulate=True, block_rows=3, block_cols=11)
+	print(np.array_equal(C, min_plus_product(W, W)))
+	MIN_PLUS_BUFFER_ENTRIES = saved
@@ -31,54 +31,134 @@
 #########################################################################
 
 import numpy as np
+from adjacency_matrix_graph import pack_bits, unpack_bits
 
 
-def floyd_warshall(W, n):
+def initialize_predecessors(W, n):
+	"""Return the initial predecessor matrix for the weighted adjacency matrix W: entry
+	[i, j] is i if there is an edge (i, j) with i != j, and -1 (NIL) otherwise."""
+	Pi = np.repeat(np.arange(n, dtype=np.int64)[:, None], n, axis=1)
+	Pi[(W == float('inf')) | np.eye(n, dtype=bool)] = -1
+	return Pi
+
+
+def floyd_warshall(W, n, predecessors=False):
 	"""Compute all-pairs shortest paths. 
 
 	Argument: 
 	W -- the weighted adjacency matrix for the graph, but with 0 on the diagonal
 	n -- each matrix is n x n
+	predecessors -- if True, also compute the predecessor matrix
 
 	Returns:
-	n x n matrix of shortest-path weights in G
+	n x n matrix of shortest-path weights in G, and if predecessors is True, also the
+	n x n predecessor matrix, with -1 for NIL
 
-	Note: Implements the Floyd-Warshall' procedure in Exercise 23.2-4
+	Note: Implements the Floyd-Warshall' procedure in Exercise 23.2-4, with the loops
+	over i and j done by one array operation for each k.  Row k and column k do not
+	change in iteration k, so that d can be updated in place.
 	"""
 	d = W.copy()
+	Pi = initialize_predecessors(W, n) if predecessors else None
 	for k in range(n):
-		for i in range(n):
-			for j in range(n):
-				d[i,j] = min(d[i,j], d[i,k] + d[k,j])
-	return d
-
+		through_k = d[:, k, None] + d[None, k, :]  # d[i,k] + d[k,j] for all i and j
+		if predecessors:
+			shorter = through_k < d
+			Pi[shorter] = np.broadcast_to(Pi[k], (n, n))[shorter]
+		np.minimum(d, through_k, out=d)
+	return (d, Pi) if predecessors else d
+
+
+def blocked_floyd_warshall(W, n, block_size=64, predecessors=False):
+	"""Compute all-pairs shortest paths like floyd_warshall, but working on
+	block_size x block_size tiles so that the data being updated stays in cache.  For
+	each block K of intermediate vertices, first the rows in K and then the columns in K
+	are updated for each k in K in turn.  Those rows and columns are then final for K,
+	so that every other tile (I, J) is updated by a single min-plus product of tiles
+	(I, K) and (K, J).
+
+	Arguments:
+	W -- the weighted adjacency matrix for the graph, but with 0 on the diagonal
+	n -- each matrix is n x n
+	block_size -- number of rows and columns in a tile
+	predecessors -- if True, also compute the predecessor matrix
 
-def transitive_closure(G, n):
+	Returns:
+	As for floyd_warshall
+	"""
+	d = W.copy()
+	Pi = initialize_predecessors(W, n) if predecessors else None
+	blocks = [(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+	for K in blocks:
+		K_rows = slice(*K)
+		# Rows in K, over all columns, with intermediate vertices in K.
+		for k in range(*K):
+			through_k = d[K_rows, k, None] + d[None, k, :]
+			if predecessors:
+				shorter = through_k < d[K_rows]
+				Pi[K_rows][shorter] = np.broadcast_to(Pi[k], through_k.shape)[shorter]
+			np.minimum(d[K_rows], through_k, out=d[K_rows])
+		# Columns in K, over all rows, with intermediate vertices in K.
+		for k in range(*K):
+			through_k = d[:, k, None] + d[None, k, K_rows]
+			if predecessors:
+				shorter = through_k < d[:, K_rows]
+				Pi[:, K_rows][shorter] = np.broadcast_to(Pi[k, K_rows], through_k.shape)[shorter]
+			np.minimum(d[:, K_rows], through_k, out=d[:, K_rows])
+		# All other tiles, by min-plus products of the finished row and column panels.
+		for I in blocks:
+			if I == K:
+				continue
+			I_rows = slice(*I)
+			for J in blocks:
+				if J == K:
+					continue
+				J_cols = slice(*J)
+				# sums[i, k, j] = d[i, k] + d[k, j] for i in I, k in K, j in J.
+				sums = d[I_rows, K_rows, None] + d[None, K_rows, J_cols]
+				best = sums.argmin(axis=1)
+				through_K = np.take_along_axis(sums, best[:, None, :], axis=1)[:, 0, :]
+				if predecessors:
+					shorter = through_K < d[I_rows, J_cols]
+					best_k = best + K[0]
+					Pi[I_rows, J_cols][shorter] = Pi[best_k, np.arange(*J)[None, :]][shorter]
+				np.minimum(d[I_rows, J_cols], through_K, out=d[I_rows, J_cols])
+	return (d, Pi) if predecessors else d
+
+
+def transitive_closure(G, n, packed=False):
 	"""Return the transitive closure of a directed graph. The transitive closure is
 	a graph with an edge from i to j if and only if a path exists from i to j.
+	Each row of the closure is held as a bitset packed into uint64 words, so that
+	step k ORs row k into every row with bit k set, 64 entries per word operation.
 
 	Argument:
-	G -- a weighted, directed graph represented by an adjacency matrix
+	G -- a directed graph offering get_edge_list, such as an adjacency matrix
 	n -- matrices are n x n
+	packed -- boolean whether to return the rows packed as by pack_bits
 	Returns:
 	A transitive closure matrix in which the [i][j] entry is True
-	if there is a path in G from vertex i to vertex j, False otherwise
+	if there is a path in G from vertex i to vertex j, False otherwise,
+	or the n x ceil(n / 64) matrix of its packed rows if packed is True
 
 	Note: Implements a version of the Transitive-Closure procedure like the
 	Floyd-Warshall' procedure in Exercise 23.2-4.
 	"""
-
-	t = np.ndarray((n,n), dtype=bool)
-	for i in range(n):
-		for j in range(n):
-			t[i,j] = i == j or G.has_edge(i, j)
+	edges = np.array(G.get_edge_list(), dtype=np.int64).reshape(-1, 2)
+	u, v = edges[:, 0], edges[:, 1]
+	if not G.is_directed():
+		u, v = np.concatenate((u, v)), np.concatenate((v, u))
+	u = np.concatenate((u, np.arange(n)))  # each vertex reaches itself
+	v = np.concatenate((v, np.arange(n)))
+	t = np.zeros((n, (n + 63) // 64), dtype=np.uint64)  # rows packed as by pack_bits
+	np.bitwise_or.at(t, (u, v >> 6), np.left_shift(np.uint64(1), (v & 63).astype(np.uint64)))
 
 	for k in range(n):
-		for i in range(n):
-			for j in range(n):
-				t[i,j] = t[i,j] or (t[i,k] and t[k,j])
+		# Rows i with t[i, k] True gain every vertex reachable from k.
+		through_k = (t[:, k >> 6] >> np.uint64(k & 63)) & np.uint64(1) != 0
+		t[through_k] |= t[k]
 
-	return t
+	return t if packed else unpack_bits(t, n)
 
 
 # Testing
@@ -99,6 +179,9 @@ if __name__ == "__main__":
 	w = create_W(graph1, n)
 	fw_result = floyd_warshall(w, n)
 	print(fw_result)
+	fw_result, fw_pi = floyd_warshall(w, n, True)
+	print(fw_pi)
+	print(np.array_equal(blocked_floyd_warshall(w, n, 2), fw_result))
 
 	# Textbook example for transitive closure.
 	vertices2 = [1, 2, 3, 4]
@@ -110,3 +193,35 @@ if __name__ == "__main__":
 	print(graph2)
 	tc_result = transitive_closure(graph2, n)
 	print(tc_result)
+
+	# Larger example, checked against Johnson's algorithm.
+	import time
+	from johnson import johnson
+	from generate_random_graph import generate_gnp_graph
+	from print_all_pairs_shortest_path import all_pairs_shortest_paths
+	n = 500
+	graph3 = generate_gnp_graph(n, 0.02, True, True, True, 1, 30, seed=6)
+	w = create_W(graph3.adjacency_matrix(), n)
+	start = time.perf_counter()
+	fw_d, fw_pi = floyd_warshall(w, n, True)
+	print("n = 500: %.2f seconds" % (time.perf_counter() - start))
+	blocked_d, blocked_pi = blocked_floyd_warshall(w, n, 64, True)
+	print(np.array_equal(fw_d, johnson(graph3)), np.array_equal(fw_d, blocked_d))
+	# The predecessor matrices may differ if shortest paths are not unique, but each
+	# must give paths with the shortest-path weights.
+	pairs = [(i, j) for i in range(0, n, 7) for j in range(0, n, 11)]
+	for Pi in [fw_pi, blocked_pi]:
+		paths = all_pairs_shortest_paths(Pi, [i for i, j in pairs], [j for i, j in pairs])
+		print(all((fw_d[i, j] == float('inf')) if path is None else
+				  sum(w[path[t], path[t + 1]] for t in range(len(path) - 1)) == fw_d[i, j]
+				  for (i, j), path in zip(pairs, paths)))
+
+	# Transitive closure agrees with the finite shortest-path weights.
+	from csr_graph import CSRGraph
+	u3, v3, weights3 = CSRGraph.from_graph(graph3).get_edge_arrays()
+	packed_graph3 = AdjacencyMatrixGraph.from_edge_arrays(n, u3, v3, packed=True)
+	start = time.perf_counter()
+	tc_result = transitive_closure(graph3, n)
+	print("Transitive closure, n = 500: %.2f seconds" % (time.perf_counter() - start))
+	print(np.array_equal(tc_result, fw_d < float('inf')),
+		  np.array_equal(transitive_closure(packed_graph3, n, True), pack_bits(tc_result)))
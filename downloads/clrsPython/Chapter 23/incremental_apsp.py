@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# incremental_apsp.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+import numpy as np
+from floyd_warshall import floyd_warshall
+from print_all_pairs_shortest_path import all_pairs_shortest_path
+
+# Above this fraction of the rows, rerunning the vectorized floyd_warshall is faster than
+# recomputing the rows one Dijkstra step at a time.
+REBUILD_FRACTION = 0.25
+
+
+class IncrementalAPSP:
+
+	def __init__(self, W, n):
+		"""Initialize all-pairs shortest paths for a weighted, directed graph that are kept
+		up to date as edges are inserted, deleted, and reweighted through this object.
+		Insertions and weight decreases take O(n^2) time per endpoint of the changed edges;
+		deletions and weight increases recompute only the rows whose shortest-paths trees
+		use a changed edge.
+
+		Arguments:
+		W -- the weighted adjacency matrix for the graph, but with 0 on the diagonal
+		n -- each matrix is n x n
+		Assumption:
+		The graph has no negative-weight cycle, and no update may create one.
+		"""
+		self.n = n
+		self.W = np.array(W, dtype=np.float64)
+		self.d, self.Pi = floyd_warshall(self.W, n, True)
+
+	def get_d(self):
+		"""Return the matrix of shortest-path weights."""
+		return self.d
+
+	def get_pi(self):
+		"""Return the predecessor matrix, with -1 for NIL."""
+		return self.Pi
+
+	def distance(self, i, j):
+		"""Return the shortest-path weight from i to j."""
+		return self.d[i, j]
+
+	def path(self, i, j):
+		"""Return a list of the vertices on a shortest path from i to j, or None if there
+		is no path."""
+		return all_pairs_shortest_path(self.Pi, i, j)
+
+	def insert_edge(self, u, v, weight):
+		"""Insert edge (u, v) with the given weight.  Return the number of rows recomputed."""
+		if self.W[u, v] < float('inf'):
+			raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
+		return self.apply_batch([(u, v, weight)])
+
+	def delete_edge(self, u, v):
+		"""Delete edge (u, v).  Return the number of rows recomputed."""
+		return self.apply_batch([(u, v, float('inf'))])
+
+	def decrease_weight(self, u, v, weight):
+		"""Decrease the weight of edge (u, v).  Return the number of rows recomputed, 0."""
+		if weight > self.W[u, v]:
+			raise RuntimeError("New weight " + str(weight) + " is greater than current weight "
+							   + str(self.W[u, v]) + ".")
+		return self.apply_batch([(u, v, weight)])
+
+	def increase_weight(self, u, v, weight):
+		"""Increase the weight of edge (u, v).  Return the number of rows recomputed."""
+		if weight < self.W[u, v]:
+			raise RuntimeError("New weight " + str(weight) + " is less than current weight "
+							   + str(self.W[u, v]) + ".")
+		return self.apply_batch([(u, v, weight)])
+
+	def apply_batch(self, updates):
+		"""Apply a batch of updates together and return the number of rows recomputed.
+		Weight increases and deletions are applied first, by recomputing the rows whose
+		shortest-paths trees use one of those edges.  Then insertions and weight decreases
+		are applied by a Floyd-Warshall pass whose intermediate vertices are only the
+		endpoints of those edges, since any newly shortened path is made of old shortest
+		paths between such endpoints.  Error if the decreases create a negative-weight
+		cycle, in which case no update in the batch is applied.
+
+		Argument:
+		updates -- sequence of triples (u, v, weight), setting the weight of (u, v), with
+		weight infinity to delete the edge
+		"""
+		increases = [(u, v, w) for u, v, w in updates if w > self.W[u, v]]
+		decreases = [(u, v, w) for u, v, w in updates if w < self.W[u, v]]
+		for u, v, w in updates:
+			if u == v:
+				raise RuntimeError("Cannot update the diagonal entry (" + str(u) + ", " + str(v) + ").")
+
+		old = (self.W.copy(), self.d.copy(), self.Pi.copy())
+		rows = 0
+		if len(increases) > 0:
+			affected = np.zeros(self.n, dtype=bool)
+			for u, v, w in increases:
+				affected |= self.Pi[:, v] == u  # rows whose trees use edge (u, v)
+				self.W[u, v] = w
+			rows = self.recompute_rows(np.flatnonzero(affected))
+
+		if len(decreases) > 0:
+			d, Pi = self.d, self.Pi
+			for u, v, w in decreases:
+				self.W[u, v] = w
+				if w < d[u, v]:
+					d[u, v] = w
+					Pi[u, v] = u
+			n = self.n
+			for k in sorted({u for u, v, w in decreases} | {v for u, v, w in decreases}):
+				through_k = d[:, k, None] + d[None, k, :]
+				shorter = through_k < d
+				Pi[shorter] = np.broadcast_to(Pi[k], (n, n))[shorter]
+				np.minimum(d, through_k, out=d)
+			if (np.diag(d) < 0).any():
+				self.W, self.d, self.Pi = old
+				raise RuntimeError("The updates create a negative-weight cycle.")
+		return rows
+
+	def recompute_rows(self, rows):
+		"""Recompute rows of the distance and predecessor matrices, after edge weights have
+		increased, by running Dijkstra's algorithm from each of their vertices at once on
+		the dense weight matrix, so that each of at most n steps settles one vertex in
+		every row with O(len(rows) * n) vectorized work.  Edges may have negative weights,
+		so the steps use reduced weights w(x, y) + h[x] - h[y], as in Johnson's algorithm,
+		with h[y] the smallest entry in column y of the old distances.  Since h satisfies
+		the triangle inequality for the old weights, it does so for the increased weights,
+		and the reduced weights are nonnegative.  If more than REBUILD_FRACTION of the rows
+		are affected, rerun floyd_warshall instead.  Return the number of rows recomputed."""
+		n = self.n
+		d, Pi, W = self.d, self.Pi, self.W
+		r = len(rows)
+		if r == 0:
+			return 0
+		if r > REBUILD_FRACTION * n:
+			self.d, self.Pi = floyd_warshall(W, n, True)
+			return n
+		h = d.min(axis=0)  # shortest distances from a new vertex with 0-weight edges to all
+		searches = np.arange(r)
+		row_d = np.full((r, n), np.inf)  # reduced distances
+		row_d[searches, rows] = 0
+		row_pi = np.full((r, n), -1, dtype=np.int64)
+		settled = np.zeros((r, n), dtype=bool)
+
+		for step in range(n):
+			# Settle the unsettled vertex x closest to the source of each search.
+			x = np.argmin(np.where(settled, np.inf, row_d), axis=1)
+			x_d = row_d[searches, x]
+			running = np.flatnonzero((x_d < np.inf) & ~settled[searches, x])
+			if len(running) == 0:
+				break  # every search has settled all the vertices it reaches
+			x = x[running]
+			settled[running, x] = True
+			# Relax each edge (x, y) leaving x.
+			through_x = x_d[running, None] + (W[x] + h[x, None] - h[None, :])
+			shorter = (through_x < row_d[running]) & ~settled[running]
+			row_d[running] = np.where(shorter, through_x, row_d[running])
+			row_pi[running] = np.where(shorter, x[:, None], row_pi[running])
+
+		d[rows] = row_d - h[rows, None] + h[None, :]  # undo the reweighting
+		Pi[rows] = row_pi
+		return r
+
+
+# Testing
+if __name__ == "__main__":
+
+	from generate_random_graph import generate_gnp_graph
+	from all_pairs_shortest_paths import create_W
+
+	n = 80
+	graph1 = generate_gnp_graph(n, 0.06, False, True, True, 1, 30, seed=8)
+	W = create_W(graph1, n).astype(np.float64)
+	apsp = IncrementalAPSP(W, n)
+	rng = np.random.default_rng(9)
+	all_equal = True
+	rows = 0
+	for update in range(300):
+		u, v = rng.integers(n, size=2).tolist()
+		if u == v:
+			continue
+		kind = rng.integers(4)
+		if kind == 0 and W[u, v] == float('inf'):
+			W[u, v] = int(rng.integers(1, 30))
+			rows += apsp.insert_edge(u, v, W[u, v])
+		elif kind == 1 and W[u, v] < float('inf'):
+			W[u, v] = int(rng.integers(0, W[u, v] + 1))
+			rows += apsp.decrease_weight(u, v, W[u, v])
+		elif kind == 2 and W[u, v] < float('inf'):
+			W[u, v] += int(rng.integers(0, 30))
+			rows += apsp.increase_weight(u, v, W[u, v])
+		elif kind == 3:
+			batch = []
+			for i in range(5):
+				x, y = rng.integers(n, size=2).tolist()
+				if x != y and all((x, y) != (a, b) for a, b, w in batch):
+					batch.append((x, y, float('inf') if rng.integers(3) == 0 else int(rng.integers(1, 30))))
+			for x, y, w in batch:
+				W[x, y] = w
+			rows += apsp.apply_batch(batch)
+		fw_d = floyd_warshall(W, n)
+		paths_ok = all((apsp.get_d()[i, j] == float('inf')) == (apsp.path(i, j) is None) and
+					   (apsp.path(i, j) is None or
+						sum(W[p, q] for p, q in zip(apsp.path(i, j), apsp.path(i, j)[1:])) == fw_d[i, j])
+					   for i in range(0, n, 9) for j in range(0, n, 7))
+		if not np.array_equal(apsp.get_d(), fw_d) or not paths_ok:
+			print("Mismatch after update", update)
+			all_equal = False
+			break
+	print("All distances are " + ("not " if not all_equal else "") + "equal")
+	print("Rows recomputed over all updates:", rows)
+
+	# Negative-weight cycle.
+	W2 = np.array([[0, 2, float('inf')], [float('inf'), 0, 1], [float('inf'), float('inf'), 0]])
+	apsp2 = IncrementalAPSP(W2, 3)
+	try:
+		apsp2.insert_edge(2, 0, -4)
+	except RuntimeError as e:
+		print(e)
+	print(apsp2.get_d())
+	apsp2.insert_edge(2, 0, -3)
+	print(apsp2.get_d())
+	print(apsp2.path(1, 0))
+	apsp2.increase_weight(0, 1, 3)  # recomputes the rows using the negative-weight edge (2, 0)
+	W2[2, 0] = -3
+	W2[0, 1] = 3
+	print(np.array_equal(apsp2.get_d(), floyd_warshall(W2, 3)))
+
+	# Increases on a dag with negative weights, which cannot create cycles.
+	n = 60
+	W4 = np.triu(rng.integers(-10, 20, size=(n, n)).astype(np.float64), 1)
+	W4[np.tril_indices(n)] = np.inf
+	W4[rng.random((n, n)) > 0.2] = np.inf
+	np.fill_diagonal(W4, 0)
+	apsp4 = IncrementalAPSP(W4, n)
+	all_equal = True
+	for update in range(100):
+		u, v = np.sort(rng.choice(n, size=2, replace=False)).tolist()
+		if W4[u, v] < np.inf:
+			W4[u, v] = np.inf if rng.integers(2) == 0 else W4[u, v] + int(rng.integers(1, 20))
+			apsp4.apply_batch([(u, v, W4[u, v])])
+			all_equal = all_equal and np.array_equal(apsp4.get_d(), floyd_warshall(W4, n))
+	print("Negative weights: all distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Deleting an edge of a cycle changes every row but one.
+	import time
+	for n in [200, 400]:
+		W3 = np.full((n, n), np.inf)
+		np.fill_diagonal(W3, 0)
+		W3[np.arange(n), (np.arange(n) + 1) % n] = 1
+		apsp3 = IncrementalAPSP(W3, n)
+		start = time.perf_counter()
+		rows = apsp3.delete_edge(0, 1)
+		incremental = time.perf_counter() - start
+		W3[0, 1] = np.inf
+		start = time.perf_counter()
+		fw_d = floyd_warshall(W3, n)
+		print("n = %d: %d rows recomputed in %.3f seconds, Floyd-Warshall %.3f seconds, equal: %s"
+			  % (n, rows, incremental, time.perf_counter() - start, np.array_equal(apsp3.get_d(), fw_d)))
@@ -30,57 +30,167 @@
 #                                                                       #
 #########################################################################
 
+import multiprocessing as mp
 import numpy as np
-from bellman_ford import bellman_ford
+from adjacency_list_graph import AdjacencyListGraph
+from csr_graph import CSRGraph
+from bellman_ford import bellman_ford, bellman_ford_queue, bellman_ford_arrays
 from dijkstra import dijkstra
+from query_cache import QueryCache
 
 
-def johnson(G):
-	"""Compute all-pairs shortest paths. 
+def johnson_reweight(G, shortest_paths_func=bellman_ford):
+	"""Compute the potentials h used by Johnson's algorithm, and reweight the edges of G
+	so that they are nonnegative.
 
-	Argument: 
-	G -- a weighted, directed graph represented by adjacency lists
+	Arguments:
+	G -- a weighted, directed graph
+	shortest_paths_func -- function computing the potentials, returning values like
+	bellman_ford, such as bellman_ford_queue or bellman_ford_arrays
 
 	Returns:
-	A matrix of shortest-path weights
+	G_hat -- a CSRGraph with the edges of G, each edge (u, v) having weight w(u, v) + h[u] - h[v],
+	or None if G contains a negative-weight cycle
+	h -- list of potentials, h[v] being the shortest-path weight to v from an extra vertex
+	with 0-weight edges to all vertices, or None if G contains a negative-weight cycle
 	"""
 	card_V = G.get_card_V()
 	s = card_V 	# index of additional vertex
-	# Compute G_prime which is the same as g with with an extra vertex and
-	# 0-weight edges from the extra vertex to all other vertices. The extra vertex
-	# is the next available index. 
-	G_prime = AdjacencyListGraph(card_V + 1, True, True)
-	for i in range(card_V):
-		G_prime.insert_edge(s, i, 0)  # 0-weight edges from s to all other vertices
-		for edge in G.get_adj_list(i):  # copy all other edges
-			G_prime.insert_edge(i, edge.get_v(), edge.get_weight())
-
-	bellman_ford_d, pi, no_neg_cycle = bellman_ford(G_prime, s)
+	csr = G if isinstance(G, CSRGraph) else CSRGraph.from_graph(G)
+	u, v, w = csr.get_edge_arrays()
+	# Compute G_prime which is the same as G with an extra vertex and 0-weight edges
+	# from the extra vertex to all other vertices, built from the edge arrays in one pass.
+	# The extra vertex is the next available index.
+	others = np.arange(card_V, dtype=np.int64)
+	G_prime = AdjacencyListGraph.from_edge_arrays(card_V + 1,
+												  np.concatenate((u, np.full(card_V, s, dtype=np.int64))),
+												  np.concatenate((v, others)),
+												  np.concatenate((w, np.zeros(card_V, dtype=w.dtype))))
+
+	bellman_ford_d, pi, no_neg_cycle = shortest_paths_func(G_prime, s)
 	if not no_neg_cycle:  # negative weight cycle?
-		print("The input graph contains a negative-weight cycle.")
-	else:  # no negative-weight cycle, so proceed
-		card_V_prime = G_prime.get_card_V()
-		h = bellman_ford_d  # set h(v) to the shortest-path weight from s to v computed by Bellman-Ford
+		return None, None
+	h = bellman_ford_d[:card_V]  # set h(v) to the shortest-path weight from s to v computed by Bellman-Ford
+
+	# Reweight all edges to produce nonnegative weights, all at once.
+	h_array = np.array(h)
+	G_hat = CSRGraph(card_V, csr.get_offsets(), v, w + h_array[u] - h_array[v], True)
+	return G_hat, h
+
+
+def johnson_row(G_hat, h, u):
+	"""Return a numpy array of the shortest-path weights from u in the original graph,
+	found by running Dijkstra's algorithm from u in the reweighted graph G_hat."""
+	dijkstra_d, pi = dijkstra(G_hat, u)
+	return np.array(dijkstra_d, dtype=np.float64) + np.array(h, dtype=np.float64) - h[u]
 
-		# Reweight all edges of G_prime to produce nonnegative weights.
-		for u in range(card_V_prime):
-			for edge in G_prime.get_adj_list(u):
-				edge.set_weight(edge.get_weight() + h[u] - h[edge.get_v()])
 
+def johnson(G, shortest_paths_func=bellman_ford):
+	"""Compute all-pairs shortest paths. 
+
+	Arguments:
+	G -- a weighted, directed graph represented by adjacency lists
+	shortest_paths_func -- Bellman-Ford variant computing the potentials
+
+	Returns:
+	A matrix of shortest-path weights
+	"""
+	G_hat, h = johnson_reweight(G, shortest_paths_func)
+	if G_hat is None:
+		print("The input graph contains a negative-weight cycle.")
+	else:  # no negative-weight cycle, so proceed
+		card_V = G.get_card_V()
 		# Compute shortest paths from each vertex u with Dijkstra's algorithm.
 		d = np.ndarray((card_V, card_V))
 		for u in range(card_V):
-			dijkstra_d, pi = dijkstra(G_prime, u)
-			for v in range(card_V):
-				d[u, v] = dijkstra_d[v] + h[v] - h[u]
-
+			d[u] = johnson_row(G_hat, h, u)
 		return d
 
 
+# Reweighted graph and potentials held by each process of a pool running parallel_johnson.
+worker_G_hat = None
+worker_h = None
+
+
+def johnson_worker_init(G_hat, h):
+	"""Give a pool process the reweighted graph and potentials, once for all its rows."""
+	global worker_G_hat, worker_h
+	worker_G_hat = G_hat
+	worker_h = h
+
+
+def johnson_worker_row(u):
+	"""Compute the row for source u in a pool process."""
+	return johnson_row(worker_G_hat, worker_h, u)
+
+
+def parallel_johnson(G, processes=None, chunksize=None, shortest_paths_func=bellman_ford):
+	"""Compute all-pairs shortest paths with Johnson's algorithm, running the Dijkstra
+	searches from the sources in a pool of processes.  The Bellman-Ford potentials are
+	computed once, and the reweighted graph is sent once to each process.
+
+	Arguments:
+	G -- a weighted, directed graph
+	processes -- number of processes, or None for the number of CPUs
+	chunksize -- number of sources handed to a process at a time, or None for a default
+	shortest_paths_func -- Bellman-Ford variant computing the potentials
+
+	Returns:
+	A matrix of shortest-path weights.  Error if G contains a negative-weight cycle.
+	"""
+	G_hat, h = johnson_reweight(G, shortest_paths_func)
+	if G_hat is None:
+		raise RuntimeError("The input graph contains a negative-weight cycle.")
+	card_V = G.get_card_V()
+	if chunksize is None:
+		chunksize = max(1, card_V // (4 * (processes or mp.cpu_count())))
+	d = np.ndarray((card_V, card_V))
+	with mp.Pool(processes, initializer=johnson_worker_init, initargs=(G_hat, h)) as pool:
+		for u, row in enumerate(pool.imap(johnson_worker_row, range(card_V), chunksize)):
+			d[u] = row
+	return d
+
+
+class JohnsonOracle:
+
+	def __init__(self, G, max_rows=128, shortest_paths_func=bellman_ford):
+		"""Initialize an oracle answering shortest-path queries on graph G, which may have
+		negative-weight edges.  The potentials are computed once, upon initialization, but
+		the row of shortest-path weights from a source is computed only when that source
+		is first queried.  At most max_rows rows are kept, least recently used rows being
+		evicted, so that the space used need not grow as V^2.
+
+		Arguments:
+		G -- a weighted, directed graph.  Error if it contains a negative-weight cycle.
+		max_rows -- maximum number of rows kept
+		shortest_paths_func -- Bellman-Ford variant computing the potentials
+		"""
+		self.G_hat, self.h = johnson_reweight(G, shortest_paths_func)
+		if self.G_hat is None:
+			raise RuntimeError("The input graph contains a negative-weight cycle.")
+		self.cache = QueryCache(max_entries=max_rows)
+
+	def compute_row(self, G_hat, u):
+		"""Compute the row for source u, on a miss in the cache."""
+		return johnson_row(G_hat, self.h, u)
+
+	def row(self, u):
+		"""Return a numpy array of the shortest-path weights from u.  The array may be
+		shared with later calls, so the caller must not change it."""
+		return self.cache.query(self.compute_row, self.G_hat, u)
+
+	def distance(self, u, v):
+		"""Return the shortest-path weight from u to v."""
+		return self.row(u)[v]
+
+	def get_stats(self):
+		"""Return the statistics of the row cache."""
+		return self.cache.get_stats()
+
+
 # Testing
 if __name__ == "__main__":
 
-	from adjacency_list_graph import AdjacencyListGraph
 	from all_pairs_shortest_paths import create_W
 	from floyd_warshall import floyd_warshall
 	from generate_random_graph import generate_random_graph
@@ -106,3 +216,24 @@ if __name__ == "__main__":
 	print(johnson_d)
 	fw_d = floyd_warshall(create_W(graph2.adjacency_matrix(), n), n)
 	print(np.array_equal(johnson_d, fw_d))
+
+	# Parallel and lazy versions, unless the random graph has a negative-weight cycle.
+	if johnson_d is not None:
+		print(np.array_equal(parallel_johnson(graph2, 3), fw_d))
+		oracle = JohnsonOracle(graph2, max_rows=10)
+		rng = np.random.default_rng(1)
+		queries = rng.integers(0, n, size=(200, 2)).tolist()
+		print(all(oracle.distance(u, v) == fw_d[u, v] for u, v in queries))
+		print(oracle.get_stats())
+		print(np.array_equal(johnson(graph2, bellman_ford_queue), fw_d),
+			  np.array_equal(johnson(graph2, bellman_ford_arrays), fw_d))
+
+	# Negative-weight cycle.
+	graph3 = AdjacencyListGraph(3, True, True)
+	for u, v, w in [(0, 1, 1), (1, 2, -3), (2, 0, 1)]:
+		graph3.insert_edge(u, v, w)
+	print(johnson(graph3))
+	try:
+		JohnsonOracle(graph3)
+	except RuntimeError as e:
+		print(e)
@@ -30,6 +30,73 @@
 #                                                                       #
 #########################################################################
 
+import numpy as np
+
+
+def is_nil(predecessor):
+	"""Return True if a predecessor-matrix entry is NIL, given as None or as a negative number."""
+	return predecessor is None or predecessor < 0
+
+
+def all_pairs_shortest_path(Pi, i, j):
+	"""Return a list of the vertices on a shortest path from i to j, or None if there is
+	no path from i to j.
+
+	Arguments:
+	Pi -- predecessor matrix: Pi[i, j] is the predecessor of j on some shortest path from i,
+	None or -1 for NIL
+	i -- starting index
+	j -- ending index
+	"""
+	path = [j]
+	while j != i:
+		j = Pi[i, j]
+		if is_nil(j):
+			return None
+		path.append(int(j))
+	path.reverse()
+	return path
+
+
+def all_pairs_shortest_paths(Pi, sources, targets):
+	"""Return a list of the shortest paths from sources[t] to targets[t] for each t, each
+	path being a list of vertices, or None if there is no path.  All the paths are
+	followed back from their targets together, one step per array operation.
+
+	Arguments:
+	Pi -- predecessor matrix, None or -1 for NIL
+	sources -- sequence of starting indices
+	targets -- sequence of ending indices, as many as sources
+	"""
+	Pi = np.asarray(Pi)
+	if Pi.dtype == object:
+		Pi = np.where(Pi == None, -1, Pi).astype(np.int64)
+	sources = np.asarray(sources, dtype=np.int64)
+	current = np.asarray(targets, dtype=np.int64)
+	if len(sources) != len(current):
+		raise RuntimeError("Sources and targets must have the same length.")
+	steps = [current]  # steps[r][t] is the vertex r steps back from targets[t]
+	active = current != sources
+	found = ~active
+	while active.any():
+		current = np.where(active, Pi[sources, np.where(active, current, 0)], current)
+		missing = active & (current < 0)
+		active &= ~missing
+		steps.append(current)
+		found |= active & (current == sources)
+		active &= current != sources
+	steps = np.array(steps).T.tolist()  # steps[t] is the path to targets[t], reversed
+	paths = []
+	for t in range(len(sources)):
+		if found[t]:
+			path = steps[t][:steps[t].index(sources[t]) + 1]
+			path.reverse()
+			paths.append(path)
+		else:
+			paths.append(None)
+	return paths
+
+
 def print_all_pairs_shortest_path(Pi, i, j):
 	"""Print the vertices on a shortest path from i to j. 
 	
@@ -38,10 +105,26 @@ def print_all_pairs_shortest_path(Pi, i, j):
 	i -- starting index
 	j -- ending index
 	"""
-	if i == j:
-		print(i)
-	elif Pi[i, j] is None:
+	path = all_pairs_shortest_path(Pi, i, j)
+	if path is None:
 		print("No path from", i, "to", j, "exists.")
 	else:
-		print_all_pairs_shortest_path(Pi, i, Pi[i, j])
-		print(j)
+		for v in path:
+			print(v)
+
+
+# Testing
+if __name__ == "__main__":
+
+	# Predecessor matrix for the textbook example of Figure 23.1, with vertices numbered from 0.
+	Pi = np.array([[-1, 2, 3, 4, 0],
+				   [3, -1, 3, 1, 0],
+				   [3, 2, -1, 1, 0],
+				   [3, 2, 3, -1, 0],
+				   [3, 2, 3, 4, -1]])
+	print_all_pairs_shortest_path(Pi, 0, 2)
+	print(all_pairs_shortest_path(Pi, 4, 1))
+	print(all_pairs_shortest_paths(Pi, [0, 1, 2, 3, 4], [2, 0, 4, 3, 1]))
+	Pi_none = np.array([[None, 0], [None, None]], dtype=object)
+	print_all_pairs_shortest_path(Pi_none, 1, 0)
+	print(all_pairs_shortest_paths(Pi_none, [0, 1, 0], [1, 0, 0]))
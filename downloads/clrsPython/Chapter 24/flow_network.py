@@ -34,6 +34,7 @@ from adjacency_list_graph import AdjacencyListGraph, Edge
 
 
 class FlowEdge(Edge):
+	__slots__ = ("u", "c", "f", "original_edge", "reverse_edge")
 
 	def __init__(self, u, v, c, original_edge):
 		"""Initialize edge to vertex v with nonnegative capacity c."""
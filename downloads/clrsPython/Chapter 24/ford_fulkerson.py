@@ -36,7 +36,9 @@ from fifo_queue import Queue
 def dfs(G, source, sink):
 	"""Perform depth-first search on a residual network in order to find an augmenting path
 	from the source to the sink.  Stops as soon as the sink is found.  Doesn't
-	run any functions upon discovering or finishing a vertex.
+	run any functions upon discovering or finishing a vertex.  An explicit stack holds,
+	for each vertex on the current path, an iterator over its remaining edges, so that
+	long augmenting paths do not exceed Python's recursion limit.
 
 	Arguments:
 	G -- a residual network
@@ -46,46 +48,26 @@ def dfs(G, source, sink):
 	Returns:
 	pi -- if vertex v is found in the search, then pi[v] is the edge (u, v) that was explored to find v.
 	"""
-
-	global pi, sink_found
-	sink_found = False
 	pi = [None] * G.get_card_V()
 
 	# Find a path from the source to the sink, if one exists.
-	dfs_visit(G, source, sink)
+	stack = [iter(G.get_adj_list(source))]
+	while len(stack) > 0:
+		for edge in stack[-1]:
+			v = edge.get_v()
+			# Explore this edge (u, v) if v has not been discovered (pi[v] is None)
+			# and the edge has positive capacity (it's in the residual network).
+			if pi[v] is None and edge.c > 0:
+				pi[v] = edge
+				if v == sink:
+					return pi  # no need to search any further
+				stack.append(iter(G.get_adj_list(v)))  # continue the search from v
+				break
+		else:  # every edge leaving the vertex has been explored
+			stack.pop()
 	return pi
 
 
-def dfs_visit(G, u, sink):
-	"""Perform depth-first search on a residual network in order to find an augmenting path
-	from the source to the sink.  Stops as soon as the sink is found.  Doesn't
-	run any functions upon discovering or finishing a vertex.
-
-	Arguments:
-	G -- a residual network
-	u -- index of the vertex currently searching from
-	sink -- index of sink
-	"""
-	global pi, sink_found
-
-	if sink_found:
-		return  # a previous call of this function found the sink
-
-	# Explore each adjacent edge, but only if the sink has not yet been found.
-	for edge in G.get_adj_list(u):
-		if sink_found:
-			return
-		v = edge.get_v()
-		# Explore this edge (u, v) if v has not been discovered (pi[v] is None)
-		# and the edge has positive capacity (it's in the residual network).
-		if pi[v] is None and edge.c > 0:
-			pi[v] = edge
-			if v == sink:
-				sink_found = True  # no need to search any further
-			else:
-				dfs_visit(G, v, sink)
-
-
 def ford_fulkerson(G, source, sink, search_func=dfs):
 	"""Find a maximum flow in a flow network from source to sink.
 
@@ -247,3 +229,10 @@ if __name__ == "__main__":
 	print(graph4)
 	print("Max flow values of " + str(ff_max_flow) + " and " + str(ek_max_flow) + " are "
 		  + ["not ", ""][ff_max_flow == ek_max_flow] + "equal")
+
+	# An augmenting path too long for a recursive search.
+	n = 5000
+	graph5 = FlowNetwork(n)
+	for i in range(n - 1):
+		graph5.insert_edge(i, i + 1, 10 + i % 7)
+	print(ford_fulkerson(graph5, 0, n - 1))  # 10
@@ -34,6 +34,7 @@
 # (u, v) is an edge of G, then at least one of u and v is in vertex cover.
 
 from adjacency_list_graph import AdjacencyListGraph
+from graph_views import CopyOnWriteGraph
 
 
 def approx_vertex_cover(G):
@@ -48,7 +49,7 @@ def approx_vertex_cover(G):
 	"""
 	C = set()  # the vertex cover starts out empty
 	card_V = G.get_card_V()
-	graph_copy = G.copy()
+	graph_copy = CopyOnWriteGraph(G)  # records deletions instead of copying G
 
 	# Iterate through the remaining edges.
 	for u in range(card_V):
@@ -65,13 +66,9 @@ def approx_vertex_cover(G):
 
 def delete_edges(G, u):
 	"""Delete every edge incident on u in an undirected graph G"""
-	# First delete all edges of the form (v, u).
-	for edge in G.get_adj_list(u):
-		v = edge.get_v()
-		G.delete_edge(v, u, False)  # don't delete (u, v) yet
-
-	# Then just delete the entire adjacency list for u.
-	G.get_adj_lists()[u].delete_all()
+	# Collect u's neighbors first, since deleting changes the adjacency list.
+	for v in [edge.get_v() for edge in G.get_adj_list(u)]:
+		G.delete_edge(u, v)  # deletes both (u, v) and (v, u)
 
 
 # Testing
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# dial_priority_queue.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+class DialPriorityQueue:
+
+    def __init__(self, get_key_func, max_span):
+        """Initialize a minimum priority queue for objects with nonnegative integer keys,
+        implemented with Dial's circular array of buckets.  Bucket i holds the objects whose
+        keys are congruent to i modulo max_span + 1.  The keys in the queue at any time must
+        differ by at most max_span.  That is so for Dijkstra's algorithm when max_span is the
+        largest edge weight, and for Prim's algorithm when max_span is the largest edge weight
+        and weights are nonnegative.  Each operation takes O(1) time, except extract_min
+        and minimum, which scan at most max_span + 1 buckets.
+
+        Arguments:
+        get_key_func -- required function that returns the key for the objects stored
+        max_span -- largest difference between keys in the queue at the same time
+        """
+        self.get_key = get_key_func
+        self.num_buckets = max_span + 1
+        # Each bucket is a list of (key, object) pairs.  An object whose key decreases
+        # is appended to its new bucket, and the stale pair in its old bucket is skipped
+        # once it is reached.
+        self.buckets = [[] for i in range(self.num_buckets)]
+        self.keys = {}  # keys[x] is the current key of object x in the queue
+        self.current = None  # no key in the queue is less than current
+        self.largest = None  # no key in the queue is greater than largest
+
+    def get_size(self):
+        """Return the number of objects in the priority queue."""
+        return len(self.keys)
+
+    def add(self, x, k):
+        """Put object x with key k into its bucket.  Error if the keys in the queue would
+        then span more than max_span."""
+        if len(self.keys) == 0 or (len(self.keys) == 1 and x in self.keys):
+            self.current = k  # k is the only key
+            self.largest = k
+        elif k < self.current:
+            if self.largest - k >= self.num_buckets:
+                # largest may belong to a key since decreased, so find the true largest.
+                self.largest = max(key for y, key in self.keys.items() if y != x)
+                if self.largest - k >= self.num_buckets:
+                    raise RuntimeError("Key " + str(k) + " exceeds the span of the bucket queue.")
+            self.current = k
+        elif k - self.current >= self.num_buckets:
+            raise RuntimeError("Key " + str(k) + " exceeds the span of the bucket queue.")
+        self.largest = max(self.largest, k)
+        self.keys[x] = k
+        self.buckets[k % self.num_buckets].append((k, x))
+
+    def find_min(self):
+        """Advance current to the smallest key in the queue, discarding stale pairs, and
+        return the bucket holding that key at its end.  Because the keys in the queue span
+        fewer values than there are buckets, every current pair in the bucket for current
+        has key current."""
+        if len(self.keys) == 0:
+            raise RuntimeError("Heap underflow.")
+        while True:
+            bucket = self.buckets[self.current % self.num_buckets]
+            while len(bucket) > 0:
+                k, x = bucket[-1]
+                if self.keys.get(x) == k:
+                    return bucket
+                bucket.pop()  # stale pair
+            self.current += 1
+
+    def minimum(self):
+        """Return the object with the minimum key."""
+        return self.find_min()[-1][1]
+
+    def extract_min(self):
+        """Return and delete the object with the minimum key."""
+        k, x = self.find_min().pop()
+        del self.keys[x]
+        return x
+
+    def decrease_key(self, x, k):
+        """Decrease the key of object x to value k.  Error if k is greater than x's current key."""
+        if k > self.keys[x]:
+            raise RuntimeError("Error in decrease_key: new key " + str(k)
+                               + " is greater than current key " + str(self.keys[x]))
+        self.add(x, k)
+
+    def insert(self, x):
+        """Insert x into the priority queue."""
+        self.add(x, self.get_key(x))
+
+
+# Testing
+if __name__ == "__main__":
+
+    import numpy as np
+
+    # Keys within a span of 10 of each other, as in Prim's algorithm with weights 0 to 10.
+    rng = np.random.default_rng(3)
+    keys = rng.integers(0, 11, size=20).tolist()
+    pq1 = DialPriorityQueue(lambda i: keys[i], 10)
+    for i in range(len(keys)):
+        pq1.insert(i)
+    for i in range(0, 20, 3):
+        keys[i] = max(keys[i] - 4, 0)
+        pq1.decrease_key(i, keys[i])
+    extracted_keys = []
+    while pq1.get_size() > 0:
+        extracted_keys.append(keys[pq1.extract_min()])
+    print(extracted_keys)
+    print(extracted_keys == sorted(extracted_keys))
+
+    # Keys growing as in Dijkstra's algorithm, each inserted within 10 of the last extracted.
+    pq2 = DialPriorityQueue(lambda i: keys[i], 10)
+    keys = [0]
+    pq2.insert(0)
+    extracted_keys = []
+    while len(keys) < 200 or pq2.get_size() > 0:
+        extracted_keys.append(keys[pq2.extract_min()])
+        for j in range(2):
+            if len(keys) < 200:
+                keys.append(extracted_keys[-1] + int(rng.integers(0, 11)))
+                pq2.insert(len(keys) - 1)
+    print(extracted_keys == sorted(extracted_keys), len(extracted_keys))
+
+    try:
+        pq2.extract_min()
+    except RuntimeError as e:
+        print(e)
+
+    # A key below current must stay within the span of the keys already queued.
+    keys = [5, 15, 4, 6]
+    pq3 = DialPriorityQueue(lambda i: keys[i], 10)
+    pq3.insert(0)
+    pq3.insert(1)
+    try:
+        pq3.insert(2)  # 15 - 4 > 10
+    except RuntimeError as e:
+        print(e)
+    pq3.decrease_key(1, 7)  # the queued keys are now 5 and 7
+    keys[1] = 7
+    pq3.insert(2)
+    print([keys[pq3.extract_min()] for i in range(pq3.get_size())])  # [4, 5, 7]
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# radix_heap_priority_queue.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+class RadixHeapPriorityQueue:
+
+    def __init__(self, get_key_func):
+        """Initialize a monotone minimum priority queue for objects with nonnegative integer
+        keys, implemented with a radix heap.  No key inserted may be less than the last
+        key extracted, as in Dijkstra's algorithm, but not in Prim's algorithm.  Bucket 0
+        holds the objects whose keys equal last, the last key extracted, and bucket i > 0
+        holds those whose keys first differ from last in bit i - 1, counting from bit 0.
+        An object moves only to lower-numbered buckets, so that each object moves at most
+        about log2 of the largest key times.
+
+        Argument:
+        get_key_func -- required function that returns the key for the objects stored
+        """
+        self.get_key = get_key_func
+        # Each bucket is a list of (key, object) pairs.  An object whose key decreases
+        # is appended to its new bucket, and the stale pair in its old bucket is skipped
+        # once it is reached.
+        self.buckets = [[]]
+        self.keys = {}  # keys[x] is the current key of object x in the queue
+        self.last = 0
+
+    def get_size(self):
+        """Return the number of objects in the priority queue."""
+        return len(self.keys)
+
+    def add(self, x, k):
+        """Put object x with key k into its bucket."""
+        if k < self.last:
+            raise RuntimeError("Key " + str(k) + " is less than the last key extracted, " + str(self.last) + ".")
+        self.keys[x] = k
+        i = (k ^ self.last).bit_length()
+        while len(self.buckets) <= i:
+            self.buckets.append([])
+        self.buckets[i].append((k, x))
+
+    def find_min(self):
+        """Refill bucket 0 if it has no current pairs, and return it with a current pair
+        at its end."""
+        if len(self.keys) == 0:
+            raise RuntimeError("Heap underflow.")
+        bucket = self.buckets[0]
+        while len(bucket) > 0 and self.keys.get(bucket[-1][1]) != bucket[-1][0]:
+            bucket.pop()  # stale pair
+        if len(bucket) > 0:
+            return bucket
+        # Find the first bucket with a current pair, make its smallest key the new last,
+        # and redistribute its pairs, which all go to lower-numbered buckets.
+        i = 1
+        while True:
+            current = [(k, x) for k, x in self.buckets[i] if self.keys.get(x) == k]
+            self.buckets[i] = []
+            if len(current) > 0:
+                break
+            i += 1
+        self.last = min(k for k, x in current)
+        for k, x in current:
+            self.buckets[(k ^ self.last).bit_length()].append((k, x))
+        return self.buckets[0]
+
+    def minimum(self):
+        """Return the object with the minimum key, without changing the buckets, so that
+        keys may still decrease to the last key extracted."""
+        if len(self.keys) == 0:
+            raise RuntimeError("Heap underflow.")
+        for bucket in self.buckets:
+            current = [(k, x) for k, x in bucket if self.keys.get(x) == k]
+            if len(current) > 0:
+                return min(current, key=lambda pair: pair[0])[1]
+
+    def extract_min(self):
+        """Return and delete the object with the minimum key."""
+        k, x = self.find_min().pop()
+        del self.keys[x]
+        return x
+
+    def decrease_key(self, x, k):
+        """Decrease the key of object x to value k.  Error if k is greater than x's current key."""
+        if k > self.keys[x]:
+            raise RuntimeError("Error in decrease_key: new key " + str(k)
+                               + " is greater than current key " + str(self.keys[x]))
+        self.add(x, k)
+
+    def insert(self, x):
+        """Insert x into the priority queue."""
+        self.add(x, self.get_key(x))
+
+
+# Testing
+if __name__ == "__main__":
+
+    import numpy as np
+
+    # Keys growing as in Dijkstra's algorithm, with some decreased.
+    rng = np.random.default_rng(4)
+    keys = [0]
+    pq1 = RadixHeapPriorityQueue(lambda i: keys[i])
+    pq1.insert(0)
+    extracted_keys = []
+    while len(keys) < 300 or pq1.get_size() > 0:
+        extracted_keys.append(keys[pq1.extract_min()])
+        for j in range(2):
+            if len(keys) < 300:
+                keys.append(extracted_keys[-1] + int(rng.integers(0, 1000)))
+                pq1.insert(len(keys) - 1)
+        if len(keys) > 3 and pq1.get_size() > 0:
+            i = pq1.minimum()
+            if keys[i] > extracted_keys[-1]:
+                keys[i] -= 1
+                pq1.decrease_key(i, keys[i])
+    print(extracted_keys == sorted(extracted_keys), len(extracted_keys))
+
+    # Keys may not go below the last key extracted.
+    try:
+        keys.append(0)
+        pq1.insert(len(keys) - 1)
+    except RuntimeError as e:
+        print(e)
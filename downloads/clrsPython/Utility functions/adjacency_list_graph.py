@@ -30,22 +30,86 @@
 #                                                                       #
 #########################################################################
 
+import numpy as np
 from dll_sentinel import DLLSentinel
 from adjacency_matrix_graph import AdjacencyMatrixGraph
 
 
+def validate_edge_arrays(card_V, u, v, directed, weights=None):
+	"""Check arrays of edge endpoints in one vectorized pass.  Raise a RuntimeError on
+	arrays of different lengths, or on the first out-of-range vertex, self-loop in an
+	undirected graph, or repeated edge.
+
+	Arguments:
+	card_V -- number of vertices
+	u, v -- integer numpy arrays, so that the ith edge is (u[i], v[i])
+	directed -- boolean indicating whether the graph is directed
+	weights -- optional sequence of edge weights, one per edge
+	"""
+	if len(u) != len(v):
+		raise RuntimeError("Edge endpoint arrays have different lengths.")
+	if weights is not None and len(weights) != len(u):
+		raise RuntimeError("Got " + str(len(weights)) + " weights for " + str(len(u)) + " edges.")
+	if len(u) == 0:
+		return
+	bad = np.flatnonzero((u < 0) | (u >= card_V) | (v < 0) | (v >= card_V))
+	if len(bad) > 0:
+		i = bad[0]
+		raise RuntimeError("Edge (" + str(u[i]) + ", " + str(v[i]) + ") has a vertex out of range.")
+
+	# An undirected graph cannot have self-loops.
+	if not directed:
+		loops = np.flatnonzero(u == v)
+		if len(loops) > 0:
+			i = loops[0]
+			raise RuntimeError("Cannot insert self-loop (" + str(u[i]) + ", " + str(v[i]) + ") into undirected graph")
+
+	# Cannot insert multiple edges between two vertices.  In an undirected graph,
+	# (u, v) and (v, u) are the same edge.
+	if directed:
+		keys = u * card_V + v
+	else:
+		keys = np.minimum(u, v) * card_V + np.maximum(u, v)
+	order = np.argsort(keys, kind="stable")
+	repeats = np.flatnonzero(keys[order][1:] == keys[order][:-1])
+	if len(repeats) > 0:
+		i = order[repeats[0] + 1]
+		raise RuntimeError("An edge (" + str(u[i]) + ", " + str(v[i]) + ") already exists.")
+
+
+class Unweighted:
+	"""Type of UNWEIGHTED, the weight stored in an edge of an unweighted graph."""
+	__slots__ = ()
+
+	def __repr__(self):
+		return "UNWEIGHTED"
+
+	def __reduce__(self):
+		"""Pickle and copy as a reference to the module's UNWEIGHTED, so that the copy is
+		still UNWEIGHTED, as the is comparisons require."""
+		return "UNWEIGHTED"
+
+
+UNWEIGHTED = Unweighted()
+
+
 class Edge:
+	# Slots instead of an instance dictionary keep each edge small.
+	__slots__ = ("v", "weight", "graph")
 
-	def __init__(self, v, weight=None):
+	def __init__(self, v, weight=None, graph=None):
 		"""Initialize an edge to add to the adjacency list of another vertex.
 
 		Arguments:
 		v -- the other vertex that the edge is incident on
-		weight -- optional parameter for weighted graphs
+		weight -- optional parameter for weighted graphs; an edge without a weight
+		has weight UNWEIGHTED
+		graph -- optional AdjacencyListGraph holding this edge, whose version changes
+		when the weight is set
 		"""
 		self.v = v
-		if weight is not None:
-			self.weight = weight
+		self.weight = UNWEIGHTED if weight is None else weight
+		self.graph = graph
 
 	def get_v(self):
 		"""Return the vertex index."""
@@ -56,8 +120,10 @@ class Edge:
 		return self.weight
 
 	def set_weight(self, weight):
-		"""Set the weight of this edge."""
+		"""Set the weight of this edge, changing the version of the graph holding it."""
 		self.weight = weight
+		if self.graph is not None:
+			self.graph.mutations += 1
 
 	def __str__(self):
 		"""String version of the vertex with optional weight in parentheses."""
@@ -66,15 +132,14 @@ class Edge:
 	def strmap(self, mapping_func):
 		"""String version of the vertex with optional weight in parentheses.
 		Vertex numbers are mapped according to a mapping function."""
-		string = str(mapping_func(self.v))
-		if hasattr(self, "weight"):
-			string += " (" + str(self.weight) + ")"
-		return string
+		if self.weight is UNWEIGHTED:
+			return str(mapping_func(self.v))
+		return str(mapping_func(self.v)) + " (" + str(self.weight) + ")"
 
 
 class AdjacencyListGraph:
 
-	def __init__(self, card_V, directed=True, weighted=False):
+	def __init__(self, card_V, directed=True, weighted=False, indexed=False):
 		"""Initialize a graph implemented by an adjacency list. Vertices are
 		numbered from 0, so that adj_list[i] corresponds to adjacency list of vertex i.
 
@@ -82,15 +147,49 @@ class AdjacencyListGraph:
 		card_V -- number of vertices in this graph
 		directed -- boolean indicating whether the graph is directed
 		weighted -- boolean indicating whether edges are weighted
+		indexed -- boolean indicating whether each adjacency list also keeps a hash index
+		from vertices to edges, so that find_edge, has_edge, and delete_edge take
+		expected O(1) time instead of time proportional to the degree
 		"""
 		self.directed = directed
 		self.weighted = weighted
+		self.indexed = indexed
 		self.adj_lists = [None] * card_V
 		for i in range(card_V):
 			# Each adjacency list is implemented as a linked list.
-			self.adj_lists[i] = DLLSentinel(get_key_func=Edge.get_v)  # will be a list of Edge objects
+			self.adj_lists[i] = DLLSentinel(Edge.get_v, indexed)  # will be a list of Edge objects
 		self.card_V = card_V
 		self.card_E = 0
+		self.mutations = 0  # number of edge insertions, deletions, and weight changes
+
+	@staticmethod
+	def from_edge_arrays(card_V, u, v, weights=None, directed=True, indexed=False):
+		"""Return a graph built from arrays of edges.  The ith edge is (u[i], v[i]) with
+		weight weights[i].  Duplicate edges and self-loops are detected in one vectorized
+		pass, rather than by searching an adjacency list upon each insertion.
+
+		Arguments:
+		card_V -- number of vertices
+		u, v -- sequences of vertex indices
+		weights -- optional sequence of edge weights; None for an unweighted graph
+		directed -- boolean indicating whether the graph is directed
+		indexed -- boolean indicating whether the adjacency lists keep a hash index
+		"""
+		u = np.asarray(u, dtype=np.int64)
+		v = np.asarray(v, dtype=np.int64)
+		validate_edge_arrays(card_V, u, v, directed, weights)
+
+		G = AdjacencyListGraph(card_V, directed, weights is not None, indexed)
+		u = u.tolist()
+		v = v.tolist()
+		weights = [None] * len(u) if weights is None else np.asarray(weights).tolist()
+		adj_lists = G.adj_lists
+		for i in range(len(u)):
+			adj_lists[u[i]].append(Edge(v[i], weights[i], G))
+			if not directed:
+				adj_lists[v[i]].append(Edge(u[i], weights[i], G))
+		G.card_E = len(u)
+		return G
 
 	def get_card_V(self):
 		"""Return the number of vertices in this graph."""
@@ -108,6 +207,11 @@ class AdjacencyListGraph:
 		"""Return an iterator for the adjacency list of vertex u."""
 		return self.adj_lists[u].iterator()
 
+	def get_version(self):
+		"""Return a version stamp that changes whenever an edge of this graph is inserted,
+		deleted, or reweighted, whether through set_weight of this graph or of the Edge."""
+		return self.mutations
+
 	def is_directed(self):
 		"""Return a boolean indicating whether this graph is directed."""
 		return self.directed
@@ -138,15 +242,16 @@ class AdjacencyListGraph:
 		# Cannot insert multiple edges between two vertices.
 		if self.has_edge(u, v):
 			raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
-		self.adj_lists[u].append(Edge(v, weight))
+		self.adj_lists[u].append(Edge(v, weight, self))
 		self.card_E += 1
+		self.mutations += 1
 
 		# If this graph is undirected, insert an edge from v to u.
 		if not self.directed:
 			# Cannot insert multiple edges between two vertices.
 			if self.has_edge(v, u):
 				raise RuntimeError("An edge (" + str(v) + ", " + str(u) + ") already exists.")
-			self.adj_lists[v].append(Edge(u, weight))
+			self.adj_lists[v].append(Edge(u, weight, self))
 
 	def find_edge(self, u, v):
 		"""Return the edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
@@ -160,6 +265,16 @@ class AdjacencyListGraph:
 		"""Return True if edge (u, v) is in this graph, False otherwise."""
 		return self.find_edge(u, v) is not None
 
+	def set_weight(self, u, v, weight):
+		"""Set the weight of edge (u, v), in both directions if this graph is undirected.
+		Error if the edge does not exist."""
+		edge = self.find_edge(u, v)
+		if edge is None:
+			raise RuntimeError("No edge (" + str(u) + ", " + str(v) + ") exists.")
+		edge.set_weight(weight)  # changes the version
+		if not self.directed:
+			self.find_edge(v, u).set_weight(weight)
+
 	def delete_edge(self, u, v, delete_undirected=True):
 		"""Delete edge (u, v) if it exists.  No error if it does not exist.
 			Delete both directions if the graph is undirected and delete_undirected is True."""
@@ -167,20 +282,37 @@ class AdjacencyListGraph:
 		if edge is not None:
 			self.adj_lists[u].delete(edge)
 			self.card_E -= 1
+			self.mutations += 1
 
 		if not self.directed and delete_undirected:
 			edge = self.adj_lists[v].search(u)
 			if edge is not None:
 				self.adj_lists[v].delete(edge)
+				self.mutations += 1
 
 	def copy(self):
 		"""Return a copy of this graph."""
-		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.indexed)
 		copy.card_E = self.card_E
 		for u in range(self.card_V):
-			copy.adj_lists[u] = self.adj_lists[u].copy()
+			# New edges, so that setting a weight in one graph leaves the other alone.
+			for edge in self.get_adj_list(u):
+				copy.adj_lists[u].append(Edge(edge.v, edge.weight, copy))
 		return copy
 
+	def save(self, filename):
+		"""Write this graph to a binary file in the format of CSRGraph.save."""
+		from csr_graph import CSRGraph  # avoid a circular import
+		CSRGraph.from_graph(self).save(filename)
+
+	@staticmethod
+	def load(filename, indexed=False):
+		"""Return the graph stored in a binary file written by save.  The file is mapped
+		into memory and the adjacency lists are built from it in bulk.  To use the
+		mapped arrays directly, without building lists, call CSRGraph.load instead."""
+		from csr_graph import CSRGraph  # avoid a circular import
+		return CSRGraph.load(filename).adjacency_list_graph(indexed)
+
 	def get_edge_list(self):
 		"""Return a Python list containing the edges of this graph."""
 		edge_list = []
@@ -194,7 +326,7 @@ class AdjacencyListGraph:
 
 	def transpose(self):
 		"""Return the transpose of this graph."""
-		xpose = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		xpose = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.indexed)
 		for u in range(self.card_V):
 			adj_list = self.get_adj_list(u)
 			for edge in adj_list:
@@ -227,13 +359,11 @@ class AdjacencyListGraph:
 		if mapping_func is None:
 			mapping_func = lambda i: i
 
-		result = ""
+		lines = []
 		for i in range(self.card_V):
-			result += str(mapping_func(i)) + ": "
-			for edge in self.get_adj_list(i):
-				result += edge.strmap(mapping_func) + " "
-			result += "\n"
-		return result
+			edges = "".join(edge.strmap(mapping_func) + " " for edge in self.get_adj_list(i))
+			lines.append(str(mapping_func(i)) + ": " + edges + "\n")
+		return "".join(lines)
 
 
 # Testing
@@ -311,3 +441,30 @@ if __name__ == "__main__":
 	# Test transpose.
 	xpose1 = graph1.transpose()
 	print(xpose1)
+
+	# Bulk loading from edge arrays, with hash-indexed adjacency lists.
+	card_V = 1000
+	u = np.random.randint(card_V, size=5000)
+	v = np.random.randint(card_V, size=5000)
+	keys = np.unique(u * card_V + v)
+	u, v = keys // card_V, keys % card_V
+	graph4 = AdjacencyListGraph.from_edge_arrays(card_V, u, v, u + v, True, True)
+	print(graph4.get_card_E() == len(u))
+	print(all(graph4.find_edge(u[i], v[i]).get_weight() == u[i] + v[i] for i in range(len(u))))
+	graph4.delete_edge(u[0], v[0])
+	print(graph4.has_edge(u[0], v[0]), graph4.get_card_E() == len(u) - 1)
+	try:
+		AdjacencyListGraph.from_edge_arrays(4, [0, 1, 2], [1, 2, 1], None, False)
+	except RuntimeError as e:
+		print(e)
+	for weights in [[5, 6], [5, 6, 7, 8]]:
+		try:
+			AdjacencyListGraph.from_edge_arrays(4, [0, 1, 2], [1, 2, 3], weights)
+		except RuntimeError as e:
+			print(e)
+
+	# Unweighted edges stay unweighted when pickled or copied.
+	import copy
+	import pickle
+	for edge in [pickle.loads(pickle.dumps(Edge(3))), copy.copy(Edge(3)), copy.deepcopy(Edge(3))]:
+		print(edge, edge.get_weight() is UNWEIGHTED)
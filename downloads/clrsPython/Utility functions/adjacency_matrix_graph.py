@@ -33,18 +33,60 @@
 import numpy as np
 
 
+def pack_bits(matrix):
+	"""Pack each row of a boolean matrix into uint64 words, one bit per entry.
+	Entry j of a row is bit j % 64 of word j // 64."""
+	matrix = np.asarray(matrix, dtype=bool)
+	card_words = (matrix.shape[-1] + 63) // 64
+	packed = np.packbits(matrix, axis=-1, bitorder='little')
+	padding = [(0, 0)] * (packed.ndim - 1) + [(0, 8 * card_words - packed.shape[-1])]
+	packed = np.pad(packed, padding)
+	return packed.view('<u8').astype(np.uint64)
+
+
+def unpack_bits(words, n):
+	"""Unpack rows of uint64 words, as made by pack_bits, into a boolean matrix with n columns."""
+	words = np.ascontiguousarray(words, dtype='<u8')
+	bits = np.unpackbits(words.view(np.uint8), axis=-1, bitorder='little')
+	return bits[..., :n].astype(bool)
+
+
+def nonzero_bits(words, n, block_entries=1 << 22):
+	"""Return arrays u and v of the positions of the 1 bits in rows of uint64 words, as made
+	by pack_bits, so that bit v of row u is 1 for each pair.  Only about block_entries
+	bits are unpacked at a time, so that the memory needed beyond the result is bounded
+	however many rows there are."""
+	block_rows = max(1, block_entries // max(n, 1))
+	u_blocks = [np.zeros(0, dtype=np.int64)]
+	v_blocks = [np.zeros(0, dtype=np.int64)]
+	for start in range(0, len(words), block_rows):
+		u, v = np.nonzero(unpack_bits(words[start:start + block_rows], n))
+		u_blocks.append(u + start)
+		v_blocks.append(v)
+	return np.concatenate(u_blocks), np.concatenate(v_blocks)
+
+
 class AdjacencyMatrixGraph:
 
-	def __init__(self, card_V, directed=True, weighted=False):
+	def __init__(self, card_V, directed=True, weighted=False, packed=False):
 		"""Initialize a graph implemented by an adjacency matrix. 
 
 		Arguments:
 		card_V -- number of vertices in this graph
 		directed -- boolean whether or not graph is directed
 		weighted -- boolean whether or not edges are weighted
+		packed -- boolean whether or not an unweighted graph stores one bit per entry,
+		with each row packed into uint64 words, instead of one integer per entry
 		"""
+		if packed and weighted:
+			raise RuntimeError("Only unweighted graphs can be bit-packed.")
 		self.directed = directed
-		if weighted:
+		self.packed = packed
+		if packed:
+			# Bit v % 64 of word v // 64 in row u is 1 if and only if edge (u, v) is present.
+			self.adj_matrix = np.zeros(shape=(card_V, (card_V + 63) // 64), dtype=np.uint64)
+			self.no_edge = 0
+		elif weighted:
 			# For weighted graphs, adj_matrix will default to infinity for no edge.
 			self.adj_matrix = np.ndarray((card_V, card_V))
 			self.no_edge = float('inf')
@@ -56,6 +98,40 @@ class AdjacencyMatrixGraph:
 		self.card_V = card_V
 		self.weighted = weighted
 		self.card_E = 0
+		self.mutations = 0  # number of changes to the adjacency matrix
+
+	@staticmethod
+	def from_edge_arrays(card_V, u, v, weights=None, directed=True, packed=False):
+		"""Return a graph built from arrays of edges.  The ith edge is (u[i], v[i]) with
+		weight weights[i].  Duplicate edges and self-loops are detected in one vectorized
+		pass, and all edges are stored with one indexed assignment.
+
+		Arguments:
+		card_V -- number of vertices
+		u, v -- sequences of vertex indices
+		weights -- optional sequence of edge weights; None for an unweighted graph
+		directed -- boolean indicating whether the graph is directed
+		packed -- boolean indicating whether an unweighted graph is bit-packed
+		"""
+		from adjacency_list_graph import validate_edge_arrays  # avoid a circular import
+
+		u = np.asarray(u, dtype=np.int64)
+		v = np.asarray(v, dtype=np.int64)
+		validate_edge_arrays(card_V, u, v, directed, weights)
+
+		G = AdjacencyMatrixGraph(card_V, directed, weights is not None, packed)
+		G.card_E = len(u)  # before an undirected graph's edges are mirrored
+		if packed:
+			if not directed:
+				u, v = np.concatenate((u, v)), np.concatenate((v, u))
+			bits = np.left_shift(np.uint64(1), (v & 63).astype(np.uint64))
+			np.bitwise_or.at(G.adj_matrix, (u, v >> 6), bits)
+		else:
+			values = 1 if weights is None else np.asarray(weights)
+			G.adj_matrix[u, v] = values
+			if not directed:
+				G.adj_matrix[v, u] = values
+		return G
 
 	def get_card_V(self):
 		"""Return the number of vertices in this graph."""
@@ -66,9 +142,48 @@ class AdjacencyMatrixGraph:
 		return self.card_E
 
 	def get_adj_matrix(self):
-		"""Return the adjacency matrix for this graph."""
+		"""Return the adjacency matrix for this graph.  If the graph is bit-packed, return
+		a new unpacked matrix of 0s and 1s."""
+		if self.packed:
+			matrix = np.zeros((self.card_V, self.card_V), dtype=int)
+			u, v = nonzero_bits(self.adj_matrix, self.card_V)
+			matrix[u, v] = 1
+			return matrix
 		return self.adj_matrix
 
+	def is_packed(self):
+		"""Return a boolean indicating whether this graph is bit-packed."""
+		return self.packed
+
+	def get_row(self, u):
+		"""Return row u of a bit-packed graph, as a numpy array of uint64 words.  The array
+		is a view, so that changing it changes the graph."""
+		if not self.packed:
+			raise RuntimeError("Row operations require a bit-packed graph.")
+		return self.adj_matrix[u]
+
+	def row_or(self, u, row):
+		"""Bitwise OR a packed row, such as get_row(w), into row u of a bit-packed graph,
+		processing 64 vertices per word.  Adds edges without updating the edge count, so
+		that reachability code can use the matrix as scratch space."""
+		np.bitwise_or(self.get_row(u), row, out=self.adj_matrix[u])
+		self.mutations += 1
+
+	def row_and(self, u, row):
+		"""Bitwise AND a packed row into row u of a bit-packed graph, processing 64 vertices
+		per word.  Removes edges without updating the edge count."""
+		np.bitwise_and(self.get_row(u), row, out=self.adj_matrix[u])
+		self.mutations += 1
+
+	def get_row_vertices(self, u):
+		"""Return a numpy array of the vertices v such that edge (u, v) is in a bit-packed graph."""
+		return np.flatnonzero(unpack_bits(self.get_row(u), self.card_V))
+
+	def get_version(self):
+		"""Return a version stamp that changes whenever this graph's edges change through
+		its methods.  Writing directly into the adjacency matrix does not change it."""
+		return self.mutations
+
 	def is_directed(self):
 		"""Return a boolean indicating whether this graph is directed."""
 		return self.directed
@@ -100,51 +215,99 @@ class AdjacencyMatrixGraph:
 		# Cannot insert multiple edges between two vertices.
 		if self.has_edge(u, v):
 			raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
-		self.adj_matrix[u, v] = weight
+		self.set_entry(u, v, weight)
 		self.card_E += 1
 
 		# If undirected, insert edge from v to u.
 		if not self.directed:
 			if self.has_edge(v, u):
 				raise RuntimeError("An edge (" + str(v) + ", " + str(u) + ") already exists.")
-			self.adj_matrix[v, u] = weight
+			self.set_entry(v, u, weight)
+
+	def set_entry(self, u, v, value):
+		"""Set entry (u, v) of the adjacency matrix.  In a bit-packed graph, any value other
+		than no_edge sets the bit."""
+		self.mutations += 1
+		if self.packed:
+			v = int(v)
+			bit = np.uint64(1 << (v & 63))
+			if value != self.no_edge:
+				self.adj_matrix[u, v >> 6] |= bit
+			else:
+				self.adj_matrix[u, v >> 6] &= ~bit
+		else:
+			self.adj_matrix[u, v] = value
 
 	def has_edge(self, u, v):
 		"""Return True if edge (u, v) is in this graph, False otherwise."""
+		if self.packed:
+			v = int(v)
+			return (int(self.adj_matrix[u, v >> 6]) >> (v & 63)) & 1 == 1
 		return self.adj_matrix[u, v] != self.no_edge
 
 	def delete_edge(self, u, v, delete_undirected=True):
 		"""Delete edge (u, v) if it exists.  No error if it does not exist.
 			Delete both directions if the graph is undirected and delete_undirected is True."""
-		if self.adj_matrix[u, v] != self.no_edge:
-			self.adj_matrix[u, v] = self.no_edge
+		if self.has_edge(u, v):
+			self.set_entry(u, v, self.no_edge)
 			self.card_E -= 1
 		if not self.directed and delete_undirected:
-			self.adj_matrix[v, u] = self.no_edge
+			self.set_entry(v, u, self.no_edge)
 
 	def copy(self):
 		"""Return a copy of this graph."""
-		c = AdjacencyMatrixGraph(self.card_V, self.directed, self.weighted)
+		c = AdjacencyMatrixGraph(self.card_V, self.directed, self.weighted, self.packed)
 		c.adj_matrix = self.adj_matrix.copy()  # deep copy
 		c.card_E = self.card_E
 		return c
 
+	def save(self, filename):
+		"""Write this graph to a binary file in the format of CSRGraph.save."""
+		from csr_graph import CSRGraph  # avoid a circular import
+		u, v = self.get_edge_arrays()
+		weights = self.adj_matrix[u, v] if self.weighted else None
+		CSRGraph.from_edge_arrays(self.card_V, u, v, weights, self.directed).save(filename)
+
+	@staticmethod
+	def load(filename, packed=False):
+		"""Return the graph stored in a binary file written by save."""
+		from csr_graph import CSRGraph  # avoid a circular import
+		return CSRGraph.load(filename).adjacency_matrix(packed)
+
+	def get_edge_arrays(self):
+		"""Return arrays u and v so that the edges of this graph are (u[i], v[i]), in row
+		order, with each undirected edge appearing once, with u < v.  A bit-packed matrix
+		is unpacked a block of rows at a time."""
+		if self.packed:
+			u, v = nonzero_bits(self.adj_matrix, self.card_V)
+		else:
+			u, v = np.nonzero(self.adj_matrix != self.no_edge)
+		if not self.directed:
+			keep = u < v
+			u = u[keep]
+			v = v[keep]
+		return u, v
+
 	def get_edge_list(self):
 		"""Return a Python list containing the edges of this graph."""
-		edge_list = []
-		for u in range(self.card_V):
-			if self.directed:
-				lowest_v = 0
-			else:
-				lowest_v = u + 1
-			for v in range(lowest_v, self.card_V):
-				if self.adj_matrix[u, v] != self.no_edge:
-					edge_list.append((u, v))
-		return edge_list
+		u, v = self.get_edge_arrays()
+		return list(zip(u.tolist(), v.tolist()))
 
 	def __str__(self):
-		"""Return the adjacency matrix."""
-		return str(self.adj_matrix)
+		"""Return the adjacency matrix.  A large bit-packed matrix is summarized as numpy
+		would summarize it, unpacking only the rows shown."""
+		n = self.card_V
+		edgeitems = np.get_printoptions()["edgeitems"]
+		if not self.packed or n * n <= np.get_printoptions()["threshold"] or n <= 2 * edgeitems:
+			return str(self.get_adj_matrix())
+
+		def row_string(u):
+			row = unpack_bits(self.adj_matrix[u], n).astype(int).tolist()
+			return "[" + " ".join(map(str, row[:edgeitems])) + " ... " + " ".join(map(str, row[-edgeitems:])) + "]"
+
+		rows = [row_string(u) for u in range(edgeitems)] + ["..."] + \
+			[row_string(u) for u in range(n - edgeitems, n)]
+		return "[" + "\n ".join(rows) + "]"
 
 
 # Testing
@@ -218,3 +381,60 @@ if __name__ == "__main__":
 
 	# Test get_edge_list.
 	print(graph3.get_edge_list())
+
+	# Bulk loading from edge arrays.
+	graph4 = AdjacencyMatrixGraph.from_edge_arrays(5, [0, 1, 3], [1, 2, 4], [7, 8, 9], False)
+	print(graph4)
+	print(graph4.get_edge_list(), graph4.get_card_E())
+
+	# Bit-packed unweighted graphs should behave like unpacked ones.
+	for directed in [True, False]:
+		unpacked = AdjacencyMatrixGraph(150, directed)
+		packed = AdjacencyMatrixGraph(150, directed, packed=True)
+		for u, v in np.random.randint(150, size=(400, 2)):
+			for graph in [unpacked, packed]:
+				try:
+					graph.insert_edge(u, v)
+				except RuntimeError:
+					pass
+		for u, v in np.random.randint(150, size=(100, 2)):
+			unpacked.delete_edge(u, v)
+			packed.delete_edge(u, v)
+		print(packed.get_edge_list() == unpacked.get_edge_list(), packed.get_card_E() == unpacked.get_card_E(),
+			  np.array_equal(packed.get_adj_matrix(), unpacked.get_adj_matrix()), packed.adj_matrix.nbytes)
+		print(str(packed) == str(unpacked),
+			  all(np.array_equal(a, b) for a, b in zip(nonzero_bits(packed.adj_matrix, 150, 1000),
+													  np.nonzero(unpacked.get_adj_matrix()))))
+	# Bulk-loaded bit-packed graphs count each edge once, like unpacked ones.
+	for directed in [True, False]:
+		counts = []
+		for packed in [False, True]:
+			graph = AdjacencyMatrixGraph.from_edge_arrays(5, [0, 1, 3], [1, 2, 4], directed=directed, packed=packed)
+			graph.delete_edge(1, 2)
+			counts.append(graph.get_card_E())
+		print(counts)  # [2, 2]
+	graph5 = AdjacencyMatrixGraph.from_edge_arrays(70, [0, 1, 65], [65, 69, 3], packed=True)
+	graph5.row_or(0, graph5.get_row(65))  # vertex 0 now reaches whatever 65 reaches
+	print(graph5.get_row_vertices(0), graph5.has_edge(0, 3), graph5.has_edge(3, 0))
+	try:
+		AdjacencyMatrixGraph(10, True, True, True)
+	except RuntimeError as e:
+		print(e)
+
+	# Listing and saving the edges of a large bit-packed graph unpacks a block of rows at a time.
+	import os
+	import tempfile
+	import tracemalloc
+	n = 20000
+	u = np.random.randint(n, size=100000)
+	v = np.random.randint(n, size=100000)
+	keep = np.unique(u * n + v)
+	graph6 = AdjacencyMatrixGraph.from_edge_arrays(n, keep // n, keep % n, packed=True)
+	filename = os.path.join(tempfile.mkdtemp(), "graph6.bin")
+	tracemalloc.start()
+	edges = graph6.get_edge_list()
+	graph6.save(filename)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	print(len(edges) == len(keep), AdjacencyMatrixGraph.load(filename, packed=True).get_edge_list() == edges,
+		  "peak %.0f MB for a %.0f MB packed matrix" % (peak / 2**20, graph6.adj_matrix.nbytes / 2**20))
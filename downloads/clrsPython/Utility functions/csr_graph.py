@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# csr_graph.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+import struct
+import numpy as np
+from adjacency_list_graph import Edge, AdjacencyListGraph, validate_edge_arrays
+from adjacency_matrix_graph import AdjacencyMatrixGraph
+
+# Binary file format: a 64-byte header, then the offsets, targets, and (if weighted)
+# weights arrays, each stored as little-endian 8-byte values so that they can be mapped
+# into memory directly.  The header holds the magic string, flags (1 = directed,
+# 2 = weighted), card_V, the number of stored edges, and a weight type code.
+FILE_MAGIC = b"CLRSCSR1"
+FILE_HEADER = struct.Struct("<8sqqqq")
+FILE_HEADER_SIZE = 64
+WEIGHT_TYPES = {0: None, 1: np.dtype("<i8"), 2: np.dtype("<f8")}
+
+
+class CSRGraph:
+
+	def __init__(self, card_V, offsets, targets, weights=None, directed=True):
+		"""Initialize a graph stored in compressed sparse row (CSR) form.  The adjacency
+		list of vertex u is targets[offsets[u]:offsets[u+1]], and the weights of those
+		edges are weights[offsets[u]:offsets[u+1]].  An undirected graph stores each
+		edge in both directions.  A CSRGraph cannot be changed once it is built.
+
+		Arguments:
+		card_V -- number of vertices in this graph
+		offsets -- integer numpy array of length card_V + 1
+		targets -- integer numpy array of vertex indices
+		weights -- numpy array of edge weights, or None for an unweighted graph
+		directed -- boolean indicating whether the graph is directed
+		"""
+		if len(offsets) != card_V + 1:
+			raise RuntimeError("Offsets array must have card_V + 1 entries.")
+		if weights is not None and len(weights) != len(targets):
+			raise RuntimeError("Targets and weights arrays have different lengths.")
+		self.card_V = card_V
+		self.offsets = offsets
+		self.targets = targets
+		self.weights = weights
+		self.directed = directed
+		self.weighted = weights is not None
+		# Undirected edges are stored twice, once in each direction.
+		self.card_E = len(targets) if directed else len(targets) // 2
+
+	@staticmethod
+	def from_edge_arrays(card_V, u, v, weights=None, directed=True):
+		"""Return a CSRGraph built from arrays of edges.  The ith edge is (u[i], v[i])
+		with weight weights[i].  Within each adjacency list, edges appear in the order
+		given, just as if they had been inserted one at a time into an AdjacencyListGraph.
+
+		Arguments:
+		card_V -- number of vertices
+		u, v -- sequences of vertex indices
+		weights -- optional sequence of edge weights; None for an unweighted graph
+		directed -- boolean indicating whether the graph is directed
+		"""
+		u = np.asarray(u, dtype=np.int64)
+		v = np.asarray(v, dtype=np.int64)
+		validate_edge_arrays(card_V, u, v, directed, weights)
+		if weights is not None:
+			weights = np.asarray(weights)
+			if weights.dtype.kind not in "iuf":
+				weights = weights.astype(np.float64)
+
+		if directed:
+			sources, targets, arc_weights = u, v, weights
+		else:
+			# Interleave (u, v) and (v, u) so that each list keeps the insertion order.
+			sources = np.stack((u, v), axis=1).ravel()
+			targets = np.stack((v, u), axis=1).ravel()
+			arc_weights = None if weights is None else np.repeat(weights, 2)
+
+		order = np.argsort(sources, kind="stable")  # stable keeps the order within each list
+		offsets = np.zeros(card_V + 1, dtype=np.int64)
+		np.cumsum(np.bincount(sources, minlength=card_V), out=offsets[1:])
+		return CSRGraph(card_V, offsets, targets[order],
+						None if arc_weights is None else arc_weights[order], directed)
+
+	@staticmethod
+	def from_graph(G):
+		"""Return a CSRGraph with the same vertices and edges as graph G, which may be
+		any graph offering get_adj_list.  Adjacency lists keep their order."""
+		card_V = G.get_card_V()
+		weighted = G.is_weighted()
+		offsets = np.zeros(card_V + 1, dtype=np.int64)
+		targets = []
+		weights = []
+		for u in range(card_V):
+			for edge in G.get_adj_list(u):
+				targets.append(edge.get_v())
+				if weighted:
+					weights.append(edge.get_weight())
+			offsets[u + 1] = len(targets)
+		weights = np.array(weights) if weighted else None
+		if weights is not None and weights.dtype.kind not in "iuf":
+			weights = weights.astype(np.float64)
+		return CSRGraph(card_V, offsets, np.array(targets, dtype=np.int64), weights, G.is_directed())
+
+	def get_card_V(self):
+		"""Return the number of vertices in this graph."""
+		return self.card_V
+
+	def get_card_E(self):
+		"""Return the number of edges in this graph."""
+		return self.card_E
+
+	def get_offsets(self):
+		"""Return the array of adjacency-list offsets."""
+		return self.offsets
+
+	def get_targets(self):
+		"""Return the array of edge targets, grouped by adjacency list."""
+		return self.targets
+
+	def get_weights(self):
+		"""Return the array of edge weights, or None if this graph is unweighted."""
+		return self.weights
+
+	def get_degree(self, u):
+		"""Return the number of edges leaving vertex u."""
+		return int(self.offsets[u + 1] - self.offsets[u])
+
+	def get_neighbors(self, u):
+		"""Return a numpy view of the vertices adjacent to vertex u.  No Edge objects are made."""
+		return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+	def get_neighbor_weights(self, u):
+		"""Return a numpy view of the weights of the edges leaving vertex u, in the same
+		order as get_neighbors(u).  Error if this graph is unweighted."""
+		if not self.weighted:
+			raise RuntimeError("Graph is unweighted.")
+		return self.weights[self.offsets[u]:self.offsets[u + 1]]
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the adjacency list of vertex u.  Each edge is produced as
+		an Edge object, so that code written for AdjacencyListGraph runs unchanged."""
+		start = self.offsets[u]
+		end = self.offsets[u + 1]
+		if self.weighted:
+			for v, weight in zip(self.targets[start:end].tolist(), self.weights[start:end].tolist()):
+				yield Edge(v, weight)
+		else:
+			for v in self.targets[start:end].tolist():
+				yield Edge(v)
+
+	def get_edge_arrays(self):
+		"""Return arrays u, v, and weights so that the ith stored edge is (u[i], v[i]) with
+		weight weights[i].  Undirected edges appear in both directions.  weights is None
+		if this graph is unweighted."""
+		u = np.repeat(np.arange(self.card_V, dtype=np.int64), np.diff(self.offsets))
+		return u, self.targets, self.weights
+
+	def get_version(self):
+		"""Return a version stamp.  A CSRGraph never changes, so its version is always 0."""
+		return 0
+
+	def is_directed(self):
+		"""Return a boolean indicating whether this graph is directed."""
+		return self.directed
+
+	def is_weighted(self):
+		"""Return a boolean indicating whether this graph is weighted."""
+		return self.weighted
+
+	def find_edge(self, u, v):
+		"""Return an Edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
+		start = self.offsets[u]
+		found = np.flatnonzero(self.targets[start:self.offsets[u + 1]] == v)
+		if len(found) == 0:
+			return None
+		elif self.weighted:
+			return Edge(v, self.weights[start + found[0]].item())
+		else:
+			return Edge(v)
+
+	def has_edge(self, u, v):
+		"""Return True if edge (u, v) is in this graph, False otherwise."""
+		return self.find_edge(u, v) is not None
+
+	def copy(self):
+		"""Return a copy of this graph."""
+		return CSRGraph(self.card_V, self.offsets.copy(), self.targets.copy(),
+						None if self.weights is None else self.weights.copy(), self.directed)
+
+	def get_edge_list(self):
+		"""Return a Python list containing the edges of this graph."""
+		u, v, weights = self.get_edge_arrays()
+		if not self.directed:
+			keep = u < v
+			u = u[keep]
+			v = v[keep]
+		return list(zip(u.tolist(), v.tolist()))
+
+	def transpose(self):
+		"""Return the transpose of this graph, also as a CSRGraph."""
+		u, v, weights = self.get_edge_arrays()
+		order = np.argsort(v, kind="stable")
+		offsets = np.zeros(self.card_V + 1, dtype=np.int64)
+		np.cumsum(np.bincount(v, minlength=self.card_V), out=offsets[1:])
+		return CSRGraph(self.card_V, offsets, u[order],
+						None if weights is None else weights[order], self.directed)
+
+	def get_unique_edge_arrays(self):
+		"""Like get_edge_arrays, but each undirected edge (u, v) appears only once, with u < v."""
+		u, v, weights = self.get_edge_arrays()
+		if not self.directed:
+			keep = u < v
+			u = u[keep]
+			v = v[keep]
+			weights = None if weights is None else weights[keep]
+		return u, v, weights
+
+	def adjacency_list_graph(self, indexed=False):
+		"""Return the adjacency-list representation of this graph."""
+		u, v, weights = self.get_unique_edge_arrays()
+		return AdjacencyListGraph.from_edge_arrays(self.card_V, u, v, weights, self.directed, indexed)
+
+	def adjacency_matrix(self, packed=False):
+		"""Return the adjacency-matrix representation of this graph."""
+		u, v, weights = self.get_unique_edge_arrays()
+		return AdjacencyMatrixGraph.from_edge_arrays(self.card_V, u, v, weights, self.directed, packed)
+
+	def save(self, filename):
+		"""Write this graph to a binary file that load can map into memory."""
+		if self.weights is None:
+			weight_type = 0
+		elif self.weights.dtype.kind in "iu":
+			weight_type = 1
+		else:
+			weight_type = 2
+		flags = (1 if self.directed else 0) | (2 if self.weighted else 0)
+		header = FILE_HEADER.pack(FILE_MAGIC, flags, self.card_V, len(self.targets), weight_type)
+		with open(filename, "wb") as f:
+			f.write(header.ljust(FILE_HEADER_SIZE, b"\0"))
+			np.asarray(self.offsets, dtype="<i8").tofile(f)
+			np.asarray(self.targets, dtype="<i8").tofile(f)
+			if weight_type != 0:
+				np.asarray(self.weights, dtype=WEIGHT_TYPES[weight_type]).tofile(f)
+
+	@staticmethod
+	def load(filename, mmap=True):
+		"""Return the CSRGraph stored in a file written by save.  If mmap is True, the arrays
+		are read-only views of the file mapped into memory, so that opening the file takes
+		time independent of its size and every process that opens it shares the same pages.
+		If mmap is False, the arrays are read into memory."""
+		with open(filename, "rb") as f:
+			header = f.read(FILE_HEADER_SIZE)
+		if len(header) < FILE_HEADER_SIZE or header[:len(FILE_MAGIC)] != FILE_MAGIC:
+			raise RuntimeError("File " + str(filename) + " is not a graph file.")
+		magic, flags, card_V, card_arcs, weight_type = FILE_HEADER.unpack(header[:FILE_HEADER.size])
+		if weight_type not in WEIGHT_TYPES:
+			raise RuntimeError("Unknown weight type " + str(weight_type) + " in " + str(filename) + ".")
+
+		# Offsets, targets, and weights follow the header, in that order.
+		layout = [("<i8", card_V + 1), ("<i8", card_arcs)]
+		if weight_type != 0:
+			layout.append((WEIGHT_TYPES[weight_type], card_arcs))
+		arrays = []
+		position = FILE_HEADER_SIZE
+		for dtype, count in layout:
+			if count == 0:
+				arrays.append(np.zeros(0, dtype=dtype))  # cannot map an empty array
+			elif mmap:
+				arrays.append(np.memmap(filename, dtype=dtype, mode="r", offset=position, shape=(count,)))
+			else:
+				arrays.append(np.fromfile(filename, dtype=dtype, count=count, offset=position))
+			position += count * np.dtype(dtype).itemsize
+		weights = arrays[2] if weight_type != 0 else None
+		return CSRGraph(card_V, arrays[0], arrays[1], weights, flags & 1 == 1)
+
+	def __str__(self):
+		"""Return the adjacency lists formatted as a string."""
+		return self.strmap()
+
+	def strmap(self, mapping_func=None):
+		"""Return the adjacency lists formatted as a string, but mapping vertex numbers
+		by a mapping function.  If mapping_func is None, then do not map."""
+		if mapping_func is None:
+			mapping_func = lambda i: i
+
+		lines = []
+		for i in range(self.card_V):
+			edges = "".join(edge.strmap(mapping_func) + " " for edge in self.get_adj_list(i))
+			lines.append(str(mapping_func(i)) + ": " + edges + "\n")
+		return "".join(lines)
+
+
+# Testing
+if __name__ == "__main__":
+
+	from bfs import bfs
+	from dijkstra import dijkstra
+	from bellman_ford import bellman_ford
+	from mst import kruskal, prim, get_total_weight
+	from strongly_connected_components import strongly_connected_components
+	from generate_random_graph import generate_random_graph
+	from vertex_labels import VertexLabels
+
+	# Textbook example for Dijkstra's algorithm, built from edge arrays.
+	vertices = ['s', 't', 'x', 'y', 'z']
+	edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
+			('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
+	labels = VertexLabels(vertices)
+	graph1 = CSRGraph.from_edge_arrays(len(vertices), labels.get_ids(e[0] for e in edges),
+									   labels.get_ids(e[1] for e in edges), [e[2] for e in edges])
+	print(graph1.strmap(labels))
+	print(graph1.get_neighbors(labels.get_id('y')), graph1.get_neighbor_weights(labels.get_id('y')))
+	d, pi = dijkstra(graph1, labels.get_id('s'))
+	print(d)  # should be [0, 8, 9, 5, 7]
+
+	# The same algorithms should give the same answers on an AdjacencyListGraph and its CSR form.
+	card_V = 60
+	graph2 = generate_random_graph(card_V, 0.1, True, True, True, 0, 15)
+	csr2 = CSRGraph.from_graph(graph2)
+	print(str(csr2) == str(graph2))
+	print(csr2.get_card_E() == graph2.get_card_E())
+	print(bfs(csr2, 0) == bfs(graph2, 0))
+	print(dijkstra(csr2, 0)[0] == dijkstra(graph2, 0)[0])
+	print(bellman_ford(csr2, 0)[0] == bellman_ford(graph2, 0)[0])
+	print(strongly_connected_components(csr2) == strongly_connected_components(graph2))
+	print(str(csr2.transpose()) == str(graph2.transpose()))
+
+	# Undirected graphs for minimum spanning trees.
+	graph3 = generate_random_graph(card_V, 0.15, True, False, True, 2, 15)
+	csr3 = CSRGraph.from_graph(graph3)
+	u, v, weights = csr3.get_edge_arrays()
+	keep = u < v
+	csr4 = CSRGraph.from_edge_arrays(card_V, u[keep], v[keep], weights[keep], False)
+	print(csr3.get_edge_list() == graph3.get_edge_list(), csr4.get_card_E() == graph3.get_card_E())
+	print(get_total_weight(kruskal(csr3)) == get_total_weight(kruskal(graph3)))
+	print(get_total_weight(prim(csr4, 0)) == get_total_weight(prim(graph3, 0)))
+	print(csr3.has_edge(u[0], v[0]), csr3.find_edge(u[0], v[0]))
+	unweighted4 = CSRGraph.from_edge_arrays(card_V, u[keep], v[keep], None, False)
+	print(unweighted4.adjacency_matrix(packed=True).get_card_E() == unweighted4.adjacency_matrix().get_card_E()
+		  == csr4.get_card_E())
+
+	# Save to and load from a binary file.
+	import os
+	import tempfile
+	filename = os.path.join(tempfile.mkdtemp(), "graph2.csr")
+	csr2.save(filename)
+	loaded = CSRGraph.load(filename)
+	print(str(loaded) == str(csr2), dijkstra(loaded, 3)[0] == dijkstra(graph2, 3)[0])
+	graph3.save(filename)
+	print(str(AdjacencyListGraph.load(filename)) == str(graph3.copy()))
+	graph5 = AdjacencyMatrixGraph.from_edge_arrays(70, [0, 1, 65], [65, 69, 3], packed=True)
+	graph5.save(filename)
+	print(AdjacencyMatrixGraph.load(filename, packed=True).get_edge_list() == graph5.get_edge_list())
+	os.remove(filename)
+
+	# Errors.
+	try:
+		CSRGraph.from_edge_arrays(3, [0, 1], [1, 0], directed=False)  # same edge twice
+	except RuntimeError as e:
+		print(e)
+	try:
+		CSRGraph.from_edge_arrays(3, [0, 2], [1, 2], directed=False)  # self-loop
+	except RuntimeError as e:
+		print(e)
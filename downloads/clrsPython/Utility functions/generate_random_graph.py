@@ -31,6 +31,7 @@
 #########################################################################
 
 from random import randint, random
+import numpy as np
 from adjacency_list_graph import AdjacencyListGraph
 from adjacency_matrix_graph import AdjacencyMatrixGraph
 
@@ -72,6 +73,202 @@ def generate_random_graph(card_V, edge_probability, by_adjacency_lists=True,
     return G
 
 
+def card_pairs(card_V, directed):
+    """Return the number of possible edges: card_V^2 ordered pairs (self-loops included)
+    if directed, card_V choose 2 unordered pairs if undirected."""
+    return card_V * card_V if directed else card_V * (card_V - 1) // 2
+
+
+def pairs_from_indices(card_V, indices, directed):
+    """Map indices in range(card_pairs(card_V, directed)) to edges (u, v).  Directed
+    pairs are numbered row by row.  Undirected pairs with u < v are numbered row by row
+    in the upper triangle.  Returns numpy arrays u and v."""
+    indices = np.asarray(indices, dtype=np.int64)
+    if directed:
+        return indices // card_V, indices % card_V
+
+    # Row u of the upper triangle starts at index u * (2 card_V - u - 1) / 2.
+    row_start = lambda u: u * (2 * card_V - u - 1) // 2
+    b = 2 * card_V - 1
+    u = np.floor((b - np.sqrt(b * b - 8.0 * indices)) / 2).astype(np.int64)
+    u = np.clip(u, 0, max(card_V - 2, 0))
+    # Correct any floating-point rounding in the square root.
+    u += row_start(u + 1) <= indices
+    u -= row_start(u) > indices
+    v = indices - row_start(u) + u + 1
+    return u, v
+
+
+def skip_sample(n, p, rng):
+    """Return the sorted indices in range(n) selected by n independent coin flips,
+    each coming up heads with probability p.  Instead of flipping every coin, draw
+    the geometrically distributed gaps between heads, so that the time is proportional
+    to the number of indices selected rather than to n."""
+    if n <= 0 or p <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if p >= 1:
+        return np.arange(n, dtype=np.int64)
+
+    chunks = []
+    last = -1  # index of the last head so far
+    while True:
+        expected = (n - last - 1) * p
+        gaps = rng.geometric(p, size=int(expected + 4 * np.sqrt(expected)) + 16)
+        indices = last + np.cumsum(gaps)
+        chunks.append(indices[indices < n])
+        if indices[-1] >= n:
+            return np.concatenate(chunks)
+        last = indices[-1]
+
+
+def random_weights(rng, count, weighted, min_weight, max_weight):
+    """Return a numpy array of count random integer weights in [min_weight, max_weight],
+    or None if the graph is unweighted."""
+    if not weighted:
+        return None
+    return rng.integers(min_weight, max_weight + 1, size=count)
+
+
+def graph_from_edge_arrays(card_V, u, v, weights, by_adjacency_lists, directed):
+    """Build an AdjacencyListGraph or AdjacencyMatrixGraph from arrays of edges."""
+    constructor = AdjacencyListGraph if by_adjacency_lists else AdjacencyMatrixGraph
+    return constructor.from_edge_arrays(card_V, u, v, weights, directed)
+
+
+def generate_gnp_graph(card_V, edge_probability, by_adjacency_lists=True, directed=True,
+                       weighted=False, min_weight=0, max_weight=20, seed=None):
+    """Generate and return a random graph in the G(n, p) model, the same model as
+    generate_random_graph, but in time proportional to the number of edges, not card_V^2.
+
+    Arguments:
+        card_V -- number of vertices
+        edge_probability -- probability that a given edge is present
+        by_adjacency_lists -- True if the graph is represented by adjacency lists,
+        False if by an adjacency matrix
+        directed -- True if the graph is directed, False if undirected
+        weighted -- True if the graph is weighted, False if unweighted
+        min_weight -- if weighted, the minimum weight of an edge
+        max_weight -- if weighted, the maximum weight of an edge
+        seed -- seed for the random number generator, for reproducible graphs
+
+    Returns:
+        A graph
+        """
+    rng = np.random.default_rng(seed)
+    indices = skip_sample(card_pairs(card_V, directed), edge_probability, rng)
+    u, v = pairs_from_indices(card_V, indices, directed)
+    weights = random_weights(rng, len(u), weighted, min_weight, max_weight)
+    return graph_from_edge_arrays(card_V, u, v, weights, by_adjacency_lists, directed)
+
+
+def generate_gnm_graph(card_V, card_E, by_adjacency_lists=True, directed=True,
+                       weighted=False, min_weight=0, max_weight=20, seed=None):
+    """Generate and return a random graph in the G(n, m) model: card_E edges chosen
+    uniformly at random from all possible edges.  Arguments are as for generate_gnp_graph,
+    except that card_E gives the number of edges."""
+    rng = np.random.default_rng(seed)
+    n = card_pairs(card_V, directed)
+    if card_E > n:
+        raise RuntimeError("Cannot choose " + str(card_E) + " edges from " + str(n) + " possible edges.")
+
+    if 2 * card_E > n:
+        indices = rng.choice(n, size=card_E, replace=False)  # dense, so O(n) is O(card_E)
+    else:
+        # Draw with replacement and discard repeats until there are enough edges.  Because
+        # card_E <= n/2, each round is expected to keep at least half of what it draws.
+        indices = np.zeros(0, dtype=np.int64)
+        while len(indices) < card_E:
+            extra = rng.integers(0, n, size=int(1.1 * (card_E - len(indices))) + 16)
+            indices = np.unique(np.concatenate((indices, extra)))
+        indices = rng.choice(indices, size=card_E, replace=False)
+    indices.sort()
+
+    u, v = pairs_from_indices(card_V, indices, directed)
+    weights = random_weights(rng, card_E, weighted, min_weight, max_weight)
+    return graph_from_edge_arrays(card_V, u, v, weights, by_adjacency_lists, directed)
+
+
+def generate_rmat_graph(card_V, card_E, probabilities=(0.57, 0.19, 0.19, 0.05), by_adjacency_lists=True,
+                        directed=True, weighted=False, min_weight=0, max_weight=20, seed=None):
+    """Generate and return an R-MAT graph, whose degrees follow a power law.  Each edge
+    picks one quadrant of the adjacency matrix, then one quadrant of that quadrant, and
+    so on, according to the given probabilities.  Repeated edges, self-loops, and edges
+    that fall outside the card_V x card_V matrix are discarded and redrawn.  Vertex
+    numbers are randomly permuted so that high-degree vertices are not all small numbers.
+
+    Arguments:
+        card_V -- number of vertices
+        card_E -- number of edges
+        probabilities -- probabilities (a, b, c, d) of the top-left, top-right, bottom-left,
+        and bottom-right quadrants
+        Other arguments are as for generate_gnp_graph.
+
+    Returns:
+        A graph
+        """
+    rng = np.random.default_rng(seed)
+    if card_E > card_pairs(card_V, directed) - (card_V if directed else 0):
+        raise RuntimeError("Too many edges for an R-MAT graph with " + str(card_V) + " vertices.")
+    a, b, c, d = np.asarray(probabilities, dtype=float) / sum(probabilities)
+    scale = max(1, int(np.ceil(np.log2(max(card_V, 2)))))
+
+    keys = np.zeros(0, dtype=np.int64)
+    for attempt in range(100):
+        count = int(1.2 * (card_E - len(keys))) + 16
+        u = np.zeros(count, dtype=np.int64)
+        v = np.zeros(count, dtype=np.int64)
+        for level in range(scale):
+            r = rng.random(count)
+            u = 2 * u + (r >= a + b)                               # bottom half
+            v = 2 * v + (((r >= a) & (r < a + b)) | (r >= a + b + c))  # right half
+        keep = (u < card_V) & (v < card_V) & (u != v)
+        u = u[keep]
+        v = v[keep]
+        if not directed:
+            u, v = np.minimum(u, v), np.maximum(u, v)
+        # Keep the first occurrence of each edge, in the order drawn.
+        keys = np.concatenate((keys, u * card_V + v))
+        first = np.unique(keys, return_index=True)[1]
+        keys = keys[np.sort(first)]
+        if len(keys) >= card_E:
+            break
+    else:
+        raise RuntimeError("Could not draw " + str(card_E) + " distinct R-MAT edges.")
+
+    permutation = rng.permutation(card_V)
+    keys = keys[:card_E]
+    u = permutation[keys // card_V]
+    v = permutation[keys % card_V]
+    weights = random_weights(rng, card_E, weighted, min_weight, max_weight)
+    return graph_from_edge_arrays(card_V, u, v, weights, by_adjacency_lists, directed)
+
+
+def generate_grid_graph(rows, columns, edge_probability=1.0, by_adjacency_lists=True,
+                        directed=True, weighted=False, min_weight=1, max_weight=20, seed=None):
+    """Generate and return a 2-D grid graph, a simple model of a road network.  Vertex
+    r * columns + c is at row r and column c, and it is adjacent to the vertices above,
+    below, left, and right of it.  Each road is kept with probability edge_probability.
+    In a directed graph, each road becomes two edges, one in each direction, with the
+    same weight.  Other arguments are as for generate_gnp_graph.
+
+    Returns:
+        A graph with rows * columns vertices
+        """
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows * columns, dtype=np.int64).reshape(rows, columns)
+    u = np.concatenate((ids[:, :-1].ravel(), ids[:-1, :].ravel()))  # left and upper endpoints
+    v = np.concatenate((ids[:, 1:].ravel(), ids[1:, :].ravel()))    # right and lower endpoints
+    if edge_probability < 1:
+        keep = rng.random(len(u)) < edge_probability
+        u = u[keep]
+        v = v[keep]
+    weights = random_weights(rng, len(u), weighted, min_weight, max_weight)
+    if directed:
+        u, v = np.concatenate((u, v)), np.concatenate((v, u))
+        weights = None if weights is None else np.concatenate((weights, weights))
+    return graph_from_edge_arrays(rows * columns, u, v, weights, by_adjacency_lists, directed)
+
+
 # Testing
 if __name__ == "__main__":
     graph1 = generate_random_graph(20, 0.12)
@@ -83,3 +280,26 @@ if __name__ == "__main__":
 
     graph3 = generate_random_graph(18, 0.25, False, False, True, 3, 7)
     print(graph3)
+    print()
+
+    # Vectorized generators, reproducible with a seed.
+    graph4 = generate_gnp_graph(12, 0.2, True, False, True, 1, 9, seed=7)
+    print(graph4)
+    print(str(graph4) == str(generate_gnp_graph(12, 0.2, True, False, True, 1, 9, seed=7)))
+    graph5 = generate_gnm_graph(10, 15, False, True, False, seed=3)
+    print(graph5)
+    print(graph5.get_card_E())
+    graph6 = generate_rmat_graph(64, 200, seed=11)
+    degrees = sorted((sum(1 for edge in graph6.get_adj_list(u)) for u in range(64)), reverse=True)
+    print(graph6.get_card_E(), degrees[:8])
+    graph7 = generate_grid_graph(3, 4, 0.9, True, True, True, seed=5)
+    print(graph7)
+
+    # Large sparse graphs take time proportional to the number of edges.
+    graph8 = generate_gnp_graph(200000, 5e-6, True, True, False, seed=1)
+    print(graph8.get_card_E())  # about 200000
+
+    # Every index maps to a distinct undirected pair.
+    for n in [2, 3, 10, 1001]:
+        u, v = pairs_from_indices(n, np.arange(card_pairs(n, False)), False)
+        print(np.all(u < v) and len(set(zip(u.tolist(), v.tolist()))) == card_pairs(n, False))
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# graph_views.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+from adjacency_list_graph import Edge
+from csr_graph import CSRGraph
+
+
+class TransposeView:
+
+	def __init__(self, G):
+		"""Initialize a read-only view of the transpose of graph G.  The edges entering each
+		vertex are indexed once, in compressed sparse row form, instead of being inserted
+		one at a time into a new graph.  The view does not follow later changes to G.
+
+		Arguments:
+		G -- a graph offering get_adj_list, such as an AdjacencyListGraph or CSRGraph
+		"""
+		self.G = G
+		if not G.is_directed():
+			self.incoming = G  # an undirected graph is its own transpose
+		elif isinstance(G, CSRGraph):
+			self.incoming = G.transpose()
+		else:
+			self.incoming = CSRGraph.from_graph(G).transpose()
+
+	def get_card_V(self):
+		"""Return the number of vertices in this graph."""
+		return self.G.get_card_V()
+
+	def get_card_E(self):
+		"""Return the number of edges in this graph."""
+		return self.G.get_card_E()
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the edges (u, v) of the transpose, that is, for the
+		edges (v, u) of the underlying graph."""
+		return self.incoming.get_adj_list(u)
+
+	def is_directed(self):
+		"""Return a boolean indicating whether this graph is directed."""
+		return self.G.is_directed()
+
+	def is_weighted(self):
+		"""Return a boolean indicating whether this graph is weighted."""
+		return self.G.is_weighted()
+
+	def has_edge(self, u, v):
+		"""Return True if edge (u, v) is in the transpose, False otherwise."""
+		return self.G.has_edge(v, u)
+
+
+class InducedSubgraphView:
+
+	def __init__(self, G, keep):
+		"""Initialize a read-only view of the subgraph of G induced by a set of vertices.
+		Vertices keep their numbers, so that the view has as many vertices as G, but the
+		vertices not kept have no incident edges.
+
+		Arguments:
+		G -- a graph offering get_adj_list
+		keep -- a sequence of booleans, keep[v] being True if vertex v is in the subgraph
+		"""
+		self.G = G
+		self.keep = [bool(k) for k in keep]
+		if len(self.keep) != G.get_card_V():
+			raise RuntimeError("Vertex mask must have one entry per vertex.")
+
+	def get_card_V(self):
+		"""Return the number of vertices in this graph."""
+		return self.G.get_card_V()
+
+	def get_card_E(self):
+		"""Return the number of edges in this graph.  Takes time proportional to the number
+		of edges leaving kept vertices."""
+		count = sum(1 for u in range(self.get_card_V()) for edge in self.get_adj_list(u))
+		return count if self.is_directed() else count // 2
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the edges leaving u whose endpoints are both kept."""
+		if not self.keep[u]:
+			return
+		keep = self.keep
+		for edge in self.G.get_adj_list(u):
+			if keep[edge.get_v()]:
+				yield edge
+
+	def is_directed(self):
+		"""Return a boolean indicating whether this graph is directed."""
+		return self.G.is_directed()
+
+	def is_weighted(self):
+		"""Return a boolean indicating whether this graph is weighted."""
+		return self.G.is_weighted()
+
+	def has_edge(self, u, v):
+		"""Return True if edge (u, v) is in this subgraph, False otherwise."""
+		return self.keep[u] and self.keep[v] and self.G.has_edge(u, v)
+
+
+class CopyOnWriteGraph:
+
+	def __init__(self, G):
+		"""Initialize a graph that starts out the same as graph G and records its own edge
+		insertions and deletions without changing or copying G.  G must not change while
+		the overlay is in use.  Weights of edges taken from G are shared with G, so
+		change a weight by deleting the edge and inserting it again.
+
+		Arguments:
+		G -- a graph offering get_adj_list, has_edge, and get_card_E
+		"""
+		self.G = G
+		self.card_E = G.get_card_E()
+		self.deleted = {}   # deleted[u] is the set of vertices v for which (u, v) of G is deleted
+		self.inserted = {}  # inserted[u] maps each vertex v to the Edge object for inserted edge (u, v)
+
+	def get_card_V(self):
+		"""Return the number of vertices in this graph."""
+		return self.G.get_card_V()
+
+	def get_card_E(self):
+		"""Return the number of edges in this graph."""
+		return self.card_E
+
+	def is_directed(self):
+		"""Return a boolean indicating whether this graph is directed."""
+		return self.G.is_directed()
+
+	def is_weighted(self):
+		"""Return a boolean indicating whether this graph is weighted."""
+		return self.G.is_weighted()
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the adjacency list of vertex u: the edges of G that have
+		not been deleted, followed by the inserted edges."""
+		deleted = self.deleted.get(u)
+		for edge in self.G.get_adj_list(u):
+			if deleted is None or edge.get_v() not in deleted:
+				yield edge
+		if u in self.inserted:
+			yield from list(self.inserted[u].values())
+
+	def find_edge(self, u, v):
+		"""Return the edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
+		if u in self.inserted and v in self.inserted[u]:
+			return self.inserted[u][v]
+		if u in self.deleted and v in self.deleted[u]:
+			return None
+		for edge in self.G.get_adj_list(u):
+			if edge.get_v() == v:
+				return edge
+		return None
+
+	def has_edge(self, u, v):
+		"""Return True if edge (u, v) is in this graph, False otherwise."""
+		if u in self.inserted and v in self.inserted[u]:
+			return True
+		if u in self.deleted and v in self.deleted[u]:
+			return False
+		return self.G.has_edge(u, v)
+
+	def insert_edge(self, u, v, weight=None):
+		"""Insert an edge between vertices u and v, with the same rules as
+		AdjacencyListGraph.insert_edge."""
+		if self.is_weighted():
+			if weight is None:
+				raise RuntimeError("Inserting unweighted edge (" + str(u) + ", " + str(v) + ") in weighted graph.")
+		else:  # unweighted
+			if weight is not None:
+				raise RuntimeError("Inserting weighted edge (" + str(u) + ", " + str(v) + ") in unweighted graph.")
+		if not self.is_directed() and u == v:
+			raise RuntimeError("Cannot insert self-loop (" + str(u) + ", " + str(v) + ") into undirected graph")
+		if self.has_edge(u, v):
+			raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
+
+		self.inserted.setdefault(u, {})[v] = Edge(v, weight)
+		if not self.is_directed():
+			self.inserted.setdefault(v, {})[u] = Edge(u, weight)
+		self.card_E += 1
+
+	def delete_one_direction(self, u, v):
+		"""Delete (u, v) only.  Return True if it was present, False otherwise."""
+		if u in self.inserted and v in self.inserted[u]:
+			del self.inserted[u][v]
+			return True
+		if self.has_edge(u, v):
+			self.deleted.setdefault(u, set()).add(v)
+			return True
+		return False
+
+	def delete_edge(self, u, v, delete_undirected=True):
+		"""Delete edge (u, v) if it exists.  No error if it does not exist.
+			Delete both directions if the graph is undirected and delete_undirected is True."""
+		if self.delete_one_direction(u, v):
+			self.card_E -= 1
+		if not self.is_directed() and delete_undirected:
+			self.delete_one_direction(v, u)
+
+	def get_edge_list(self):
+		"""Return a Python list containing the edges of this graph."""
+		edge_list = []
+		for u in range(self.get_card_V()):
+			for edge in self.get_adj_list(u):
+				v = edge.get_v()
+				if self.is_directed() or u < v:
+					edge_list.append((u, v))
+		return edge_list
+
+	def __str__(self):
+		"""Return the adjacency lists formatted as a string."""
+		result = []
+		for u in range(self.get_card_V()):
+			result.append(str(u) + ": " + "".join(str(edge) + " " for edge in self.get_adj_list(u)) + "\n")
+		return "".join(result)
+
+
+# Testing
+if __name__ == "__main__":
+
+	from adjacency_list_graph import AdjacencyListGraph
+	from generate_random_graph import generate_gnp_graph
+	from bfs import bfs
+
+	graph1 = generate_gnp_graph(40, 0.08, True, True, True, 1, 9, seed=4)
+
+	# Transpose view matches transpose.
+	xpose = TransposeView(graph1)
+	print(all(sorted(str(e) for e in xpose.get_adj_list(u)) == sorted(str(e) for e in graph1.transpose().get_adj_list(u))
+			  for u in range(40)))
+	print(xpose.has_edge(*graph1.get_edge_list()[0][::-1]))
+
+	# Induced subgraph view on the even vertices.
+	even = InducedSubgraphView(graph1, [v % 2 == 0 for v in range(40)])
+	print(all(u % 2 == 0 and v % 2 == 0 for u, v in [(u, e.get_v()) for u in range(40) for e in even.get_adj_list(u)]))
+	print(even.get_card_E() == sum(1 for u, v in graph1.get_edge_list() if u % 2 == 0 and v % 2 == 0))
+
+	# Copy-on-write overlay leaves the base graph alone.
+	graph2 = AdjacencyListGraph(5, False)
+	for u, v in [(0, 1), (1, 2), (2, 3), (3, 4)]:
+		graph2.insert_edge(u, v)
+	overlay = CopyOnWriteGraph(graph2)
+	overlay.delete_edge(1, 2)
+	overlay.insert_edge(0, 4)
+	print(overlay)
+	print(graph2)
+	print(overlay.get_card_E(), graph2.get_card_E())
+	print(bfs(overlay, 0)[0], bfs(graph2, 0)[0])
+	try:
+		overlay.insert_edge(4, 0)
+	except RuntimeError as e:
+		print(e)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# partitioned_graph.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+import numpy as np
+from csr_graph import CSRGraph
+
+HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)  # 2^64 divided by the golden ratio
+
+
+def range_owners(card_V, num_parts):
+	"""Return an array giving the part that owns each vertex when the vertices are split
+	into num_parts contiguous ranges of nearly equal size."""
+	return (np.arange(card_V, dtype=np.int64) * num_parts) // max(card_V, 1)
+
+
+def hash_owners(card_V, num_parts):
+	"""Return an array giving the part that owns each vertex when vertices are scattered
+	among num_parts parts by multiplicative hashing."""
+	v = np.arange(card_V, dtype=np.uint64)
+	return (((v * HASH_MULTIPLIER) >> np.uint64(32)) % np.uint64(num_parts)).astype(np.int64)
+
+
+class PartitionedGraph:
+
+	def __init__(self, G, num_parts, method="range"):
+		"""Initialize a partition of the vertices of graph G among num_parts parts.  Each
+		part holds, in compressed sparse row form, the adjacency lists of the vertices it
+		owns, in the same order as in G, so that the parts can be handed to separate
+		processes.
+
+		Arguments:
+		G -- a graph offering get_adj_list, or a CSRGraph
+		num_parts -- number of parts
+		method -- "range" for contiguous ranges of vertices, "hash" for hashed vertices
+		"""
+		if num_parts < 1:
+			raise RuntimeError("Number of parts must be positive.")
+		csr = G if isinstance(G, CSRGraph) else CSRGraph.from_graph(G)
+		card_V = csr.get_card_V()
+		if method == "range":
+			owners = range_owners(card_V, num_parts)
+		elif method == "hash":
+			owners = hash_owners(card_V, num_parts)
+		else:
+			raise RuntimeError("Unknown partitioning method " + str(method) + ".")
+
+		self.card_V = card_V
+		self.directed = csr.is_directed()
+		self.num_parts = num_parts
+		self.owners = owners
+		offsets = csr.get_offsets()
+		targets = csr.get_targets()
+		degrees = np.diff(offsets)
+		self.max_degree = int(degrees.max()) if card_V > 0 else 0
+		self.local_index = np.empty(card_V, dtype=np.int64)  # position of each vertex within its part
+		self.parts = []
+		for p in range(num_parts):
+			vertices = np.flatnonzero(owners == p)
+			self.local_index[vertices] = np.arange(len(vertices))
+			part_offsets = np.zeros(len(vertices) + 1, dtype=np.int64)
+			np.cumsum(degrees[vertices], out=part_offsets[1:])
+			# Gather the adjacency lists of the part's vertices without a Python loop.
+			index = np.arange(part_offsets[-1]) + \
+				np.repeat(offsets[vertices] - part_offsets[:-1], degrees[vertices])
+			self.parts.append((vertices, part_offsets, targets[index]))
+
+	def get_card_V(self):
+		"""Return the number of vertices in the whole graph."""
+		return self.card_V
+
+	def is_directed(self):
+		"""Return a boolean indicating whether the graph is directed."""
+		return self.directed
+
+	def get_num_parts(self):
+		"""Return the number of parts."""
+		return self.num_parts
+
+	def get_owner(self, v):
+		"""Return the part that owns vertex v."""
+		return int(self.owners[v])
+
+	def get_owners(self):
+		"""Return the array giving the part that owns each vertex."""
+		return self.owners
+
+	def get_local_index(self):
+		"""Return the array giving the position of each vertex among the vertices of its part."""
+		return self.local_index
+
+	def get_max_degree(self):
+		"""Return the largest out-degree of any vertex."""
+		return self.max_degree
+
+	def get_part(self, p):
+		"""Return a tuple (vertices, offsets, targets) for part p: the vertices it owns in
+		increasing order, and the compressed sparse row adjacency lists of those vertices,
+		with offsets indexed by position within the part."""
+		return self.parts[p]
+
+	def get_part_sizes(self):
+		"""Return a list of (number of vertices, number of adjacency-list entries) per part."""
+		return [(len(vertices), len(targets)) for vertices, offsets, targets in self.parts]
+
+
+# Testing
+if __name__ == "__main__":
+
+	from generate_random_graph import generate_gnp_graph
+
+	graph1 = generate_gnp_graph(30, 0.15, True, True, seed=3)
+	for method in ["range", "hash"]:
+		parts = PartitionedGraph(graph1, 4, method)
+		print(method, parts.get_part_sizes())
+		ok = True
+		for u in range(30):
+			vertices, offsets, targets = parts.get_part(parts.get_owner(u))
+			i = parts.get_local_index()[u]
+			ok = ok and targets[offsets[i]:offsets[i + 1]].tolist() == [e.get_v() for e in graph1.get_adj_list(u)]
+		print("Adjacency lists preserved:", ok)
+	try:
+		PartitionedGraph(graph1, 2, "random")
+	except RuntimeError as e:
+		print(e)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# query_cache.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+from collections import OrderedDict
+
+
+def result_size(result):
+	"""Default measure of the size of a cached result: the total length of the lists or
+	arrays in it, so that the (d, pi) result of a single-source algorithm on a graph
+	with n vertices has size 2n."""
+	if isinstance(result, tuple):
+		return sum(result_size(x) for x in result)
+	try:
+		return len(result)
+	except TypeError:
+		return 1
+
+
+class QueryCache:
+
+	def __init__(self, max_entries=128, max_size=None, size_func=result_size):
+		"""Initialize a cache of the results of single-source graph algorithms such as
+		bfs, dijkstra, and bellman_ford.  A result is keyed by the algorithm, the graph,
+		the source, and any extra arguments, and it is valid only for the version of the
+		graph that produced it.  When the cache is too full, the least recently used
+		results are evicted.
+
+		Arguments:
+		max_entries -- maximum number of results kept
+		max_size -- maximum total size of the results kept, or None for no bound
+		size_func -- function returning the size of a result
+		"""
+		self.max_entries = max_entries
+		self.max_size = max_size
+		self.size_func = size_func
+		# Maps (algorithm, id(G), source, args) to (G, version, result, size), least
+		# recently used first.  Holding G keeps its id from being reused.
+		self.entries = OrderedDict()
+		# graphs[id(G)] is [G, version, count] for each graph G with count > 0 results
+		# cached, all for that version.  It is pruned along with the entries.
+		self.graphs = {}
+		self.size = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.invalidations = 0
+
+	def query(self, algorithm, G, source, *args):
+		"""Return algorithm(G, source, *args), computing it only if no result for the
+		current version of G is cached.  The result returned may be shared with later
+		calls, so the caller must not change it.
+
+		Arguments:
+		algorithm -- a function such as bfs or dijkstra
+		G -- a graph offering get_version
+		source -- index of the source vertex
+		args -- any other arguments for algorithm
+		"""
+		version = G.get_version()
+		graph = self.graphs.get(id(G))
+		if graph is not None and graph[1] != version:
+			self.invalidate(G)  # G changed, so all of its results are stale
+
+		key = (algorithm, id(G), source, args)
+		entry = self.entries.get(key)
+		if entry is not None and entry[0] is G:
+			self.hits += 1
+			self.entries.move_to_end(key)  # now the most recently used
+			return entry[2]
+
+		self.misses += 1
+		result = algorithm(G, source, *args)
+		size = self.size_func(result)
+		if self.max_size is not None and size > self.max_size:
+			return result  # too big to cache
+		self.entries[key] = (G, version, result, size)
+		self.size += size
+		self.graphs.setdefault(id(G), [G, version, 0])[2] += 1
+		self.evict()
+		return result
+
+	def evict(self):
+		"""Evict least recently used results until the cache is within its bounds."""
+		while len(self.entries) > self.max_entries or \
+				(self.max_size is not None and self.size > self.max_size):
+			self.remove(next(iter(self.entries)))
+			self.evictions += 1
+
+	def remove(self, key):
+		"""Remove the result with the given key, and forget its graph if it was the graph's
+		last result."""
+		entry = self.entries.pop(key)
+		self.size -= entry[3]
+		graph = self.graphs[id(entry[0])]
+		graph[2] -= 1
+		if graph[2] == 0:
+			del self.graphs[id(entry[0])]
+
+	def invalidate(self, G=None):
+		"""Discard the cached results for graph G, or for all graphs if G is None."""
+		for key in list(self.entries):
+			if G is None or self.entries[key][0] is G:
+				self.remove(key)
+				self.invalidations += 1
+
+	def get_stats(self):
+		"""Return a dictionary of hit, miss, eviction, and invalidation counts, along with
+		the number of results cached, their total size, and the number of graphs they are for."""
+		lookups = self.hits + self.misses
+		return {"hits": self.hits, "misses": self.misses,
+				"hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+				"evictions": self.evictions, "invalidations": self.invalidations,
+				"entries": len(self.entries), "size": self.size, "graphs": len(self.graphs)}
+
+
+# Testing
+if __name__ == "__main__":
+
+	from bfs import bfs
+	from dijkstra import dijkstra
+	from bellman_ford import bellman_ford
+	from generate_random_graph import generate_gnp_graph
+
+	graph1 = generate_gnp_graph(200, 0.03, True, True, True, 0, 10, seed=2)
+	cache = QueryCache(max_entries=8)
+	for repeat in range(5):
+		for s in range(4):
+			d, pi = cache.query(dijkstra, graph1, s)
+			cache.query(bfs, graph1, s)
+	print(cache.get_stats())  # 8 misses, 32 hits
+	print(cache.query(dijkstra, graph1, 3)[0] == dijkstra(graph1, 3)[0])
+
+	# Changing the graph invalidates its results.
+	u, v = graph1.get_edge_list()[0]
+	graph1.delete_edge(u, v)
+	d1, pi1 = cache.query(dijkstra, graph1, u)
+	print(cache.get_stats()["invalidations"])  # 8
+	graph1.set_weight(*graph1.get_edge_list()[0], 100)
+	d2, pi2 = cache.query(dijkstra, graph1, u)
+	print(d2 == dijkstra(graph1, u)[0], cache.get_stats()["misses"])  # True 10
+
+	# Changing a weight in another graph leaves this graph's results cached.
+	graph2 = generate_gnp_graph(50, 0.1, True, True, True, 0, 10, seed=3)
+	graph2.set_weight(*graph2.get_edge_list()[0], 100)
+	cache.query(dijkstra, graph1, u)
+	print(cache.get_stats()["hits"])  # 34
+
+	# So does reweighting a copy, but reweighting an Edge directly invalidates as well.
+	graph1.copy().set_weight(*graph1.get_edge_list()[0], 50)
+	cache.query(dijkstra, graph1, u)
+	next(graph1.get_adj_list(u)).set_weight(100)
+	d3, pi3 = cache.query(dijkstra, graph1, u)
+	print(d3 == dijkstra(graph1, u)[0], cache.get_stats()["hits"], cache.get_stats()["misses"])  # True 35 11
+
+	# Size-bounded eviction.
+	small_cache = QueryCache(max_entries=100, max_size=1000)
+	for s in range(5):
+		small_cache.query(bellman_ford, graph1, s)  # results of size 2 * 200 + 1
+	print(small_cache.get_stats())  # 2 entries, 3 evictions
+
+	# Graphs whose results are all evicted are forgotten.
+	for seed in range(20):
+		cache.query(bfs, generate_gnp_graph(20, 0.1, seed=seed), 0)
+	print(cache.get_stats()["graphs"], cache.get_stats()["entries"])  # 8 8
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# vertex_labels.py
+
+# Introduction to Algorithms, Fourth edition
+
+#########################################################################
+#                                                                       #
+# Copyright 2022 Massachusetts Institute of Technology                  #
+#                                                                       #
+# Permission is hereby granted, free of charge, to any person obtaining #
+# a copy of this software and associated documentation files (the       #
+# "Software"), to deal in the Software without restriction, including   #
+# without limitation the rights to use, copy, modify, merge, publish,   #
+# distribute, sublicense, and/or sell copies of the Software, and to    #
+# permit persons to whom the Software is furnished to do so, subject to #
+# the following conditions:                                             #
+#                                                                       #
+# The above copyright notice and this permission notice shall be        #
+# included in all copies or substantial portions of the Software.       #
+#                                                                       #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,       #
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF    #
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND                 #
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS   #
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN    #
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN     #
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE      #
+# SOFTWARE.                                                             #
+#                                                                       #
+#########################################################################
+
+import numpy as np
+from itertools import chain
+from adjacency_list_graph import AdjacencyListGraph
+
+
+class VertexLabels:
+
+	def __init__(self, labels=()):
+		"""Initialize a two-way mapping between vertex labels, such as names, and vertex
+		numbers.  Labels are numbered from 0 in the order in which they are first interned.
+		Looking up a label takes constant expected time, as opposed to the linear time
+		taken by searching a list of labels with index.
+
+		Argument:
+		labels -- optional sequence of distinct labels, numbered 0, 1, 2, ...
+		"""
+		self.labels = []  # labels[i] is the label of vertex i
+		self.ids = {}     # ids[label] is the vertex number of label
+		for label in labels:
+			if label in self.ids:
+				raise RuntimeError("Duplicate vertex label " + str(label) + ".")
+			self.intern(label)
+
+	def __len__(self):
+		"""Return the number of labels."""
+		return len(self.labels)
+
+	def __contains__(self, label):
+		"""Return True if label has a vertex number, False otherwise."""
+		return label in self.ids
+
+	def __call__(self, i):
+		"""Return the label of vertex i, so that this object can be a mapping function for
+		strmap."""
+		return self.labels[i]
+
+	def intern(self, label):
+		"""Return the vertex number of label, giving it the next number if it has none."""
+		i = self.ids.get(label)
+		if i is None:
+			i = len(self.labels)
+			self.ids[label] = i
+			self.labels.append(label)
+		return i
+
+	def intern_all(self, labels):
+		"""Return a numpy array of the vertex numbers of a sequence of labels, giving new
+		labels new numbers.  Takes time linear in the number of labels."""
+		ids = self.ids
+		result = np.empty(len(labels), dtype=np.int64)
+		for j, label in enumerate(labels.tolist() if isinstance(labels, np.ndarray) else labels):
+			i = ids.get(label)
+			if i is None:
+				i = len(self.labels)
+				ids[label] = i
+				self.labels.append(label)
+			result[j] = i
+		return result
+
+	def get_id(self, label):
+		"""Return the vertex number of label.  Raise an error if label has no number."""
+		i = self.ids.get(label)
+		if i is None:
+			raise RuntimeError("Unknown vertex label " + str(label) + ".")
+		return i
+
+	def get_ids(self, labels):
+		"""Return a list of the vertex numbers of a sequence of labels."""
+		return [self.get_id(label) for label in labels]
+
+	def get_label(self, i):
+		"""Return the label of vertex i."""
+		return self.labels[i]
+
+	def get_labels(self):
+		"""Return the list of labels, indexed by vertex number."""
+		return self.labels
+
+
+class LabeledGraph:
+
+	def __init__(self, G, labels):
+		"""Initialize a graph whose vertices are named by labels rather than numbers.
+		Edges are stored in G, which must have a vertex for each label.
+
+		Arguments:
+		G -- a graph, such as an AdjacencyListGraph
+		labels -- a VertexLabels object, or a sequence of distinct labels
+		"""
+		if not isinstance(labels, VertexLabels):
+			labels = VertexLabels(labels)
+		if len(labels) > G.get_card_V():
+			raise RuntimeError("More labels than vertices.")
+		self.G = G
+		self.labels = labels
+
+	@staticmethod
+	def from_labeled_edges(u, v, weights=None, directed=True, labels=None):
+		"""Return a labeled graph built from sequences of labeled edges.  The ith edge is
+		(u[i], v[i]) with weight weights[i].  Labels are interned in bulk, and the edges
+		are loaded with AdjacencyListGraph.from_edge_arrays, so that the time taken is
+		linear in the number of edges.
+
+		Arguments:
+		u, v -- sequences of vertex labels
+		weights -- optional sequence of edge weights; None for an unweighted graph
+		directed -- boolean indicating whether the graph is directed
+		labels -- optional VertexLabels or sequence of labels giving the vertex numbering,
+		with any labels not in it numbered in order of first appearance
+		"""
+		if not isinstance(labels, VertexLabels):
+			labels = VertexLabels(labels if labels is not None else ())
+		# Intern the endpoints edge by edge, so that vertices are numbered in order of
+		# first appearance in the edge sequence.
+		ids = labels.intern_all(list(chain.from_iterable(zip(u, v))))
+		u_ids = ids[0::2]
+		v_ids = ids[1::2]
+		G = AdjacencyListGraph.from_edge_arrays(len(labels), u_ids, v_ids, weights, directed)
+		return LabeledGraph(G, labels)
+
+	def get_graph(self):
+		"""Return the underlying graph, whose vertices are numbered."""
+		return self.G
+
+	def get_labels(self):
+		"""Return the VertexLabels object."""
+		return self.labels
+
+	def get_id(self, label):
+		"""Return the vertex number of label."""
+		return self.labels.get_id(label)
+
+	def get_label(self, i):
+		"""Return the label of vertex i."""
+		return self.labels.get_label(i)
+
+	def insert_edge(self, u, v, weight=None):
+		"""Insert an edge between the vertices labeled u and v."""
+		self.G.insert_edge(self.labels.get_id(u), self.labels.get_id(v), weight)
+
+	def delete_edge(self, u, v, delete_undirected=True):
+		"""Delete the edge between the vertices labeled u and v, if it exists."""
+		self.G.delete_edge(self.labels.get_id(u), self.labels.get_id(v), delete_undirected)
+
+	def has_edge(self, u, v):
+		"""Return True if there is an edge from the vertex labeled u to the vertex labeled v."""
+		return self.G.has_edge(self.labels.get_id(u), self.labels.get_id(v))
+
+	def find_edge(self, u, v):
+		"""Return the edge object for the edge between the vertices labeled u and v, or None."""
+		return self.G.find_edge(self.labels.get_id(u), self.labels.get_id(v))
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the edges leaving the vertex labeled u, as pairs of the
+		label of the other endpoint and the edge weight (None if unweighted)."""
+		labels = self.labels.get_labels()
+		weighted = self.G.is_weighted()
+		for edge in self.G.get_adj_list(self.labels.get_id(u)):
+			yield labels[edge.get_v()], edge.get_weight() if weighted else None
+
+	def get_edge_list(self):
+		"""Return a Python list containing the edges of this graph as pairs of labels."""
+		labels = self.labels.get_labels()
+		return [(labels[u], labels[v]) for u, v in self.G.get_edge_list()]
+
+	def __str__(self):
+		"""Return the adjacency lists formatted as a string, with vertices labeled."""
+		return self.G.strmap(self.labels)
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from dijkstra import dijkstra
+
+	# Textbook example, from labeled edges.
+	edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
+			('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
+	graph1 = LabeledGraph.from_labeled_edges([e[0] for e in edges], [e[1] for e in edges],
+											 [e[2] for e in edges])
+	print(graph1)
+	print(list(graph1.get_adj_list('y')))
+	d, pi = dijkstra(graph1.get_graph(), graph1.get_id('s'))
+	labels = graph1.get_labels()
+	for i in range(len(labels)):
+		print(labels(i) + ": d = " + str(d[i]) + ", pi = " + ("None" if pi[i] is None else labels(pi[i])))
+
+	# Label-aware insertion and deletion.
+	graph2 = LabeledGraph(AdjacencyListGraph(3, False), ['a', 'b', 'c'])
+	graph2.insert_edge('a', 'b')
+	graph2.insert_edge('c', 'b')
+	graph2.delete_edge('b', 'a')
+	print(graph2.get_edge_list(), graph2.has_edge('b', 'c'))
+	try:
+		graph2.insert_edge('a', 'd')
+	except RuntimeError as e:
+		print(e)
+
+	# Loading named edges takes linear time.
+	for card_E in [100000, 200000, 400000]:
+		rng = np.random.default_rng(card_E)
+		names = np.array(["v" + str(i) for i in range(card_E // 10)])
+		keys = np.unique(rng.integers(0, len(names) ** 2, size=card_E))
+		u, v = names[keys // len(names)], names[keys % len(names)]
+		start = time.perf_counter()
+		graph3 = LabeledGraph.from_labeled_edges(u, v)
+		elapsed = time.perf_counter() - start
+		print(len(u), "named edges loaded in %.2f seconds, %.2f microseconds per edge"
+			  % (elapsed, 1e6 * elapsed / len(u)))
+		del graph3